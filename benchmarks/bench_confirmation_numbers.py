@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Throughput and uniqueness check for the confirmation number allocator.
+
+Draws N numbers through ConfirmationAllocator (block allocation included), then
+draws N more and verifies every one decodes back to its own sequence value - since decode() is
+a function, that proves no two numbers are equal without storing them all.
+
+    python3 benchmarks/bench_confirmation_numbers.py [count] [block_size]
+"""
+import sys
+import time
+
+from common import seeded_database
+
+from src.database.confirmation_codes import decode, ALPHABET, CODE_LENGTH
+from src.models.confirmation import ConfirmationAllocator
+from src.models.database import execute_query
+
+
+def run(count, block_size):
+    seeded_database()
+    allocator = ConfirmationAllocator(block_size)
+
+    start = time.perf_counter()
+    for _ in range(count):
+        allocator.next_number()
+    elapsed = time.perf_counter() - start
+    print(f"allocated {count:,} numbers in {elapsed:.2f}s = {count / elapsed:,.0f} numbers/s "
+          f"(block size {block_size}, {-(-count // block_size)} blocks)")
+
+    # Second pass: check each number against the sequence value it came from
+    first_value = execute_query("SELECT next_value FROM confirmation_sequence")[0][0]
+    allocator.discard_block()
+    start = time.perf_counter()
+    for offset in range(count):
+        number = allocator.next_number()
+        assert len(number) == CODE_LENGTH and all(c in ALPHABET for c in number), number
+        assert decode(number) == first_value + offset, f"{number} is not unique"
+    print(f"verified {count:,} more numbers are unique in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1000)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: per-call sqlite3.connect() versus pooled connections.
+
+Runs the existing model queries both ways against a freshly seeded database.
+
+    python3 benchmarks/bench_connections.py [iterations]
+"""
+import sqlite3
+import sys
+
+from common import seeded_database, time_calls
+
+from src.database import get_db_path
+from src.models import database, Flight, Passenger, Reservation
+
+
+def per_call_execute_query(query, params=None, model=None):
+    """The original data-access path: connect, query, close"""
+    conn = sqlite3.connect(get_db_path())
+    conn.row_factory = sqlite3.Row
+    try:
+        cursor = conn.cursor()
+        if model is not None:
+            cursor.row_factory = database.record_factory(model)
+        if params:
+            cursor.execute(query, params)
+        else:
+            cursor.execute(query)
+        return cursor.fetchall()
+    finally:
+        conn.close()
+
+
+def workloads():
+    flight = Flight.get_all()[0]
+    return [
+        ("Passenger.get_all", lambda: Passenger.get_all()),
+        ("Reservation.get_by_passenger", lambda: Reservation.get_by_passenger(1)),
+        ("Flight.get_all(date)", lambda: Flight.get_all(flight.flight_date)),
+        ("Flight.get_by_id", lambda: Flight.get_by_id(flight.id)),
+        ("Flight.get_available_seats", lambda: Flight.get_available_seats(flight.id)),
+        ("Passenger.search", lambda: Passenger.search("Sm")),
+        ("Reservation.get_all", lambda: Reservation.get_all()),
+    ]
+
+
+def run(iterations):
+    seeded_database()
+    pooled_execute_query = database.execute_query
+    print(f"{'query':30} {'per-call ops/s':>15} {'pooled ops/s':>15} {'speedup':>8}")
+    for name, func in workloads():
+        # Model modules bind execute_query at import time, so patch each one
+        modules = [sys.modules[m] for m in list(sys.modules) if m.startswith('src.models.')]
+        for module in modules:
+            if getattr(module, 'execute_query', None) is pooled_execute_query:
+                module.execute_query = per_call_execute_query
+        _, per_call = time_calls(func, iterations)
+        for module in modules:
+            if getattr(module, 'execute_query', None) is per_call_execute_query:
+                module.execute_query = pooled_execute_query
+        _, pooled = time_calls(func, iterations)
+        print(f"{name:30} {per_call:15.0f} {pooled:15.0f} {pooled / per_call:7.1f}x")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Query hook overhead on a cheap point query (Flight.get_by_id).
+
+Compares calling the unhooked query path directly, execute_query with no hooks
+registered, and execute_query with QueryStats recording every statement.
+
+    python3 benchmarks/bench_instrumentation.py [iterations]
+"""
+import sys
+from itertools import cycle
+
+from common import seeded_database, time_calls
+
+from src.models import database, Flight
+from src.models.instrumentation import enable_instrumentation, disable_instrumentation
+
+ROUNDS = 5
+
+
+def run(iterations):
+    seeded_database()
+    flight_ids = cycle([flight.id for flight in Flight.get_all()])
+    query = "SELECT * FROM flights WHERE id = ?"
+
+    cases = [
+        ("unhooked path", lambda: database._execute_query(query, (next(flight_ids),), Flight)),
+        ("hooks disabled", lambda: database.execute_query(query, (next(flight_ids),), model=Flight)),
+        ("QueryStats on", lambda: database.execute_query(query, (next(flight_ids),), model=Flight)),
+    ]
+    # Best of interleaved rounds, so drift in machine load doesn't favour one case
+    best = {}
+    stats = None
+    for _ in range(ROUNDS):
+        for name, func in cases:
+            if name == "QueryStats on":
+                stats = enable_instrumentation(summary_on_exit=False)
+            elapsed, _ = time_calls(func, iterations)
+            best[name] = min(best.get(name, elapsed), elapsed)
+            disable_instrumentation()
+
+    baseline = best[cases[0][0]] / iterations * 1e6
+    for name, _ in cases:
+        per_call = best[name] / iterations * 1e6
+        print(f"{name:16} {1e6 / per_call:>11,.0f} ops/s  {per_call:7.2f}us/call  {per_call - baseline:+6.2f}us")
+    print(stats.summary(limit=3))
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
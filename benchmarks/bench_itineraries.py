@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Connecting-itinerary search over a busy schedule.
+
+Adds shifted copies of every seeded flight until there are roughly N flights a
+day, then times building a ConnectionIndex for a 3-day window and searching
+every airport pair on the first day.
+
+    python3 benchmarks/bench_itineraries.py [daily_flights]
+"""
+import sys
+import time
+from datetime import datetime
+
+from common import seeded_database
+
+from src.models import Airport, ConnectionIndex
+from src.models.database import execute_query, get_connection
+
+
+def shifted(hhmm, minutes):
+    total = (int(hhmm[:2]) * 60 + int(hhmm[3:]) + minutes) % (24 * 60)
+    return f"{total // 60:02d}:{total % 60:02d}"
+
+
+def run(daily_flights):
+    seeded_database()
+    flights = execute_query("SELECT route_id, departure_time, arrival_time, flight_date, capacity FROM flights")
+    per_day = len(flights) // 7
+    copies = max(0, daily_flights // per_day - 1)
+
+    conn = get_connection()
+    with conn:
+        conn.executemany(
+            "INSERT INTO flights (route_id, departure_time, arrival_time, flight_date, capacity) VALUES (?, ?, ?, ?, ?)",
+            ((f['route_id'], shifted(f['departure_time'], 7 * k), shifted(f['arrival_time'], 7 * k),
+              f['flight_date'], f['capacity'])
+             for k in range(1, copies + 1) for f in flights)
+        )
+    total = execute_query("SELECT COUNT(*) FROM flights")[0][0]
+    print(f"{total:,} flights, ~{total // 7:,} a day")
+
+    today = datetime.now().strftime('%Y-%m-%d')
+    start = time.perf_counter()
+    index = ConnectionIndex(today)
+    print(f"index for 3 days built in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    codes = [airport.code for airport in Airport.get_all()]
+    pairs = [(a, b) for a in codes for b in codes if a != b]
+    timings = []
+    found = 0
+    for origin, destination in pairs:
+        start = time.perf_counter()
+        found += len(index.search(origin, destination, today))
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    print(f"{len(pairs)} searches: median {timings[len(timings) // 2] * 1000:.2f}ms, "
+          f"max {timings[-1] * 1000:.2f}ms, {found:,} itineraries returned")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 3000)
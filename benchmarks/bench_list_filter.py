@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+ListSelector type-ahead filtering: prefix index versus rescanning every label.
+
+Labels every passenger of a generated dataset the way the passenger selectors
+do, builds the PrefixIndex once, then times each keystroke of a few names
+typed one character at a time: looked up from scratch, and narrowed from the
+previous keystroke's matches the way ListSelector does. The rescan row
+matches every label's words against the typed words on each keystroke
+instead, which is what filtering costs without an index. Also times whole
+keystrokes through ListSelector on the passenger list, which searches for at
+most PagedSource.search_limit candidates and indexes them, searching again
+while a search comes back full.
+
+    python3 benchmarks/bench_list_filter.py [size]
+"""
+import re
+import sys
+import time
+
+from common import fixture_database
+
+import curses
+from src.models import Passenger
+from src.ui.menu import ListSelector, PagedSource, PrefixIndex
+
+ROWS, COLS = 40, 120
+TYPED = ["smith", "maria g", "jo", "li wei"]
+
+
+class OffscreenWindow:
+    """Just enough of a curses window for ListSelector"""
+
+    def getmaxyx(self):
+        return ROWS, COLS
+
+
+def rescan(labels, text):
+    """Positions of labels matching text, checking every label"""
+    typed = re.findall(r'[0-9a-z]+', text.lower())
+    matches = []
+    for position, label in enumerate(labels):
+        words = re.findall(r'[0-9a-z]+', label.lower())
+        if all(any(word.startswith(t) for word in words) for t in typed):
+            matches.append(position)
+    return matches
+
+
+def per_keystroke(step):
+    """(worst ms, mean ms) of step(previous text, its matches, text) over the TYPED strings"""
+    times = []
+    for text in TYPED:
+        matches = None
+        for end in range(1, len(text) + 1):
+            started = time.perf_counter()
+            matches = step(text[:end - 1], matches, text[:end])
+            times.append(time.perf_counter() - started)
+    return max(times) * 1000, sum(times) / len(times) * 1000
+
+
+def run(size):
+    fixture_database(size)
+    # ScreenBase sets up colour pairs, which needs a real terminal
+    curses.init_pair = lambda *args: None
+    curses.color_pair = lambda number: 0
+
+    labels = [f"{p.full_name()} (ID: {p.id})" for p in Passenger.get_all()]
+    started = time.perf_counter()
+    index = PrefixIndex(labels)
+    built = time.perf_counter() - started
+    for text in TYPED:
+        assert index.matches(text) == rescan(labels, text), text
+
+    print(f"{len(labels):,} labels, index built once in {built * 1000:.1f}ms")
+    print(f"{'':14} {'worst ms/key':>12} {'mean ms/key':>12}")
+    steps = (
+        ("rescan", lambda previous, matches, text: rescan(labels, text)),
+        ("prefix index", lambda previous, matches, text: index.matches(text)),
+        ("index, narrow", lambda previous, matches, text:
+            index.matches(text) if matches is None else index.narrow(matches, previous, text)),
+    )
+    for name, step in steps:
+        worst, mean = per_keystroke(step)
+        print(f"{name:14} {worst:12.3f} {mean:12.3f}")
+
+    max_visible = ROWS - 10
+    for text in TYPED:
+        searches = []
+
+        def search(words, limit):
+            searches.append(words)
+            return Passenger.search(words, limit)
+
+        selector = ListSelector(OffscreenWindow(), "SELECT PASSENGER",
+                                PagedSource(Passenger.get_page, Passenger.page_key, search=search),
+                                lambda p: f"{p.full_name()} (ID: {p.id})")
+        selector.load_first_page(max_visible)
+        times = []
+        candidates = 0
+        for end in range(1, len(text) + 1):
+            started = time.perf_counter()
+            selector.set_filter(text[:end], max_visible)
+            times.append((time.perf_counter() - started) * 1000)
+            candidates = max(candidates, len(selector.candidates))
+        print(f"ListSelector {text!r:10} {max(times):7.3f}ms/key worst, {sum(times) / len(times):.3f}ms mean, "
+              f"{len(searches)} searches, at most {candidates:,} candidates, {len(selector.items):,} matches")
+
+
+if __name__ == '__main__':
+    run(sys.argv[1] if len(sys.argv) > 1 else 'medium')
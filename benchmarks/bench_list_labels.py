@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+ListSelector redraw cost while scrolling, with and without cached labels.
+
+Scrolls down through the flights of one day on the small generated dataset,
+drawing every frame into an off-screen window, with a label that runs a
+query per row (the way the booking screen used to show seats left). The
+uncached run drops the label cache before every frame, which is what
+ListSelector did before labels were memoized. Statements are counted with
+a query hook.
+
+    python3 benchmarks/bench_list_labels.py [presses]
+"""
+import sys
+import time
+
+from common import fixture_database
+
+import curses
+from src.models import Flight
+from src.models.database import add_query_hook, remove_query_hook
+from src.ui.menu import ListSelector, PagedSource
+
+ROWS, COLS = 40, 120
+
+
+class OffscreenWindow:
+    """Just enough of a curses window for ListSelector to draw into"""
+
+    def getmaxyx(self):
+        return ROWS, COLS
+
+    def addstr(self, *args):
+        pass
+
+    def attron(self, attr):
+        pass
+
+    def attroff(self, attr):
+        pass
+
+
+def scroll(selector, presses, cached):
+    max_visible = ROWS - 10
+    selector.load_first_page(max_visible)
+    started = time.perf_counter()
+    for _ in range(presses):
+        if not cached:
+            selector.invalidate_labels()
+        selector.draw_list_items(max_visible)
+        if selector.current_selection == len(selector.items) - 1 and selector.more_after:
+            selector.load_next_page(max_visible)
+        if selector.current_selection < len(selector.items) - 1:
+            selector.current_selection += 1
+            if selector.current_selection >= selector.scroll_offset + max_visible:
+                selector.scroll_offset = selector.current_selection - max_visible + 1
+    return time.perf_counter() - started
+
+
+def run(presses):
+    fixture_database('small')
+    flight_date = Flight.get_all()[0].flight_date
+    # ScreenBase sets up colour pairs, which needs a real terminal
+    curses.init_pair = lambda *args: None
+    curses.color_pair = lambda number: 0
+
+    statements = []
+
+    def count(kind, query, params, elapsed, rows, caller):
+        statements.append(query)
+
+    add_query_hook(count)
+    try:
+        for name, cached in (("uncached", False), ("cached", True)):
+            labels = []
+
+            def label(flight):
+                labels.append(flight.id)
+                return f"{flight.flight_number} {flight.departure_time} ({Flight.get_available_seats(flight.id)} seats)"
+
+            selector = ListSelector(OffscreenWindow(), "SELECT FLIGHT",
+                                    PagedSource(lambda **page: Flight.get_page(flight_date, **page), Flight.page_key),
+                                    label)
+            del statements[:]
+            elapsed = scroll(selector, presses, cached)
+            print(f"{name:9} {presses} presses: {elapsed / presses * 1000:7.3f}ms/frame, "
+                  f"{len(labels):6,} labels built, {len(statements):6,} statements")
+    finally:
+        remove_query_hook(count)
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
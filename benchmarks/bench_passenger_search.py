@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Passenger.search with LIKE scans versus the FTS5 name index.
+
+Builds a passenger table of each requested size (synthetic, deterministic
+names) and times a few typical searches both ways.
+
+    python3 benchmarks/bench_passenger_search.py [size ...]   (default: 100000 10000000)
+"""
+import random
+import sys
+
+from common import use_temp_database, time_calls
+
+from src.database import init_database
+from src.models import Passenger
+from src.models.database import get_db_connection, execute_query, close_connection
+
+SYLLABLES = ['an', 'be', 'ca', 'do', 'el', 'fi', 'ga', 'ho', 'is', 'jo', 'ka', 'li',
+             'ma', 'no', 'ol', 'pe', 'ri', 'sa', 'ta', 'vi', 'wa', 'ya', 'ze', 'mi']
+SEARCHES = ['smith', 'ol', 'kali', 'emma sm']
+
+
+def synthetic_name(rng):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+
+def like_search(search_term):
+    """Passenger.search without the FTS index"""
+    query = """
+        SELECT * FROM passengers
+        WHERE first_name LIKE ? OR last_name LIKE ?
+        ORDER BY last_name, first_name
+    """
+    search_pattern = f"%{search_term}%"
+    return execute_query(query, (search_pattern, search_pattern), model=Passenger)
+
+
+def build(size):
+    close_connection()
+    use_temp_database()
+    init_database()
+    rng = random.Random(size)
+    with get_db_connection() as conn:
+        conn.executemany(
+            "INSERT INTO passengers (first_name, last_name, date_of_birth) VALUES (?, ?, ?)",
+            ((synthetic_name(rng), 'Smith' if i % 1000 == 0 else synthetic_name(rng), '2010-05-15')
+             for i in range(size)))
+        conn.commit()
+
+
+def run(sizes):
+    for size in sizes:
+        build(size)
+        print(f"passengers={size}")
+        print(f"  {'search':10} {'matches':>8} {'LIKE ms':>10} {'FTS5 ms':>10} {'speedup':>8}")
+        for term in SEARCHES:
+            iterations = 3
+            matches = len(Passenger.search(term))
+            like, _ = time_calls(lambda: like_search(term), iterations)
+            fts, _ = time_calls(lambda: Passenger.search(term), iterations)
+            print(f"  {term!r:10} {matches:8} {like / iterations * 1000:10.1f} "
+                  f"{fts / iterations * 1000:10.1f} {like / fts:7.1f}x")
+
+
+if __name__ == '__main__':
+    run([int(arg) for arg in sys.argv[1:]] or [100000, 10000000])
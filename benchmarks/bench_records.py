@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory and construction time of model records.
+
+Compares the old construction path (sqlite3.Row -> dict -> __dict__-backed
+object) with the __slots__ models built by record_factory, loading
+Flight.get_all() over a large flights table.
+
+    python3 benchmarks/bench_records.py [flights]
+"""
+import sqlite3
+import sys
+import time
+import tracemalloc
+
+from common import seeded_database
+
+from src.models import Flight
+from src.models.database import get_db_connection
+
+
+class DictFlight:
+    """Flight as it was before __slots__: one __dict__ per instance"""
+
+    def __init__(self, id, route_id, departure_time, arrival_time, flight_date, capacity,
+                 flight_number=None, origin_code=None, dest_code=None,
+                 origin_city=None, dest_city=None):
+        self.id = id
+        self.route_id = route_id
+        self.departure_time = departure_time
+        self.arrival_time = arrival_time
+        self.flight_date = flight_date
+        self.capacity = capacity
+        self.flight_number = flight_number
+        self.origin_code = origin_code
+        self.dest_code = dest_code
+        self.origin_city = origin_city
+        self.dest_city = dest_city
+
+
+GET_ALL_QUERY = """
+    SELECT f.*, r.flight_number,
+           o.code as origin_code, o.city as origin_city,
+           d.code as dest_code, d.city as dest_city
+    FROM flights f
+    JOIN routes r ON f.route_id = r.id
+    JOIN airports o ON r.origin_airport_id = o.id
+    JOIN airports d ON r.destination_airport_id = d.id
+    ORDER BY f.flight_date, f.departure_time
+"""
+
+
+def load_dict_flights():
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.row_factory = sqlite3.Row
+        return [DictFlight(**dict(row)) for row in cursor.execute(GET_ALL_QUERY)]
+
+
+def measure(name, func):
+    # Time without tracemalloc (it slows allocation), then trace a second run for memory
+    start = time.perf_counter()
+    records = func()
+    elapsed = time.perf_counter() - start
+    count = len(records)
+    del records
+
+    tracemalloc.start()
+    records = func()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    print(f"{name:24} {count:>9} rows {elapsed:8.2f}s "
+          f"{current / 2 ** 20:9.1f} MiB retained {peak / 2 ** 20:9.1f} MiB peak")
+
+
+def run(flights):
+    seeded_database()
+    with get_db_connection() as conn:
+        existing = conn.execute("SELECT COUNT(*) FROM flights").fetchone()[0]
+        conn.executemany(
+            "INSERT INTO flights (route_id, departure_time, arrival_time, flight_date, capacity) "
+            "VALUES (?, ?, ?, ?, ?)",
+            ((i % 22 + 1, f"{i % 24:02d}:00", f"{(i + 2) % 24:02d}:00",
+              f"2030-{i % 12 + 1:02d}-{i % 28 + 1:02d}", 150)
+             for i in range(max(0, flights - existing))))
+        conn.commit()
+
+    measure("dict(row) + __dict__", load_dict_flights)
+    measure("record_factory + slots", Flight.get_all)
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Flight.get_all with airport/route joins versus bare flight rows
+enriched from the in-process reference cache.
+
+    python3 benchmarks/bench_reference_cache.py [iterations]
+"""
+import sys
+
+from common import seeded_database, time_calls
+
+from src.models import Flight
+from src.models.database import execute_query
+from src.models.reference_cache import reference_cache
+
+
+JOIN_QUERY = """
+    SELECT f.*, r.flight_number,
+           o.code as origin_code, o.city as origin_city,
+           d.code as dest_code, d.city as dest_city
+    FROM flights f
+    JOIN routes r ON f.route_id = r.id
+    JOIN airports o ON r.origin_airport_id = o.id
+    JOIN airports d ON r.destination_airport_id = d.id
+"""
+
+
+def joined_get_all(date_filter=None):
+    """Flight.get_all as it was before the reference cache"""
+    query = JOIN_QUERY
+    params = None
+    if date_filter:
+        query += " WHERE f.flight_date = ?"
+        params = (date_filter,)
+    query += " ORDER BY f.flight_date, f.departure_time"
+    return execute_query(query, params, model=Flight)
+
+
+def run(iterations):
+    seeded_database()
+    date = Flight.get_all()[0].flight_date
+
+    print(f"{'query':24} {'join ops/s':>12} {'cached ops/s':>13} {'speedup':>8}")
+    for name, date_filter in (("Flight.get_all()", None), ("Flight.get_all(date)", date)):
+        _, joined = time_calls(lambda: joined_get_all(date_filter), iterations)
+        _, cached = time_calls(lambda: Flight.get_all(date_filter), iterations)
+        print(f"{name:24} {joined:12.0f} {cached:13.0f} {cached / joined:7.1f}x")
+
+    print(f"reference cache: {reference_cache.stats()}")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Terminal output per keypress: full clear-and-redraw versus diffed frames.
+
+Runs main.py in a pseudo-terminal against the small generated dataset and
+presses Down repeatedly, first in the main menu and then in the passenger
+list, counting the bytes written to the terminal and the time until the
+frame is complete after each key. The "clear" run patches ScreenBase.clear
+back to stdscr.clear(), which repaints the whole screen every time.
+
+    python3 benchmarks/bench_rendering.py [keys]
+"""
+import fcntl
+import os
+import pty
+import select
+import statistics
+import struct
+import sys
+import termios
+import time
+
+from common import ROOT, fixture_database
+
+ROWS, COLS = 40, 120
+DOWN = b"\x1bOB"          # cursor key in keypad (application) mode
+QUIET = 0.03              # a frame is complete after this long without output
+
+MODES = {
+    'clear': "import src.ui.screen_base as s; s.ScreenBase.clear = lambda self: self.stdscr.clear()\n",
+    'diff': "",
+}
+
+
+class Terminal:
+    """main.py running in a pty"""
+
+    def __init__(self, mode, db_path):
+        env = dict(os.environ, KIDAIRLINES_DB=db_path, TERM='xterm-256color')
+        code = ("import runpy, sys; sys.path.insert(0, '.')\n" + MODES[mode]
+                + "runpy.run_path('main.py', run_name='__main__')")
+        self.pid, self.fd = pty.fork()
+        if self.pid == 0:
+            os.chdir(ROOT)
+            os.execvpe(sys.executable, [sys.executable, '-c', code], env)
+        fcntl.ioctl(self.fd, termios.TIOCSWINSZ, struct.pack('HHHH', ROWS, COLS, 0, 0))
+
+    def read_frame(self, timeout=10):
+        """(bytes, seconds until the last byte) of the output that follows"""
+        started = time.perf_counter()
+        last = started
+        output = b""
+        while True:
+            wait = QUIET if output else timeout
+            if not select.select([self.fd], [], [], wait)[0]:
+                return output, last - started
+            try:
+                chunk = os.read(self.fd, 65536)
+            except OSError:
+                chunk = b""  # the child closed the terminal
+            if not chunk:
+                return output, last - started
+            output += chunk
+            last = time.perf_counter()
+
+    def press(self, key):
+        os.write(self.fd, key)
+        return self.read_frame()
+
+    def close(self):
+        for key in (b"\x1b", b"\x1b", b"q"):
+            os.write(self.fd, key)
+            self.read_frame(timeout=1)
+        os.waitpid(self.pid, 0)
+        os.close(self.fd)
+
+
+def press_down(terminal, count):
+    sizes, latencies = [], []
+    for _ in range(count):
+        output, elapsed = terminal.press(DOWN)
+        sizes.append(len(output))
+        latencies.append(elapsed)
+    return sizes, latencies
+
+
+def run(keys):
+    db_path = fixture_database('small')
+    results = {}
+    for mode in MODES:
+        terminal = Terminal(mode, db_path)
+        first, _ = terminal.read_frame()
+        assert b"MAIN MENU" in first, first[-200:]
+        results[mode, 'main menu'] = press_down(terminal, min(keys, 8))
+        terminal.press(b"3")      # passenger list
+        results[mode, 'passenger list'] = press_down(terminal, keys)
+        terminal.close()
+
+    print(f"{'mode':6} {'screen':15} {'bytes/key':>10} {'total bytes':>12} {'median ms':>10}")
+    for (mode, screen), (sizes, latencies) in results.items():
+        print(f"{mode:6} {screen:15} {statistics.mean(sizes):>10,.0f} {sum(sizes):>12,} "
+              f"{statistics.median(latencies) * 1000:>10.2f}")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 60)
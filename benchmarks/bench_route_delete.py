@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark: deleting a route that has a year of flights and bookings.
+
+"app-level" removes bookings and flights one flight at a time with separate
+execute_update() calls (what the app would have to do without cascades);
+"cascade" is Route.delete(), one DELETE that ON DELETE CASCADE fans out.
+
+    python3 benchmarks/bench_route_delete.py [flights_per_day] [bookings_per_flight]
+"""
+import sys
+import time
+from datetime import date, timedelta
+
+from common import seeded_database
+
+from src.models import Flight, Route
+from src.models.database import get_db_connection, execute_query, execute_update
+
+
+def build_route(flight_number, flights_per_day, bookings_per_flight):
+    """Create a route with 365 days of flights, each with bookings"""
+    route_id = Route.create(1, 2, flight_number)
+    with get_db_connection() as conn:
+        for day in range(365):
+            flight_date = (date(2031, 1, 1) + timedelta(days=day)).isoformat()
+            for slot in range(flights_per_day):
+                cursor = conn.execute(
+                    "INSERT INTO flights (route_id, departure_time, arrival_time, flight_date, capacity) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (route_id, f"{6 + slot:02d}:00", f"{8 + slot:02d}:00", flight_date, 300))
+                flight_id = cursor.lastrowid
+                conn.executemany(
+                    "INSERT INTO reservation_flights (reservation_id, flight_id, seat_number) VALUES (1, ?, ?)",
+                    ((flight_id, str(seat)) for seat in range(bookings_per_flight)))
+        conn.commit()
+    return route_id
+
+
+def app_level_delete(route_id):
+    flight_ids = [row['id'] for row in execute_query("SELECT id FROM flights WHERE route_id = ?", (route_id,))]
+    for flight_id in flight_ids:
+        execute_update("DELETE FROM reservation_flights WHERE flight_id = ?", (flight_id,))
+        execute_update("DELETE FROM flights WHERE id = ?", (flight_id,))
+    execute_update("DELETE FROM routes WHERE id = ?", (route_id,))
+
+
+def run(flights_per_day, bookings_per_flight):
+    seeded_database()
+    for name, delete in (("app-level", app_level_delete), ("cascade", Route.delete)):
+        route_id = build_route(f"BENCH-{name}", flights_per_day, bookings_per_flight)
+        flights = execute_query("SELECT COUNT(*) FROM flights WHERE route_id = ?", (route_id,))[0][0]
+        start = time.perf_counter()
+        delete(route_id)
+        elapsed = time.perf_counter() - start
+        print(f"{name:10} deleted {flights} flights / {flights * bookings_per_flight} bookings "
+              f"in {elapsed * 1000:.1f} ms")
+
+    drift = Flight.check_inventory()
+    orphans = execute_query("SELECT COUNT(*) FROM flights WHERE route_id NOT IN (SELECT id FROM routes)")[0][0]
+    print(f"inventory drift: {len(drift)}, orphaned flights: {orphans}")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 4,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20)
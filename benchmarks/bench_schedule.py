@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Schedule expansion: a year of flights for hundreds of routes.
+
+Adds N synthetic routes with three departures a day, then expands D days of
+schedule twice on fresh databases: once the old seed_data way (one
+cursor.execute and one arrival calculation per flight) and once with
+expand_schedule(). Re-running expand_schedule() over the same days must
+insert nothing.
+
+    python3 benchmarks/bench_schedule.py [routes] [days]
+"""
+import sqlite3
+import sys
+import time
+from datetime import date, timedelta
+
+from common import seeded_database
+
+from src.database.schedule import expand_schedule, calculate_arrival_time
+
+
+def add_routes(conn, count):
+    """Add `count` routes between seeded airports and return their schedule templates"""
+    airport_ids = [row[0] for row in conn.execute("SELECT id FROM airports")]
+    templates = {}
+    with conn:
+        for n in range(count):
+            origin = airport_ids[n % len(airport_ids)]
+            destination = airport_ids[(n // len(airport_ids) + 1 + n) % len(airport_ids)]
+            if destination == origin:
+                destination = airport_ids[(airport_ids.index(origin) + 1) % len(airport_ids)]
+            flight_number = f"BX{n:04d}"
+            conn.execute("INSERT INTO routes (origin_airport_id, destination_airport_id, flight_number) VALUES (?, ?, ?)",
+                         (origin, destination, flight_number))
+            duration = 60 + (n * 37) % 600
+            templates[flight_number] = [(f"{6 + n % 4:02d}:{(n * 5) % 60:02d}", duration, 150),
+                                        (f"{12 + n % 3:02d}:15", duration, 180),
+                                        (f"{18 + n % 5:02d}:45", duration, 150)]
+    return templates
+
+
+def expand_per_row(conn, start, days, templates):
+    """The original seed_data loop"""
+    route_ids = dict(conn.execute("SELECT flight_number, id FROM routes").fetchall())
+    cursor = conn.cursor()
+    for day_offset in range(days):
+        flight_date = (start + timedelta(days=day_offset)).strftime('%Y-%m-%d')
+        for flight_number, schedules in templates.items():
+            for departure, duration, capacity in schedules:
+                arrival = calculate_arrival_time(departure, duration)
+                cursor.execute(
+                    "INSERT INTO flights (route_id, departure_time, arrival_time, flight_date, capacity) VALUES (?, ?, ?, ?, ?)",
+                    (route_ids[flight_number], departure, arrival, flight_date, capacity)
+                )
+    conn.commit()
+
+
+def run(routes, days):
+    start = date.today() + timedelta(days=30)
+    end = start + timedelta(days=days - 1)
+    results = {}
+    for name in ('per-row execute', 'expand_schedule'):
+        conn = sqlite3.connect(seeded_database())
+        conn.execute("PRAGMA foreign_keys = ON")
+        templates = add_routes(conn, routes)
+
+        began = time.perf_counter()
+        if name == 'expand_schedule':
+            expand_schedule(conn, start, end, templates)
+        else:
+            expand_per_row(conn, start, days, templates)
+        elapsed = time.perf_counter() - began
+
+        count = conn.execute("SELECT COUNT(*) FROM flights WHERE flight_date BETWEEN ? AND ?",
+                             (start.isoformat(), end.isoformat())).fetchone()[0]
+        results[name] = conn.execute(
+            "SELECT route_id, departure_time, arrival_time, flight_date, capacity FROM flights ORDER BY id"
+        ).fetchall()
+        print(f"{name:16} {count:,} flights in {elapsed:.2f}s = {count / elapsed:,.0f} flights/s")
+
+        if name == 'expand_schedule':
+            began = time.perf_counter()
+            again = expand_schedule(conn, start, end, templates)
+            print(f"{'re-run':16} inserted {again} in {time.perf_counter() - began:.2f}s")
+            assert again == 0, "re-running the expansion duplicated flights"
+        conn.close()
+
+    assert results['per-row execute'] == results['expand_schedule'], "expansions differ"
+    print("both expansions produced identical flights")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 300,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 365)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Seat map assignment speed and correctness.
+
+Times next_free()/best_block() on an in-memory SeatMap against a linear scan
+over seat labels, then fills one seeded flight with group and single
+auto-seat bookings until it sells out and checks every seat went to exactly
+one passenger.
+
+    python3 benchmarks/bench_seat_map.py [iterations]
+"""
+import sys
+
+from common import seeded_database, time_calls
+
+from src.models import Reservation, SeatMap
+from src.models.database import execute_query
+
+
+def scan_next_free(seat_map, taken):
+    """The obvious way: walk the labels until one isn't taken"""
+    for index in range(seat_map.capacity):
+        label = seat_map.label(index)
+        if label not in taken:
+            return label
+    return None
+
+
+def run(iterations):
+    seeded_database()
+
+    # Worst case for a scan: every seat but the last one taken
+    seat_map = SeatMap(1, 250)
+    taken = {seat_map.label(index) for index in range(249)}
+    for label in taken:
+        seat_map.occupy(label)
+
+    for name, func in [
+        ('bitset next_free', seat_map.next_free),
+        ('label scan next_free', lambda: scan_next_free(seat_map, taken)),
+        ('bitset best_block(3)', lambda: seat_map.best_block(3)),
+    ]:
+        elapsed, ops = time_calls(func, iterations)
+        print(f"{name:24} {ops:>12,.0f} ops/s")
+
+    flight = execute_query("SELECT id, capacity FROM flights ORDER BY capacity DESC LIMIT 1")[0]
+    passenger_id = execute_query("SELECT id FROM passengers LIMIT 1")[0]['id']
+
+    booked = 0
+    groups = 0
+    while True:
+        bookings = Reservation.book_group([passenger_id] * 3, flight['id'])
+        if bookings[0][0] != Reservation.BOOKED:
+            break
+        groups += 1
+        booked += len(bookings)
+    while Reservation.book_auto_seat(passenger_id, flight['id'])[0] == Reservation.BOOKED:
+        booked += 1
+
+    seats = [row['seat_number'] for row in execute_query(
+        "SELECT seat_number FROM reservation_flights WHERE flight_id = ?", (flight['id'],))]
+    assert len(seats) == len(set(seats)), "seat assigned twice"
+    assert len(seats) <= flight['capacity'], "flight overbooked"
+    print(f"filled flight {flight['id']} ({flight['capacity']} seats): {groups} groups of 3, "
+          f"{booked - groups * 3} singles, {len(seats)} seats taken, no duplicates")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Startup time: process launch to the first main-menu frame.
+
+Runs main.py in a pseudo-terminal against a seeded database and times how long
+it takes until "MAIN MENU" has been drawn, then quits with 'q'. Also times
+init_database() in-process on a current database (one pragma read) against
+re-running the schema scripts the way every launch used to.
+
+    python3 benchmarks/bench_startup.py [launches]
+"""
+import fcntl
+import os
+import pty
+import select
+import sqlite3
+import statistics
+import struct
+import sys
+import termios
+import time
+
+from common import ROOT, seeded_database, time_calls
+
+from src.database import init_database
+from src.database.migrations import migrate, set_schema_version
+
+FIRST_FRAME = b"MAIN MENU"
+TIMEOUT = 30
+
+
+def launch_to_first_frame(db_path, rows=40, cols=120):
+    """Seconds from spawning main.py until the main menu is on screen"""
+    env = dict(os.environ, KIDAIRLINES_DB=db_path, TERM='xterm-256color')
+    started = time.perf_counter()
+    pid, fd = pty.fork()
+    if pid == 0:
+        os.chdir(ROOT)
+        os.execvpe(sys.executable, [sys.executable, 'main.py'], env)
+    fcntl.ioctl(fd, termios.TIOCSWINSZ, struct.pack('HHHH', rows, cols, 0, 0))
+
+    output = b""
+    elapsed = None
+    try:
+        while time.perf_counter() - started < TIMEOUT:
+            ready, _, _ = select.select([fd], [], [], 0.5)
+            if not ready:
+                continue
+            try:
+                output += os.read(fd, 65536)
+            except OSError:
+                break  # child exited
+            if FIRST_FRAME in output:
+                elapsed = time.perf_counter() - started
+                break
+        os.write(fd, b"q")
+        # Drain until the child closes the terminal
+        while select.select([fd], [], [], 2)[0]:
+            try:
+                if not os.read(fd, 65536):
+                    break
+            except OSError:
+                break
+    finally:
+        os.waitpid(pid, 0)
+        os.close(fd)
+    if elapsed is None:
+        raise RuntimeError(f"main menu never appeared; last output: {output[-300:]!r}")
+    return elapsed
+
+
+def rerun_schema_scripts():
+    """What every launch used to do: cascade check, schema.sql and schema_fts.sql again"""
+    conn = sqlite3.connect(os.environ['KIDAIRLINES_DB'])
+    conn.execute("PRAGMA foreign_keys = ON")
+    set_schema_version(conn, 0)
+    migrate(conn, target=3)
+    conn.close()
+
+
+def run(launches):
+    db_path = seeded_database()
+    # Output of init_database() would swamp the results
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        fast, _ = time_calls(init_database, 200)
+        scripts, _ = time_calls(rerun_schema_scripts, 50)
+    finally:
+        sys.stdout.close()
+        sys.stdout = sys.__stdout__
+    init_database()
+    print(f"init_database, current database:   {fast / 200 * 1000:8.3f}ms")
+    print(f"re-running the schema scripts:      {scripts / 50 * 1000:8.3f}ms")
+
+    launch_to_first_frame(db_path)  # warm the page cache and .pyc files
+    times = sorted(launch_to_first_frame(db_path) for _ in range(launches))
+    print(f"launch -> first menu frame ({launches} runs): median {statistics.median(times) * 1000:.1f}ms, "
+          f"min {times[0] * 1000:.1f}ms, max {times[-1] * 1000:.1f}ms")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
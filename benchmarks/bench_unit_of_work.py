@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bookings per second with separate commits versus one unit of work.
+
+"before" books the way BookingScreen used to: Reservation.create() and
+Reservation.add_flight() each commit on their own. "after" uses
+Reservation.book(), which runs both inside one BEGIN IMMEDIATE ... COMMIT.
+
+    python3 benchmarks/bench_unit_of_work.py [bookings]
+"""
+import sys
+
+from common import seeded_database, time_calls
+
+from src.models import Flight, Reservation
+from src.models.database import configure_storage
+
+
+def run(bookings):
+    seeded_database()
+    flight_ids = [f.id for f in Flight.get_all()]
+    seats = iter(range(10 ** 9))
+
+    def separate_commits():
+        flight_id = flight_ids[next(seats) % len(flight_ids)]
+        reservation_id, _ = Reservation.create(1)
+        Reservation.add_flight(reservation_id, flight_id, f"S{next(seats)}")
+
+    def unit_of_work():
+        flight_id = flight_ids[next(seats) % len(flight_ids)]
+        Reservation.book(1, flight_id, f"S{next(seats)}")
+
+    print(f"{'synchronous':12} {'before/s':>10} {'after/s':>10} {'speedup':>8}")
+    for synchronous in ('NORMAL', 'FULL'):
+        configure_storage(synchronous=synchronous)
+        _, before = time_calls(separate_commits, bookings)
+        _, after = time_calls(unit_of_work, bookings)
+        print(f"{synchronous:12} {before:10.0f} {after:10.0f} {after / before:7.1f}x")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression check for the SQL the models issue.
+
+Calls every public model method once against a generated dataset (see
+fixture_database), records each distinct statement through the query hooks,
+and runs EXPLAIN QUERY PLAN on it. Fails when a statement
+
+  * scans a large table (outside the methods that read a whole table by design),
+  * sorts with a temp B-tree while scanning a large table, or
+  * has a plan that differs from the golden file in benchmarks/query_plans/,
+
+and when a foreign key on a large table has no index (cascading deletes and
+the integrity checks would scan the child table for every parent row).
+
+    python3 benchmarks/check_query_plans.py [--size medium] [--update]
+
+--update rewrites the golden files from the current plans; commit them with
+the schema or query change that moved them.
+"""
+import argparse
+import difflib
+import os
+import random
+import re
+import sys
+
+from common import fixture_database
+from suite import collect_samples, read_cases, write_cases
+
+from src.models import Airport, Route, Flight, Passenger, Reservation
+from src.models import database
+from src.models.database import execute_query, close_connection
+from src.models.reference_cache import reference_cache
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'query_plans')
+
+# Tables with at least this many rows in the dataset must be reached through an index
+LARGE_TABLE_ROWS = 10000
+
+# Methods that return every row of a table; a full scan is the point of them
+FULL_TABLE_CASES = {
+    'Airport.get_all', 'Route.get_all', 'Route.iter_all', 'Flight.get_all', 'Flight.iter_all',
+    'Flight.check_inventory', 'Passenger.get_all', 'Passenger.iter_all',
+    'Reservation.get_all', 'Reservation.iter_all',
+}
+
+# Methods whose temp B-tree sorts only a handful of filtered rows from a full scan
+SORT_CASES = {'Flight.check_inventory'}   # orders the drifted flights by id
+
+# Words that can follow FROM/JOIN <table> and aren't an alias
+_KEYWORDS = {'WHERE', 'ON', 'JOIN', 'LEFT', 'INNER', 'CROSS', 'ORDER', 'GROUP', 'LIMIT', 'USING',
+             'SET', 'VALUES', 'AND', 'OR', 'AS', 'UNION', 'HAVING', 'NATURAL', 'WINDOW'}
+_TABLE_REF = re.compile(r'\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+_SCAN = re.compile(r'^SCAN (\w+)')
+
+
+def extra_cases(s):
+    """Methods the benchmark suite doesn't time, including the manifest and admin writes"""
+    flight_id = s['flight_ids'][0]
+    passenger_id = s['passenger_ids'][0]
+    reservation_id = next(i for i in s['reservation_ids'] if i)
+    route = Route.get_all()[-1]
+
+    return [
+        ('Route.get_by_id', lambda: Route.get_by_id(route.id)),
+        ('Route.iter_all', lambda: list(Route.iter_all())),
+        ('Flight.iter_all', lambda: list(Flight.iter_all(s['dates'][0]))),
+        ('Flight.get_manifest', lambda: Flight.get_manifest(flight_id)),
+        ('Passenger.iter_all', lambda: list(Passenger.iter_all())),
+        ('Passenger.search', lambda: Passenger.search('sm', limit=501)),
+        ('Reservation.iter_all', lambda: list(Reservation.iter_all())),
+        ('Airport.create', lambda: Airport.create('ZZZ', 'Plan Check', 'Nowhere')),
+        ('Airport.update_status', lambda: Airport.update_status(1, 1)),
+        ('Route.create', lambda: Route.create(route.origin_airport_id, route.destination_airport_id, 'ZZ001')),
+        ('Flight.create', lambda: Flight.create(route.id, '09:00', '10:00', s['dates'][0])),
+        ('Passenger.update', lambda: Passenger.update(passenger_id, 'Plan', 'Check', '2010-01-01')),
+        ('Reservation.book', lambda: Reservation.book(passenger_id, flight_id)),
+        ('Reservation.book_group', lambda: Reservation.book_group([passenger_id] * 2, flight_id)),
+        ('Reservation.book_itinerary', lambda: Reservation.book_itinerary(passenger_id, s['flight_ids'][1:3])),
+        ('Reservation.add_flight', lambda: Reservation.add_flight(reservation_id, flight_id)),
+        ('Reservation.remove_flight', lambda: Reservation.remove_flight(reservation_id, flight_id)),
+        ('Reservation.delete', lambda: Reservation.delete(reservation_id)),
+        ('Reservation.delete_many', lambda: Reservation.delete_many(s['reservation_ids'][1:5])),
+        ('Route.delete', lambda: Route.delete(route.id)),
+        ('Route.delete_many', lambda: Route.delete_many([route.id])),
+    ]
+
+
+class StatementRecorder:
+    """Query hook that keeps the first parameters seen for each (case, statement)"""
+
+    def __init__(self):
+        self.case = None
+        self.statements = {}
+
+    def __call__(self, kind, query, params, elapsed, rows, caller):
+        # Pragmas (the reference cache's data_version check) have no plan to compare
+        if self.case is not None and not query.lstrip().upper().startswith('PRAGMA'):
+            self.statements.setdefault((self.case, " ".join(query.split())), (query, params))
+
+
+def collect_statements(size):
+    """{(case name, one-line SQL): (SQL, params)} for every model method, on a private copy"""
+    close_connection()
+    fixture_database(size, copy=True)
+    reference_cache.invalidate()
+    samples = collect_samples(random.Random(size))
+    recorder = StatementRecorder()
+    database.add_query_hook(recorder)
+    try:
+        for make_cases in (read_cases, write_cases, extra_cases):
+            recorder.case = None  # setup queries aren't attributed to a case
+            for name, func in make_cases(samples):
+                recorder.case = name.split('(')[0]
+                func()
+    finally:
+        database.remove_query_hook(recorder)
+    return recorder.statements
+
+
+def explain(conn, query, params):
+    """EXPLAIN QUERY PLAN output as indented lines"""
+    rows = conn.execute("EXPLAIN QUERY PLAN " + query, params or ()).fetchall()
+    depth = {0: -1}
+    lines = []
+    for node, parent, _, detail in rows:
+        depth[node] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node] + detail)
+    return lines
+
+
+def table_aliases(query):
+    aliases = {}
+    for table, alias in _TABLE_REF.findall(query):
+        aliases[table] = table
+        if alias and alias.upper() not in _KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def plan_problems(case, query, plan, large_tables):
+    aliases = table_aliases(query)
+    scanned = []
+    for line in plan:
+        match = _SCAN.match(line.strip())
+        if match and 'VIRTUAL TABLE' not in line:
+            table = aliases.get(match.group(1), match.group(1))
+            if table in large_tables:
+                scanned.append((table, line))
+    # Walking an index in order under a LIMIT (keyset pages) reads only one page
+    if re.search(r'\bLIMIT\b', query, re.IGNORECASE) and not any('USE TEMP B-TREE' in line for line in plan):
+        scanned = [table for table, line in scanned if 'USING' not in line]
+    else:
+        scanned = [table for table, _ in scanned]
+    problems = []
+    if scanned and case not in FULL_TABLE_CASES:
+        problems.append(f"full scan of {', '.join(scanned)}")
+    if scanned and case not in SORT_CASES and any('USE TEMP B-TREE' in line for line in plan):
+        problems.append(f"temp B-tree sort while scanning {', '.join(scanned)}")
+    return problems
+
+
+def unindexed_foreign_keys(conn, large_tables):
+    """(table, column, parent) for foreign keys on large tables with no index starting at the column"""
+    missing = []
+    for table in sorted(large_tables):
+        # An INTEGER PRIMARY KEY is the rowid and needs no separate index
+        leading = {column[1] for column in conn.execute(f"PRAGMA table_info({table})").fetchall()
+                   if column[5] == 1 and column[2].upper() == 'INTEGER'}
+        for index in conn.execute(f"PRAGMA index_list({table})").fetchall():
+            columns = conn.execute(f"PRAGMA index_info({index[1]})").fetchall()
+            if columns:
+                leading.add(columns[0][2])
+        for fk in conn.execute(f"PRAGMA foreign_key_list({table})").fetchall():
+            if fk[3] not in leading:
+                missing.append((table, fk[3], fk[2]))
+    return missing
+
+
+def golden_text(entries):
+    """Golden file contents: one block per (case, statement), sorted"""
+    blocks = [f"== {case}\n{sql}\n" + "\n".join("  " + line for line in plan) + "\n"
+              for case, sql, plan in sorted(entries)]
+    return "\n".join(blocks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check model query plans against golden files")
+    parser.add_argument('--size', default='medium', help="generated dataset size (default: medium)")
+    parser.add_argument('--update', action='store_true', help="rewrite the golden files")
+    args = parser.parse_args()
+
+    statements = collect_statements(args.size)
+
+    # Plans are taken on a fresh copy, so the writes above don't skew the statistics
+    close_connection()
+    fixture_database(args.size, copy=True)
+    conn = database.get_connection()
+    master = execute_query("SELECT name, sql FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")
+    virtual = [name for name, sql in master if sql.upper().startswith('CREATE VIRTUAL')]
+    # Leave out virtual tables and their shadow tables (passengers_fts_docsize etc.)
+    tables = [name for name, _ in master
+              if name not in virtual and not any(name.startswith(v + '_') for v in virtual)]
+    large_tables = {table for table in tables
+                    if execute_query(f"SELECT COUNT(*) FROM {table}")[0][0] >= LARGE_TABLE_ROWS}
+
+    failures = 0
+    by_model = {}
+    for (case, sql), (query, params) in statements.items():
+        plan = explain(conn, query, params)
+        by_model.setdefault(case.split('.')[0], []).append((case, sql, plan))
+        for problem in plan_problems(case, query, plan, large_tables):
+            failures += 1
+            print(f"FAIL {case}: {problem}\n     {sql}\n" + "\n".join("       " + line for line in plan))
+
+    for table, column, parent in unindexed_foreign_keys(conn, large_tables):
+        failures += 1
+        print(f"FAIL {table}.{column} references {parent} but has no index")
+
+    golden_dir = os.path.join(GOLDEN_DIR, args.size)
+    if args.update:
+        os.makedirs(golden_dir, exist_ok=True)
+    for model, entries in sorted(by_model.items()):
+        text = golden_text(entries)
+        path = os.path.join(golden_dir, f"{model}.txt")
+        if args.update:
+            with open(path, 'w') as f:
+                f.write(text)
+            continue
+        expected = open(path).read() if os.path.exists(path) else ""
+        if text != expected:
+            failures += 1
+            print(f"FAIL plans changed for {model} (rerun with --update if intended):")
+            sys.stdout.writelines(difflib.unified_diff(expected.splitlines(True), text.splitlines(True),
+                                                       f"golden/{model}.txt", f"current/{model}.txt"))
+
+    print(f"{len(statements)} statement(s) from {len(by_model)} model(s) on the {args.size} dataset; "
+          f"large tables: {', '.join(sorted(large_tables))}")
+    if args.update:
+        print(f"Golden files written to {golden_dir}")
+    print(f"{failures} failure(s)")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
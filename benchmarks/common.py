@@ -0,0 +1,70 @@
+"""Shared helpers for the benchmark scripts"""
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date
+
+# Make the project importable when a benchmark is run as a script
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def use_temp_database(name='bench.db'):
+    """Point KIDAIRLINES_DB at a fresh file in a temp directory and return its path"""
+    db_path = os.path.join(tempfile.mkdtemp(prefix='kidairlines-bench-'), name)
+    os.environ['KIDAIRLINES_DB'] = db_path
+    return db_path
+
+
+def seeded_database():
+    """Create a temp database with the standard seed data"""
+    from src.database import init_database
+    db_path = use_temp_database()
+    init_database()
+    return db_path
+
+
+def fixture_database(size='small', copy=False, **overrides):
+    """
+    Point KIDAIRLINES_DB at a generated dataset (see src/database/generate.py) and return
+    its path. Datasets are cached in the temp directory per size, counts, day and schema, so
+    they're only built once; pass copy=True to get a private copy to write to.
+    """
+    from src.database.generate import SIZES, generate_dataset
+
+    counts = dict(SIZES[size], **overrides)
+    # Keyed on the schema too, so adding an index doesn't leave a stale cached dataset
+    with open(os.path.join(ROOT, 'src', 'database', 'schema.sql'), 'rb') as f:
+        schema = hashlib.sha1(f.read()).hexdigest()[:8]
+    name = '-'.join([size] + [f"{key}{value}" for key, value in sorted(overrides.items())]
+                    + [date.today().isoformat(), schema])
+    cache_dir = os.path.join(tempfile.gettempdir(), 'kidairlines-fixtures')
+    os.makedirs(cache_dir, exist_ok=True)
+    db_path = os.path.join(cache_dir, f"{name}.db")
+    if not os.path.exists(db_path):
+        print(f"Generating {size} dataset (cached at {db_path})...")
+        building = db_path + '.building'
+        if os.path.exists(building):
+            os.remove(building)
+        generate_dataset(building, **counts)
+        os.replace(building, db_path)
+
+    if copy:
+        private = use_temp_database(f"{name}.db")
+        shutil.copyfile(db_path, private)
+        return private
+    os.environ['KIDAIRLINES_DB'] = db_path
+    return db_path
+
+
+def time_calls(func, iterations):
+    """Run func `iterations` times and return (total_seconds, ops_per_sec)"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+    return elapsed, iterations / elapsed if elapsed else float('inf')
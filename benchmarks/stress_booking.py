@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Stress harness: N processes race to book the same flight.
+
+Every worker keeps claiming seats (random seat labels, so some attempts collide)
+until the flight reports SOLD_OUT. The harness then asserts that the flight was
+not overbooked and that flight_inventory agrees with reservation_flights, and
+reports throughput and latency percentiles.
+
+    python3 benchmarks/stress_booking.py [processes] [capacity]
+"""
+import multiprocessing
+import random
+import sys
+import time
+
+from common import seeded_database
+
+from src.models import Flight, Reservation
+from src.models.database import execute_query, close_connection
+
+
+def worker(flight_id, capacity, seed, results):
+    close_connection()  # never share the parent's connection
+    rng = random.Random(seed)
+    latencies = []
+    outcomes = {Reservation.BOOKED: 0, Reservation.SOLD_OUT: 0, Reservation.SEAT_TAKEN: 0, 'ERROR': 0}
+    while True:
+        seat = f"{rng.randrange(capacity * 2)}"
+        start = time.perf_counter()
+        try:
+            result, _, _ = Reservation.book(1, flight_id, seat)
+        except Exception:
+            result = 'ERROR'
+        latencies.append(time.perf_counter() - start)
+        outcomes[result] += 1
+        if result == Reservation.SOLD_OUT:
+            break
+    results.put((outcomes, latencies))
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run(processes, capacity):
+    seeded_database()
+    route_id = execute_query("SELECT id FROM routes LIMIT 1")[0]['id']
+    flight_id = Flight.create(route_id, '12:00', '14:00', '2099-01-01', capacity)
+    close_connection()
+
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=worker, args=(flight_id, capacity, seed, results))
+               for seed in range(processes)]
+    start = time.perf_counter()
+    for p in workers:
+        p.start()
+    collected = [results.get() for _ in workers]
+    for p in workers:
+        p.join()
+    elapsed = time.perf_counter() - start
+
+    totals = {}
+    latencies = []
+    for outcomes, worker_latencies in collected:
+        for key, count in outcomes.items():
+            totals[key] = totals.get(key, 0) + count
+        latencies.extend(worker_latencies)
+
+    booked = execute_query("SELECT COUNT(*) AS n FROM reservation_flights WHERE flight_id = ?",
+                           (flight_id,))[0]['n']
+    available = Flight.get_available_seats(flight_id)
+
+    print(f"processes={processes} capacity={capacity}")
+    print(f"outcomes: {totals}")
+    print(f"attempts: {len(latencies)} in {elapsed:.2f}s = {len(latencies) / elapsed:.0f} attempts/s")
+    print(f"latency p50={percentile(latencies, 50) * 1000:.2f}ms "
+          f"p99={percentile(latencies, 99) * 1000:.2f}ms max={max(latencies) * 1000:.2f}ms")
+    print(f"booked seats: {booked} / {capacity}, available: {available}")
+
+    assert booked <= capacity, f"overbooked: {booked} > {capacity}"
+    assert booked == totals[Reservation.BOOKED], "booked count doesn't match successful claims"
+    assert available == capacity - booked, "flight_inventory drifted from reservation_flights"
+    print("OK - no overbooking")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 8,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 150)
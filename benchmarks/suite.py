@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the public model methods.
+
+Runs every case against generated datasets of increasing size (see
+fixture_database) and writes ops/sec, p50/p99 latency and peak traced memory
+per case to a JSON file. Write cases run on a private copy of each dataset.
+
+    python3 benchmarks/suite.py run [--sizes small medium] [--output results.json]
+                                    [--budget SECONDS] [--only NAME ...]
+    python3 benchmarks/suite.py compare OLD.json NEW.json [--threshold 0.2]
+
+compare exits with status 1 if any case got slower (p50 or ops/sec) or used
+more peak memory than the threshold allows.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from itertools import cycle
+
+from common import fixture_database
+
+from src.models import Airport, Route, Flight, Passenger, Reservation, SeatMap, ConnectionIndex
+from src.models.database import execute_query, close_connection
+from src.models.reference_cache import reference_cache
+
+SAMPLES = 200                # distinct arguments drawn per case
+MIN_CALLS = 3
+MAX_CALLS = 5000
+# Gitignored, so a run without --output doesn't leave a stray file in the working tree
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench-results.json')
+
+
+def collect_samples(rng):
+    """Real ids, dates, names and codes from the current database to call methods with"""
+    def column(query, params=()):
+        return [row[0] for row in execute_query(query, params)]
+
+    def sample(values):
+        return rng.sample(values, min(SAMPLES, len(values))) or [None]
+
+    max_flight = column("SELECT MAX(id) FROM flights")[0]
+    max_passenger = column("SELECT MAX(id) FROM passengers")[0]
+    max_reservation = column("SELECT MAX(id) FROM reservations")[0] or 0
+    reservation_ids = sample(range(1, max_reservation + 1))
+    last_names = column("SELECT last_name FROM passengers WHERE id IN (%s)"
+                        % ", ".join(str(rng.randint(1, max_passenger)) for _ in range(SAMPLES)))
+    return {
+        'airport_codes': sample(column("SELECT code FROM airports")),
+        'flight_numbers': sample(column("SELECT flight_number FROM routes")),
+        'flight_ids': sample(range(1, max_flight + 1)),
+        'dates': column("SELECT DISTINCT flight_date FROM flights ORDER BY 1"),
+        'passenger_ids': sample(range(1, max_passenger + 1)),
+        'search_terms': [name if i % 2 else name[:3] for i, name in enumerate(last_names)],
+        'reservation_ids': reservation_ids,
+        'confirmations': column("SELECT confirmation_number FROM reservations WHERE id IN (%s)"
+                                % ", ".join(str(i) for i in reservation_ids if i)) or [None],
+    }
+
+
+def read_cases(s):
+    """(name, callable) pairs that don't modify the database"""
+    airport_codes = cycle(s['airport_codes'])
+    flight_numbers = cycle(s['flight_numbers'])
+    flight_ids = cycle(s['flight_ids'])
+    dates = cycle(s['dates'])
+    passenger_ids = cycle(s['passenger_ids'])
+    search_terms = cycle(s['search_terms'])
+    reservation_ids = cycle(s['reservation_ids'])
+    confirmations = cycle(s['confirmations'])
+    reservations = [Reservation.get_by_id(i) for i in s['reservation_ids'][:50] if i]
+    reservation_cycle = cycle(reservations or [None])
+    index = ConnectionIndex(s['dates'][0])
+    airport_pairs = cycle(list(zip(s['airport_codes'], reversed(s['airport_codes']))))
+
+    return [
+        ('Airport.get_all', Airport.get_all),
+        ('Airport.get_by_code', lambda: Airport.get_by_code(next(airport_codes))),
+        ('Route.get_all', Route.get_all),
+        ('Route.get_by_flight_number', lambda: Route.get_by_flight_number(next(flight_numbers))),
+        ('Flight.get_all', Flight.get_all),
+        ('Flight.get_all(date)', lambda: Flight.get_all(next(dates))),
+        ('Flight.get_all_with_availability(date)', lambda: Flight.get_all_with_availability(next(dates))),
+        ('Flight.get_page(date)', lambda: Flight.get_page(next(dates), min_seats=1)),
+        ('Flight.get_by_id', lambda: Flight.get_by_id(next(flight_ids))),
+        ('Flight.get_available_seats', lambda: Flight.get_available_seats(next(flight_ids))),
+        ('Flight.check_inventory', Flight.check_inventory),
+        ('Passenger.get_all', Passenger.get_all),
+        ('Passenger.get_page', Passenger.get_page),
+        ('Passenger.get_by_id', lambda: Passenger.get_by_id(next(passenger_ids))),
+        ('Passenger.search', lambda: Passenger.search(next(search_terms))),
+        ('Reservation.get_all', Reservation.get_all),
+        ('Reservation.get_by_id', lambda: Reservation.get_by_id(next(reservation_ids))),
+        ('Reservation.get_by_confirmation', lambda: Reservation.get_by_confirmation(next(confirmations))),
+        ('Reservation.get_by_passenger', lambda: Reservation.get_by_passenger(next(passenger_ids))),
+        ('Reservation.get_flights', lambda: next(reservation_cycle).get_flights()),
+        ('Reservation.get_flights_for_many(50)', lambda: Reservation.get_flights_for_many(s['reservation_ids'][:50])),
+        ('SeatMap.load', lambda: SeatMap.load(next(flight_ids))),
+        ('ConnectionIndex(3 days)', lambda: ConnectionIndex(next(dates))),
+        ('ConnectionIndex.search', lambda: index.search(*next(airport_pairs))),
+    ]
+
+
+def write_cases(s):
+    """(name, callable) pairs that add or change rows; run on a private copy"""
+    flight_ids = cycle(s['flight_ids'])
+    passenger_ids = cycle(s['passenger_ids'])
+    reservation_ids = cycle(s['reservation_ids'])
+    statuses = cycle(['CANCELLED', 'CONFIRMED'])
+
+    return [
+        ('Passenger.create', lambda: Passenger.create('Bench', 'Mark', '2010-05-15')),
+        ('Reservation.book_auto_seat', lambda: Reservation.book_auto_seat(next(passenger_ids), next(flight_ids))),
+        ('Reservation.update_status', lambda: Reservation.update_status(next(reservation_ids), next(statuses))),
+    ]
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def measure(func, budget):
+    """Call func until the time budget runs out; latency stats plus peak memory of one traced call"""
+    func()  # warm caches and statement cache
+    latencies = []
+    perf_counter = time.perf_counter
+    deadline = perf_counter() + budget
+    while len(latencies) < MIN_CALLS or (perf_counter() < deadline and len(latencies) < MAX_CALLS):
+        start = perf_counter()
+        func()
+        latencies.append(perf_counter() - start)
+
+    # Traced separately: tracemalloc slows allocation down too much to time under it
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        'calls': len(latencies),
+        'ops_per_sec': len(latencies) / total if total else float('inf'),
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'peak_kib': peak / 1024,
+    }
+
+
+def run(args):
+    results = []
+    for size in args.sizes:
+        for mode, make_cases in (('read', read_cases), ('write', write_cases)):
+            close_connection()
+            fixture_database(size, copy=(mode == 'write'))
+            reference_cache.invalidate()
+            counts = {table: execute_query(f"SELECT COUNT(*) FROM {table}")[0][0]
+                      for table in ('flights', 'passengers', 'reservations')}
+            cases = make_cases(collect_samples(random.Random(size)))
+            for name, func in cases:
+                if args.only and not any(part in name for part in args.only):
+                    continue
+                stats = measure(func, args.budget)
+                results.append(dict(size=size, case=name, rows=counts, **stats))
+                print(f"{size:7} {name:42} {stats['ops_per_sec']:>11,.1f} ops/s  p50 {stats['p50_ms']:9.3f}ms"
+                      f"  p99 {stats['p99_ms']:9.3f}ms  peak {stats['peak_kib']:>10,.0f} KiB")
+
+    report = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'budget_seconds': args.budget,
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+
+def compare(args):
+    with open(args.old) as f:
+        old = {(r['size'], r['case']): r for r in json.load(f)['results']}
+    with open(args.new) as f:
+        new = {(r['size'], r['case']): r for r in json.load(f)['results']}
+
+    regressions = 0
+    print(f"{'size':7} {'case':42} {'p50 old':>10} {'p50 new':>10} {'ops/s Δ':>8} {'peak Δ':>8}")
+    for key in sorted(old.keys() & new.keys()):
+        before, after = old[key], new[key]
+        p50 = after['p50_ms'] / before['p50_ms'] - 1 if before['p50_ms'] else 0.0
+        ops = after['ops_per_sec'] / before['ops_per_sec'] - 1 if before['ops_per_sec'] else 0.0
+        peak = after['peak_kib'] / before['peak_kib'] - 1 if before['peak_kib'] else 0.0
+        flags = []
+        if p50 > args.threshold:
+            flags.append('SLOWER')
+        if ops < -args.threshold:
+            flags.append('FEWER OPS')
+        if peak > args.threshold and after['peak_kib'] - before['peak_kib'] > 64:
+            flags.append('MORE MEMORY')
+        regressions += bool(flags)
+        print(f"{key[0]:7} {key[1]:42} {before['p50_ms']:9.3f}ms {after['p50_ms']:9.3f}ms "
+              f"{ops:+7.0%} {peak:+7.0%}  {' '.join(flags)}")
+
+    only_old = len(old.keys() - new.keys())
+    if only_old:
+        print(f"{only_old} case(s) in {args.old} were not run in {args.new}")
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="KidAirlines model benchmark suite")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="run the suite and write a JSON report")
+    run_parser.add_argument('--sizes', nargs='+', default=['small', 'medium'],
+                            help="dataset sizes from src/database/generate.py (default: small medium)")
+    run_parser.add_argument('--output', default=DEFAULT_OUTPUT,
+                            help="report path (default: benchmarks/bench-results.json)")
+    run_parser.add_argument('--budget', type=float, default=1.0, help="seconds per case (default: 1)")
+    run_parser.add_argument('--only', nargs='+', help="run only cases whose name contains one of these")
+
+    compare_parser = commands.add_parser('compare', help="flag regressions between two reports")
+    compare_parser.add_argument('old')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=0.2,
+                                help="allowed relative slowdown (default: 0.2 = 20%%)")
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        run(args)
+        return 0
+    return compare(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
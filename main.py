@@ -3,27 +3,60 @@
 KidAirlines - Retro Airline Reservation System
 """
 import curses
+import importlib
 import sys
 import os
+import threading
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.database import init_database
 from src.ui.menu import Menu
-from src.ui.flights_screen import FlightsScreen
-from src.ui.booking_screen import BookingScreen
-from src.ui.reservations_screen import ReservationsScreen, ItineraryScreen
-from src.ui.manifest_screen import ManifestScreen
-from src.ui.config_screen import ConfigScreen
-from src.ui.manage_reservations_screen import ManageReservationsScreen
+
+
+# Main menu: (label, module in src.ui, screen class). Screens are imported and
+# constructed the first time they're opened, so startup only pays for the menu.
+SCREENS = [
+    ("1. View Routes & Flights", 'flights_screen', 'FlightsScreen'),
+    ("2. Book Tickets", 'booking_screen', 'BookingScreen'),
+    ("3. View Passenger Reservations", 'reservations_screen', 'ReservationsScreen'),
+    ("4. View Itinerary", 'reservations_screen', 'ItineraryScreen'),
+    ("5. View Flight Manifest", 'manifest_screen', 'ManifestScreen'),
+    ("6. Configuration", 'config_screen', 'ConfigScreen'),
+    ("7. Manage Reservations", 'manage_reservations_screen', 'ManageReservationsScreen'),
+    ("8. View Seat Map", 'seat_map_screen', 'SeatMapScreen'),
+]
+
+
+class DatabaseInit(threading.Thread):
+    """Runs init_database() in the background while the first menu is drawn"""
+
+    def __init__(self):
+        # Not a daemon: quitting straight away still lets a migration finish
+        super().__init__(name="init-database")
+        self.error = None
+
+    def run(self):
+        try:
+            from src.database import init_database
+            init_database(verbose=False)
+        except BaseException as error:
+            self.error = error
+
+    def wait(self):
+        """Block until the database is ready; re-raises anything init_database raised"""
+        self.join()
+        if self.error is not None:
+            raise self.error
 
 
 class KidAirlinesApp:
     """Main application class"""
 
-    def __init__(self, stdscr):
+    def __init__(self, stdscr, database=None):
         self.stdscr = stdscr
+        self.database = database
+        self.screens = {}
         self.setup_terminal()
 
     def setup_terminal(self):
@@ -36,45 +69,14 @@ class KidAirlinesApp:
             curses.start_color()
             curses.use_default_colors()
 
-    def view_flights(self):
-        """View flights and routes"""
-        screen = FlightsScreen(self.stdscr)
-        screen.display()
-        return None
-
-    def book_tickets(self):
-        """Book tickets"""
-        screen = BookingScreen(self.stdscr)
-        screen.display()
-        return None
-
-    def view_reservations(self):
-        """View passenger reservations"""
-        screen = ReservationsScreen(self.stdscr)
-        screen.display()
-        return None
-
-    def view_itinerary(self):
-        """View itinerary"""
-        screen = ItineraryScreen(self.stdscr)
-        screen.display()
-        return None
-
-    def view_manifest(self):
-        """View flight manifest"""
-        screen = ManifestScreen(self.stdscr)
-        screen.display()
-        return None
-
-    def configuration(self):
-        """Configuration screen"""
-        screen = ConfigScreen(self.stdscr)
-        screen.display()
-        return None
-
-    def manage_reservations(self):
-        """Manage reservations"""
-        screen = ManageReservationsScreen(self.stdscr)
+    def open_screen(self, module, class_name):
+        """Show a screen, importing and constructing it on first use"""
+        if self.database is not None:
+            self.database.wait()
+        screen = self.screens.get(class_name)
+        if screen is None:
+            screen_class = getattr(importlib.import_module(f"src.ui.{module}"), class_name)
+            screen = self.screens[class_name] = screen_class(self.stdscr)
         screen.display()
         return None
 
@@ -85,36 +87,33 @@ class KidAirlinesApp:
     def run(self):
         """Run the main application"""
         menu_options = [
-            ("1. View Routes & Flights", self.view_flights),
-            ("2. Book Tickets", self.book_tickets),
-            ("3. View Passenger Reservations", self.view_reservations),
-            ("4. View Itinerary", self.view_itinerary),
-            ("5. View Flight Manifest", self.view_manifest),
-            ("6. Configuration", self.configuration),
-            ("7. Manage Reservations", self.manage_reservations),
-            ("8. Exit", self.exit_app)
+            (label, lambda module=module, class_name=class_name: self.open_screen(module, class_name))
+            for label, module, class_name in SCREENS
         ]
+        menu_options.append(("9. Exit", self.exit_app))
 
         menu = Menu(self.stdscr, "MAIN MENU", menu_options)
         menu.display()
 
 
-def main(stdscr):
+def main(stdscr, database=None):
     """Main entry point"""
-    app = KidAirlinesApp(stdscr)
+    app = KidAirlinesApp(stdscr, database)
     app.run()
 
 
 if __name__ == '__main__':
-    # Initialize database
-    print("Initializing KidAirlines database...")
-    init_database()
-    print("Database ready!")
-    print("Starting KidAirlines...")
-    print()
+    if os.environ.get('KIDAIRLINES_PROFILE'):
+        from src.models.instrumentation import enable_from_environment
+        enable_from_environment()
+
+    # Bring the database up to date while the menu is drawn; screens wait for it
+    database = DatabaseInit()
+    database.start()
 
     try:
-        curses.wrapper(main)
+        curses.wrapper(main, database)
+        database.wait()
     except KeyboardInterrupt:
         print("\nGoodbye!")
         sys.exit(0)
@@ -0,0 +1,80 @@
+"""
+Collision-free confirmation numbers.
+
+Sequence values 0 .. 36^6-1 are scrambled by a 4-round Feistel network over
+two base-36 halves and written as 6 characters of A-Z0-9. The network is a
+bijection, so distinct sequence values always give distinct confirmation
+numbers, yet consecutive bookings don't get similar-looking codes. Databases
+upgraded from random codes may already hold some of them; free_codes() skips
+those.
+"""
+import string
+
+ALPHABET = string.ascii_uppercase + string.digits
+CODE_LENGTH = 6
+HALF = len(ALPHABET) ** (CODE_LENGTH // 2)    # 36^3 values per half
+SPACE = HALF * HALF                           # 36^6 possible numbers
+
+# Round keys - changing these changes every future confirmation number
+ROUND_KEYS = (0x3C6EF372, 0x1B873593, 0x7F4A7C15, 0x2545F491)
+
+
+def _round(value, key):
+    """Feistel round function: any deterministic mix of (value, key) works"""
+    x = (value * 0x45D9F3B + key) & 0xFFFFFFFF
+    x = (((x >> 16) ^ x) * 0x45D9F3B) & 0xFFFFFFFF
+    return ((x >> 16) ^ x) % HALF
+
+
+def encode(sequence_value):
+    """Map a sequence value in [0, SPACE) to its 6-character confirmation number"""
+    left, right = divmod(sequence_value, HALF)
+    for key in ROUND_KEYS:
+        left, right = right, (left + _round(right, key)) % HALF
+    value = left * HALF + right
+
+    chars = []
+    for _ in range(CODE_LENGTH):
+        value, digit = divmod(value, len(ALPHABET))
+        chars.append(ALPHABET[digit])
+    return ''.join(reversed(chars))
+
+
+def decode(confirmation_number):
+    """Inverse of encode(): recover the sequence value of a confirmation number"""
+    value = 0
+    for char in confirmation_number:
+        value = value * len(ALPHABET) + ALPHABET.index(char)
+
+    left, right = divmod(value, HALF)
+    for key in reversed(ROUND_KEYS):
+        left, right = (right - _round(left, key)) % HALF, left
+    return left * HALF + right
+
+
+def allocate_block(conn, size):
+    """
+    Reserve `size` sequence values in confirmation_sequence and return them as a range.
+    Runs on `conn`'s current transaction; the caller commits.
+    """
+    start = conn.execute("SELECT next_value FROM confirmation_sequence WHERE id = 1").fetchone()[0]
+    end = min(start + size, SPACE)
+    if start >= end:
+        raise RuntimeError("Confirmation numbers exhausted")
+    conn.execute("UPDATE confirmation_sequence SET next_value = ? WHERE id = 1", (end,))
+    return range(start, end)
+
+
+def free_codes(conn, values, chunk_size=500):
+    """
+    Confirmation numbers for `values`, leaving out any that reservations already use
+    (random codes from before the sequence existed). One indexed lookup per chunk.
+    """
+    codes = [encode(value) for value in values]
+    taken = set()
+    for start in range(0, len(codes), chunk_size):
+        chunk = codes[start:start + chunk_size]
+        rows = conn.execute("SELECT confirmation_number FROM reservations "
+                            f"WHERE confirmation_number IN ({', '.join('?' * len(chunk))})", chunk)
+        taken.update(row[0] for row in rows)
+    return [code for code in codes if code not in taken]
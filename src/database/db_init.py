@@ -2,18 +2,31 @@ import sqlite3
 import os
 from datetime import datetime, timedelta
 import random
-import string
+from .confirmation_codes import allocate_block, encode
+from .migrations import MIGRATIONS, SCHEMA_VERSION, get_schema_version, migrate, set_schema_version
+from .schedule import expand_schedule
 
 
 def get_db_path():
-    """Get the path to the database file"""
+    """Get the path to the database file (KIDAIRLINES_DB overrides the default)"""
+    override = os.environ.get('KIDAIRLINES_DB')
+    if override:
+        return override
     return os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'kidairlines.db')
 
 
-def init_database():
-    """Initialize the database with schema"""
-    db_path = get_db_path()
-    conn = sqlite3.connect(db_path)
+def fts5_available(conn):
+    """Check whether this SQLite build supports FTS5"""
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)")
+        conn.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def apply_schema(conn):
+    """Create any missing tables, indexes and triggers"""
     cursor = conn.cursor()
 
     # Read and execute schema
@@ -24,17 +37,53 @@ def init_database():
     cursor.executescript(schema)
     conn.commit()
 
-    # Check if we need to seed data
-    cursor.execute("SELECT COUNT(*) FROM airports")
-    if cursor.fetchone()[0] == 0:
-        seed_data(conn)
-
-    conn.close()
-    print(f"Database initialized at: {db_path}")
-
 
-def seed_data(conn):
-    """Seed the database with sample data - Hub-and-Spoke network centered on EWR"""
+def apply_fts_schema(conn):
+    """Create the passenger name index if this SQLite build has FTS5; it's optional"""
+    cursor = conn.cursor()
+    if fts5_available(conn):
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'passengers_fts'")
+        fts_is_new = cursor.fetchone()[0] == 0
+        with open(os.path.join(os.path.dirname(__file__), 'schema_fts.sql'), 'r') as f:
+            cursor.executescript(f.read())
+        if fts_is_new:
+            # Index passengers that existed before the FTS table did
+            cursor.execute("INSERT INTO passengers_fts (passengers_fts) VALUES ('rebuild')")
+        conn.commit()
+
+
+def init_database(verbose=True):
+    """Bring the database up to the current schema version, seeding it if it's new"""
+    db_path = get_db_path()
+    conn = sqlite3.connect(db_path)
+    try:
+        # Common case: already current, so one pragma read is all startup costs
+        version = get_schema_version(conn)
+        if version < SCHEMA_VERSION:
+            conn.execute("PRAGMA foreign_keys = ON")
+            if version == 0:
+                # New database: every step is safe to re-run, so leave user_version
+                # at 0 until the sample data is in and set it in the seed's own
+                # transaction. A seed that fails or is interrupted rolls back with
+                # the version, and the next launch starts over.
+                for _, _, step in MIGRATIONS:
+                    step(conn)
+                if conn.execute("SELECT COUNT(*) FROM airports").fetchone()[0] == 0:
+                    seed_data(conn, verbose)
+                set_schema_version(conn, SCHEMA_VERSION)
+            else:
+                migrate(conn)
+    finally:
+        conn.close()
+    if verbose:
+        print(f"Database initialized at: {db_path}")
+
+
+def seed_data(conn, verbose=True):
+    """
+    Seed the database with sample data - Hub-and-Spoke network centered on EWR.
+    Runs on conn's current transaction; the caller commits.
+    """
     cursor = conn.cursor()
 
     # Airports - EWR as hub with domestic and international destinations
@@ -92,60 +141,9 @@ def seed_data(conn):
         routes
     )
 
-    # Realistic flight durations and schedules (in hours:minutes)
-    # Format: route_id: [(departure_time, duration_in_minutes, capacity), ...]
-    route_schedules = {
-        # Outbound from EWR
-        1: [('06:00', 120, 150), ('12:00', 120, 150), ('18:00', 120, 150)],  # EWR->DTW (2h)
-        2: [('07:00', 150, 180), ('13:30', 150, 180), ('19:00', 150, 180)],  # EWR->ORD (2.5h)
-        3: [('08:00', 180, 150), ('14:00', 180, 150), ('20:00', 180, 150)],  # EWR->PBI (3h)
-        4: [('06:30', 60, 120), ('10:00', 60, 120), ('14:00', 60, 120), ('18:00', 60, 120)],  # EWR->BWI (1h)
-        5: [('07:30', 180, 180), ('12:00', 180, 180), ('17:00', 180, 180)],  # EWR->MIA (3h)
-        6: [('20:00', 1140, 250)],  # EWR->DPS Bali (19h) - overnight long-haul
-        7: [('19:30', 660, 250)],   # EWR->CAI Cairo (11h) - overnight
-        8: [('18:00', 450, 220), ('21:30', 450, 220)],  # EWR->CDG Paris (7.5h)
-        9: [('19:00', 420, 220), ('22:00', 420, 220)],  # EWR->LHR London (7h)
-        10: [('08:00', 370, 180), ('14:00', 370, 180), ('20:00', 370, 180)],  # EWR->SFO (6h 10m)
-        11: [('09:00', 180, 150), ('15:00', 180, 150)],  # EWR->OMA Omaha (3h)
-
-        # Inbound to EWR
-        12: [('08:00', 120, 150), ('14:00', 120, 150), ('20:00', 120, 150)],  # DTW->EWR (2h)
-        13: [('06:00', 150, 180), ('11:30', 150, 180), ('17:00', 150, 180)],  # ORD->EWR (2.5h)
-        14: [('07:00', 180, 150), ('13:00', 180, 150), ('19:00', 180, 150)],  # PBI->EWR (3h)
-        15: [('07:00', 60, 120), ('11:00', 60, 120), ('15:00', 60, 120), ('19:00', 60, 120)],  # BWI->EWR (1h)
-        16: [('06:30', 180, 180), ('11:00', 180, 180), ('16:00', 180, 180)],  # MIA->EWR (3h)
-        17: [('22:00', 1080, 250)],  # DPS->EWR (18h) - overnight long-haul
-        18: [('23:00', 660, 250)],   # CAI->EWR (11h) - overnight
-        19: [('10:00', 480, 220), ('13:30', 480, 220)],  # CDG->EWR (8h) - westbound adds time
-        20: [('09:00', 450, 220), ('12:00', 450, 220)],  # LHR->EWR (7.5h) - westbound
-        21: [('07:00', 340, 180), ('13:00', 340, 180), ('19:00', 340, 180)],  # SFO->EWR (5h 40m) - tailwind
-        22: [('08:00', 180, 150), ('14:00', 180, 150)],  # OMA->EWR (3h)
-    }
-
-    def calculate_arrival_time(departure, duration_minutes):
-        """Calculate arrival time given departure and duration"""
-        dep_hour, dep_min = map(int, departure.split(':'))
-        total_minutes = dep_hour * 60 + dep_min + duration_minutes
-
-        # Handle next-day arrivals
-        arr_hour = (total_minutes // 60) % 24
-        arr_min = total_minutes % 60
-
-        return f"{arr_hour:02d}:{arr_min:02d}"
-
-    # Generate flights for the next 7 days
+    # Generate flights for the next 7 days from the route schedule templates
     today = datetime.now()
-    for day_offset in range(7):
-        flight_date = (today + timedelta(days=day_offset)).strftime('%Y-%m-%d')
-
-        for route_id, schedules in route_schedules.items():
-            for departure, duration, capacity in schedules:
-                arrival = calculate_arrival_time(departure, duration)
-
-                cursor.execute(
-                    "INSERT INTO flights (route_id, departure_time, arrival_time, flight_date, capacity) VALUES (?, ?, ?, ?, ?)",
-                    (route_id, departure, arrival, flight_date, capacity)
-                )
+    expand_schedule(conn, today, today + timedelta(days=6))
 
     # Sample passengers
     first_names = ['Emma', 'Liam', 'Olivia', 'Noah', 'Ava', 'Ethan', 'Sophia', 'Mason']
@@ -159,8 +157,9 @@ def seed_data(conn):
             )
 
     # Sample reservations
+    conf_numbers = allocate_block(conn, 5)
     for i in range(5):
-        conf_number = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
+        conf_number = encode(conf_numbers[i])
         passenger_id = random.randint(1, 15)
 
         cursor.execute(
@@ -180,8 +179,8 @@ def seed_data(conn):
         except sqlite3.IntegrityError:
             pass  # Skip if seat already taken
 
-    conn.commit()
-    print("Sample data seeded successfully")
+    if verbose:
+        print("Sample data seeded successfully")
 
 
 if __name__ == '__main__':
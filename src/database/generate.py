@@ -0,0 +1,349 @@
+"""
+Deterministic synthetic datasets for load testing and benchmarks.
+
+Builds a new database with the requested number of airports, routes, days of
+flights, passengers and reservations (some of them multi-leg). The same seed
+and start date always produce the same database. Rows are generated lazily and
+written with executemany() in batches, so memory stays flat however many
+passengers and reservations are asked for.
+
+    python3 src/database/generate.py OUTPUT.db [--size medium] [--passengers N] [--seed 42] ...
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+from itertools import islice, product
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.database.db_init import apply_schema, apply_fts_schema
+from src.database.migrations import SCHEMA_VERSION, set_schema_version
+from src.database.schedule import expand_schedule
+from src.database.confirmation_codes import allocate_block, encode
+
+
+# Presets; any count can be overridden individually
+SIZES = {
+    'small': {'airports': 50, 'routes': 400, 'days': 14, 'passengers': 10000, 'reservations': 10000},
+    'medium': {'airports': 200, 'routes': 2000, 'days': 30, 'passengers': 250000, 'reservations': 250000},
+    'large': {'airports': 500, 'routes': 5000, 'days': 60, 'passengers': 2000000, 'reservations': 2000000},
+}
+
+DEFAULT_SEED = 42
+MULTI_LEG_SHARE = 0.25      # reservations with a connecting second flight
+CANCELLED_SHARE = 0.05
+HUB_SHARE = 0.05            # airports that every other airport connects through
+BATCH_SIZE = 10000          # rows per executemany() call
+
+# Same connection window the itinerary search uses
+MIN_CONNECTION_MINUTES = 45
+MAX_CONNECTION_MINUTES = 12 * 60
+
+FIRST_NAMES = [
+    'Emma', 'Liam', 'Olivia', 'Noah', 'Ava', 'Ethan', 'Sophia', 'Mason', 'Isabella', 'Lucas',
+    'Mia', 'Oliver', 'Amelia', 'Elijah', 'Harper', 'James', 'Evelyn', 'Benjamin', 'Abigail', 'Henry',
+    'Emily', 'Alexander', 'Ella', 'Jacob', 'Chloe', 'Michael', 'Grace', 'Daniel', 'Zoe', 'Samuel',
+    'Aria', 'Leo', 'Nora', 'Jack', 'Lily', 'Owen', 'Hannah', 'Wyatt', 'Layla', 'Caleb',
+]
+LAST_NAMES = [
+    'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez',
+    'Hernandez', 'Lopez', 'Gonzalez', 'Wilson', 'Anderson', 'Thomas', 'Taylor', 'Moore', 'Jackson', 'Martin',
+    'Lee', 'Perez', 'Thompson', 'White', 'Harris', 'Sanchez', 'Clark', 'Ramirez', 'Lewis', 'Robinson',
+    'Walker', 'Young', 'Allen', 'King', 'Wright', 'Scott', 'Torres', 'Nguyen', 'Hill', 'Flores',
+]
+SYLLABLES = ['an', 'be', 'ca', 'do', 'el', 'fi', 'ga', 'ho', 'is', 'jo', 'ka', 'li',
+             'ma', 'no', 'ol', 'pe', 'ri', 'sa', 'ta', 'vi', 'wa', 'ya', 'ze', 'mi']
+
+
+def _rng(seed, stage):
+    """Independent random stream per stage, so changing one count doesn't reshuffle the rest"""
+    return random.Random(f"{seed}-{stage}")
+
+
+def _synthetic_name(rng):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+
+def _batches(rows):
+    """Split an iterator of rows into lists of at most BATCH_SIZE"""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, BATCH_SIZE))
+        if not batch:
+            return
+        yield batch
+
+
+def _airports(rng, count):
+    codes = [''.join(letters) for letters in product('ABCDEFGHIJKLMNOPQRSTUVWXYZ', repeat=3)]
+    if count > len(codes):
+        raise ValueError(f"At most {len(codes)} airports can be generated")
+    rng.shuffle(codes)
+    for code in sorted(codes[:count]):
+        city = _synthetic_name(rng)
+        yield (code, f"{city} International Airport", city)
+
+
+def _routes(rng, airport_ids, count):
+    """Hub-and-spoke: every airport to and from a hub first, then hub-to-hub, then random pairs"""
+    hubs = airport_ids[:max(1, int(len(airport_ids) * HUB_SHARE))]
+    pairs = []
+    for airport_id in airport_ids[len(hubs):]:
+        hub = rng.choice(hubs)
+        pairs += [(hub, airport_id), (airport_id, hub)]
+    pairs += [(a, b) for a in hubs for b in hubs if a != b]
+
+    seen = set(pairs)
+    max_pairs = len(airport_ids) * (len(airport_ids) - 1)
+    while len(pairs) < min(count, max_pairs):
+        pair = tuple(rng.sample(airport_ids, 2))
+        if pair not in seen:
+            seen.add(pair)
+            pairs.append(pair)
+    return [(origin, dest, f"KA{100 + n}") for n, (origin, dest) in enumerate(pairs[:count])]
+
+
+def _templates(rng, flight_numbers):
+    """Schedule templates: 1-4 departures a day, longer routes on bigger aircraft"""
+    templates = {}
+    for flight_number in flight_numbers:
+        duration = min(45 + int(rng.expovariate(1 / 180)), 1140)
+        if duration < 120:
+            capacity = rng.choice([120, 150])
+        elif duration < 400:
+            capacity = rng.choice([150, 180])
+        else:
+            capacity = rng.choice([220, 250])
+        departures = sorted({f"{rng.randint(5, 22):02d}:{rng.randrange(0, 60, 5):02d}"
+                             for _ in range(rng.choice([1, 2, 2, 3, 3, 4]))})
+        templates[flight_number] = [(departure, duration, capacity) for departure in departures]
+    return templates
+
+
+def _passengers(rng, count, start):
+    signed_up_from = datetime.combine(start, datetime.min.time())
+    for _ in range(count):
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES) if rng.random() < 0.7 else _synthetic_name(rng)
+        born = date(1940, 1, 1) + timedelta(days=rng.randrange(80 * 365))
+        created_at = signed_up_from - timedelta(seconds=rng.randrange(2 * 365 * 24 * 3600))
+        yield (first, last, born.isoformat(), created_at.isoformat(' '))
+
+
+class _FlightPicker:
+    """Flights held in memory to pick bookable flights and connections quickly"""
+
+    def __init__(self, conn, start):
+        from src.models.seat_map import SeatMap
+
+        rows = conn.execute("""
+            SELECT f.id, r.origin_airport_id, r.destination_airport_id,
+                   f.flight_date, f.departure_time, f.arrival_time, f.capacity
+            FROM flights f JOIN routes r ON f.route_id = r.id
+            ORDER BY f.id
+        """).fetchall()
+        self.ids = []
+        self.info = {}          # flight id -> (origin, destination, arrival minute, capacity)
+        self.booked = {}
+        self.seat_maps = {}
+        by_origin = {}
+        day_offsets = {}
+        for flight_id, origin, dest, flight_date, departure_time, arrival_time, capacity in rows:
+            offset = day_offsets.get(flight_date)
+            if offset is None:
+                offset = day_offsets[flight_date] = (date.fromisoformat(flight_date) - start).days * 24 * 60
+            departure = offset + int(departure_time[:2]) * 60 + int(departure_time[3:])
+            arrival = offset + int(arrival_time[:2]) * 60 + int(arrival_time[3:])
+            if arrival <= departure:
+                arrival += 24 * 60
+            self.ids.append(flight_id)
+            self.info[flight_id] = (origin, dest, arrival, capacity)
+            self.booked[flight_id] = 0
+            by_origin.setdefault(origin, []).append((departure, flight_id))
+            if capacity not in self.seat_maps:
+                self.seat_maps[capacity] = SeatMap(None, capacity)
+
+        self.departures = {}
+        self.flights_from = {}
+        for origin, flights in by_origin.items():
+            flights.sort()
+            self.departures[origin] = [departure for departure, _ in flights]
+            self.flights_from[origin] = [flight_id for _, flight_id in flights]
+
+    def total_seats(self):
+        return sum(info[3] for info in self.info.values())
+
+    def seat(self, flight_id):
+        """Take the next seat on a flight and return its label, or None if it's full"""
+        booked = self.booked[flight_id]
+        capacity = self.info[flight_id][3]
+        if booked >= capacity:
+            return None
+        self.booked[flight_id] = booked + 1
+        return self.seat_maps[capacity].label(booked)
+
+    def any_flight(self, rng):
+        while True:
+            flight_id = rng.choice(self.ids)
+            seat = self.seat(flight_id)
+            if seat:
+                return flight_id, seat
+
+    def connection(self, rng, flight_id):
+        """A flight onward from flight_id's destination within the connection window, or None"""
+        origin, dest, arrival, _ = self.info[flight_id]
+        departures = self.departures.get(dest)
+        if not departures:
+            return None
+        first = bisect_left(departures, arrival + MIN_CONNECTION_MINUTES)
+        last = bisect_left(departures, arrival + MAX_CONNECTION_MINUTES + 1)
+        for _ in range(5):
+            if first >= last:
+                return None
+            onward = self.flights_from[dest][rng.randrange(first, last)]
+            if self.info[onward][1] != origin:
+                seat = self.seat(onward)
+                if seat:
+                    return onward, seat
+        return None
+
+
+def _reservations(rng, picker, passengers, numbers, first_id, start, multi_leg_share):
+    """Yield (reservation row, [leg rows]) pairs"""
+    booked_from = datetime.combine(start, datetime.min.time())
+    for n, number in enumerate(numbers):
+        reservation_id = first_id + n
+        created_at = booked_from - timedelta(seconds=rng.randrange(90 * 24 * 3600))
+        status = 'CANCELLED' if rng.random() < CANCELLED_SHARE else 'CONFIRMED'
+        flight_id, seat = picker.any_flight(rng)
+        legs = [(reservation_id, flight_id, seat)]
+        if rng.random() < multi_leg_share:
+            onward = picker.connection(rng, flight_id)
+            if onward:
+                legs.append((reservation_id,) + onward)
+        row = (reservation_id, rng.randint(1, passengers), encode(number),
+               created_at.isoformat(' '), status)
+        yield row, legs
+
+
+def generate_dataset(db_path, airports, routes, days, passengers, reservations,
+                     multi_leg_share=MULTI_LEG_SHARE, seed=DEFAULT_SEED, start=None, verbose=False):
+    """
+    Build a synthetic database at db_path (which must not exist yet).
+    Flights run from `start` (default today) for `days` days. Returns row counts per table.
+    """
+    if os.path.exists(db_path):
+        raise FileExistsError(db_path)
+    start = start or date.today()
+    began = time.perf_counter()
+
+    def progress(message):
+        if verbose:
+            print(f"[{time.perf_counter() - began:7.1f}s] {message}")
+
+    conn = sqlite3.connect(db_path)
+    try:
+        # Nothing to protect until the file is complete
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("PRAGMA foreign_keys = OFF")   # rows are consistent by construction
+        conn.execute("PRAGMA cache_size = -262144")  # 256MB: keeps the random-order indexes in memory
+        apply_schema(conn)
+
+        with conn:
+            conn.executemany("INSERT INTO airports (code, name, city, active) VALUES (?, ?, ?, 1)",
+                             _airports(_rng(seed, 'airports'), airports))
+            airport_ids = [row[0] for row in conn.execute("SELECT id FROM airports ORDER BY id")]
+            route_rows = _routes(_rng(seed, 'routes'), airport_ids, routes)
+            conn.executemany("INSERT INTO routes (origin_airport_id, destination_airport_id, flight_number) "
+                             "VALUES (?, ?, ?)", route_rows)
+        progress(f"{len(airport_ids):,} airports, {len(route_rows):,} routes")
+
+        templates = _templates(_rng(seed, 'schedule'), [row[2] for row in route_rows])
+        flights = expand_schedule(conn, start, start + timedelta(days=days - 1), templates, skip_existing=False)
+        progress(f"{flights:,} flights")
+
+        with conn:
+            for batch in _batches(_passengers(_rng(seed, 'passengers'), passengers, start)):
+                conn.executemany("INSERT INTO passengers (first_name, last_name, date_of_birth, created_at) "
+                                 "VALUES (?, ?, ?, ?)", batch)
+        progress(f"{passengers:,} passengers")
+
+        if reservations:
+            if not passengers:
+                raise ValueError("Reservations need passengers")
+            picker = _FlightPicker(conn, start)
+            # Leave headroom so picking a flight with a free seat stays quick
+            if reservations * (1 + multi_leg_share) > picker.total_seats() * 0.8:
+                raise ValueError("Not enough seats for that many reservations; add routes or days")
+
+            with conn:
+                numbers = allocate_block(conn, reservations)
+                first_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM reservations").fetchone()[0]
+                bookings = _reservations(_rng(seed, 'reservations'), picker, passengers, numbers,
+                                         first_id, start, multi_leg_share)
+                for batch in _batches(bookings):
+                    conn.executemany("INSERT INTO reservations (id, passenger_id, confirmation_number, "
+                                     "created_at, status) VALUES (?, ?, ?, ?, ?)",
+                                     [row for row, _ in batch])
+                    conn.executemany("INSERT INTO reservation_flights (reservation_id, flight_id, seat_number) "
+                                     "VALUES (?, ?, ?)",
+                                     [leg for _, legs in batch for leg in legs])
+        progress(f"{reservations:,} reservations")
+
+        # Indexing names in one pass is much faster than the per-row FTS triggers
+        apply_fts_schema(conn)
+        progress("passenger name index")
+
+        conn.execute("ANALYZE")
+        set_schema_version(conn, SCHEMA_VERSION)  # built current: init_database has nothing to do
+        conn.execute("PRAGMA journal_mode = WAL")
+        counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                  for table in ('airports', 'routes', 'flights', 'passengers', 'reservations',
+                                'reservation_flights')}
+        progress("done")
+        return counts
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic KidAirlines database")
+    parser.add_argument('output', help="path of the database to create")
+    parser.add_argument('--size', choices=sorted(SIZES), default='small', help="preset counts (default: small)")
+    for name in ('airports', 'routes', 'days', 'passengers', 'reservations'):
+        parser.add_argument(f'--{name}', type=int, help=f"override the preset number of {name}")
+    parser.add_argument('--multi-leg', type=float, default=MULTI_LEG_SHARE,
+                        help=f"share of reservations with a connection (default: {MULTI_LEG_SHARE})")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help=f"random seed (default: {DEFAULT_SEED})")
+    parser.add_argument('--start', type=date.fromisoformat, help="first flight date, YYYY-MM-DD (default: today)")
+    parser.add_argument('--force', action='store_true', help="replace the output file if it exists")
+    args = parser.parse_args(argv)
+
+    counts = dict(SIZES[args.size])
+    for name in counts:
+        if getattr(args, name) is not None:
+            counts[name] = getattr(args, name)
+
+    if os.path.exists(args.output):
+        if not args.force:
+            parser.error(f"{args.output} exists; use --force to replace it")
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(args.output + suffix):
+                os.remove(args.output + suffix)
+
+    result = generate_dataset(args.output, multi_leg_share=args.multi_leg, seed=args.seed,
+                              start=args.start, verbose=True, **counts)
+    for table, count in result.items():
+        print(f"  {table:20} {count:>12,}")
+    print(f"Run the app on it with: KIDAIRLINES_DB={args.output} python3 main.py")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Consistency checker for the materialized flight_inventory table"""
+import sqlite3
+
+
+# Booked seats per flight computed from scratch (the source of truth)
+ACTUAL_BOOKED_QUERY = """
+    SELECT f.id as flight_id, COUNT(r.id) as booked_seats
+    FROM flights f
+    LEFT JOIN reservation_flights rf ON rf.flight_id = f.id
+    LEFT JOIN reservations r ON r.id = rf.reservation_id AND r.status IS NOT 'CANCELLED'
+    GROUP BY f.id
+"""
+
+
+def find_inventory_drift(conn):
+    """
+    Compare flight_inventory against a full recount.
+    Returns a list of (flight_id, stored_booked, actual_booked) for every mismatch;
+    stored_booked is None when the flight has no inventory row.
+    """
+    query = f"""
+        SELECT a.flight_id, i.booked_seats, a.booked_seats
+        FROM ({ACTUAL_BOOKED_QUERY}) a
+        LEFT JOIN flight_inventory i ON i.flight_id = a.flight_id
+        WHERE i.booked_seats IS NOT a.booked_seats
+        UNION ALL
+        SELECT i.flight_id, i.booked_seats, NULL
+        FROM flight_inventory i
+        WHERE NOT EXISTS (SELECT 1 FROM flights f WHERE f.id = i.flight_id)
+        ORDER BY 1
+    """
+    return [tuple(row) for row in conn.execute(query).fetchall()]
+
+
+def rebuild_inventory(conn):
+    """Rebuild flight_inventory from scratch and return the drift that was found"""
+    drift = find_inventory_drift(conn)
+    with conn:
+        conn.execute("DELETE FROM flight_inventory")
+        conn.execute(f"INSERT INTO flight_inventory (flight_id, booked_seats) {ACTUAL_BOOKED_QUERY}")
+    return drift
+
+
+if __name__ == '__main__':
+    import sys
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from src.database.db_init import get_db_path
+
+    conn = sqlite3.connect(get_db_path())
+    drift = rebuild_inventory(conn)
+    conn.close()
+    if drift:
+        print(f"Repaired inventory drift on {len(drift)} flight(s):")
+        for flight_id, stored, actual in drift:
+            print(f"  flight {flight_id}: stored={stored} actual={actual}")
+    else:
+        print("Seat inventory is consistent")
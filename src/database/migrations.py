@@ -0,0 +1,168 @@
+"""
+Numbered schema migrations, tracked in PRAGMA user_version.
+
+A database at version N has had the first N migrations applied; init_database()
+runs the pending ones in order. Append new migrations to MIGRATIONS and never
+edit or reorder one that has shipped. Every step must be safe to re-run, since
+a crash between a step and its version bump repeats it.
+"""
+from .inventory import rebuild_inventory
+
+
+# Tables rebuilt to add ON DELETE CASCADE, with their new definitions.
+# Frozen here on purpose: this is what the migration produces, whatever
+# schema.sql looks like later.
+CASCADE_TABLES = [
+    ('flights', """
+        CREATE TABLE flights_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            route_id INTEGER NOT NULL,
+            departure_time TEXT NOT NULL,
+            arrival_time TEXT NOT NULL,
+            flight_date TEXT NOT NULL,
+            capacity INTEGER DEFAULT 100,
+            FOREIGN KEY (route_id) REFERENCES routes(id) ON DELETE CASCADE
+        )
+    """, "SELECT * FROM flights WHERE route_id IN (SELECT id FROM routes)"),
+    ('reservation_flights', """
+        CREATE TABLE reservation_flights_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            reservation_id INTEGER NOT NULL,
+            flight_id INTEGER NOT NULL,
+            seat_number TEXT,
+            FOREIGN KEY (reservation_id) REFERENCES reservations(id) ON DELETE CASCADE,
+            FOREIGN KEY (flight_id) REFERENCES flights(id) ON DELETE CASCADE,
+            UNIQUE(flight_id, seat_number)
+        )
+    """, """SELECT * FROM reservation_flights
+            WHERE reservation_id IN (SELECT id FROM reservations)
+              AND flight_id IN (SELECT id FROM flights)"""),
+    ('flight_inventory', """
+        CREATE TABLE flight_inventory_new (
+            flight_id INTEGER PRIMARY KEY,
+            booked_seats INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY (flight_id) REFERENCES flights(id) ON DELETE CASCADE
+        )
+    """, "SELECT * FROM flight_inventory WHERE flight_id IN (SELECT id FROM flights)"),
+]
+
+
+def needs_cascade_migration(conn):
+    """True if an existing database still has foreign keys without ON DELETE CASCADE"""
+    for table, _, _ in CASCADE_TABLES:
+        foreign_keys = conn.execute(f"PRAGMA foreign_key_list({table})").fetchall()
+        # columns: id, seq, table, from, to, on_update, on_delete, match
+        if any(fk[6] != 'CASCADE' for fk in foreign_keys):
+            return True
+    return False
+
+
+def migrate_cascading_deletes(conn):
+    """
+    Rebuild flights, reservation_flights and flight_inventory with ON DELETE CASCADE
+    foreign keys, dropping rows that were already orphaned by earlier deletes.
+    Triggers are dropped too; the caller re-runs schema.sql to recreate them and
+    the indexes.
+    """
+    conn.execute("PRAGMA foreign_keys = OFF")
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'").fetchall():
+            conn.execute(f"DROP TRIGGER {name}")
+
+        # Parents first, so child copies can drop rows orphaned by the parent copy
+        for table, create_sql, select_sql in CASCADE_TABLES:
+            if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                                (table,)).fetchone():
+                continue  # schema.sql will create it with the new definition
+            # Keep AUTOINCREMENT from reusing ids of rows deleted before the rebuild
+            sequence = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+            conn.execute(create_sql)
+            conn.execute(f"INSERT INTO {table}_new {select_sql}")
+            conn.execute(f"DROP TABLE {table}")
+            conn.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+            if sequence:
+                conn.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?",
+                             (sequence[0], table))
+
+        problems = conn.execute("PRAGMA foreign_key_check").fetchall()
+        if problems:
+            raise RuntimeError(f"Foreign key violations after migration: {problems[:5]}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.execute("PRAGMA foreign_keys = ON")
+
+
+def _cascade_deletes(conn):
+    if (conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'flights'").fetchone()
+            and needs_cascade_migration(conn)):
+        migrate_cascading_deletes(conn)
+
+
+def _base_schema(conn):
+    from .db_init import apply_schema
+    apply_schema(conn)
+
+
+def _passenger_search(conn):
+    from .db_init import apply_fts_schema
+    apply_fts_schema(conn)
+
+
+def _inventory_backfill(conn):
+    # Older databases predate flight_inventory or lost bookings in the cascade rebuild
+    rebuild_inventory(conn)
+
+
+# (version, description, step)
+MIGRATIONS = [
+    (1, "ON DELETE CASCADE foreign keys", _cascade_deletes),
+    (2, "tables, indexes and triggers from schema.sql", _base_schema),
+    (3, "passenger name search (FTS5, when available)", _passenger_search),
+    (4, "seat inventory backfill", _inventory_backfill),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def set_schema_version(conn, version):
+    conn.execute(f"PRAGMA user_version = {int(version)}")
+    conn.commit()
+
+
+def migrate(conn, target=SCHEMA_VERSION):
+    """Apply the migrations between the database's version and target; returns the versions applied"""
+    current = get_schema_version(conn)
+    applied = []
+    for version, _, step in MIGRATIONS:
+        if current < version <= target:
+            step(conn)
+            set_schema_version(conn, version)
+            applied.append(version)
+    return applied
+
+
+if __name__ == '__main__':
+    import sqlite3
+    import sys
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from src.database.db_init import get_db_path
+
+    conn = sqlite3.connect(get_db_path())
+    conn.execute("PRAGMA foreign_keys = ON")
+    version = get_schema_version(conn)
+    for number, description, _ in MIGRATIONS:
+        state = "applied" if number <= version else "pending"
+        print(f"{number:3}  {state:8} {description}")
+    if len(sys.argv) > 1 and sys.argv[1] == 'apply':
+        applied = migrate(conn)
+        print(f"Applied {len(applied)} migration(s); schema version {get_schema_version(conn)}")
+    conn.close()
@@ -0,0 +1,136 @@
+"""Expand route schedule templates into dated flights"""
+from datetime import date, datetime, timedelta
+
+
+# Route schedule templates: flight number -> [(departure, duration_in_minutes, capacity), ...]
+# Times are HH:MM; an arrival past midnight is stored as the next day's clock time.
+SCHEDULE_TEMPLATES = {
+    # Outbound from EWR
+    'KA100': [('06:00', 120, 150), ('12:00', 120, 150), ('18:00', 120, 150)],  # EWR->DTW (2h)
+    'KA110': [('07:00', 150, 180), ('13:30', 150, 180), ('19:00', 150, 180)],  # EWR->ORD (2.5h)
+    'KA120': [('08:00', 180, 150), ('14:00', 180, 150), ('20:00', 180, 150)],  # EWR->PBI (3h)
+    'KA130': [('06:30', 60, 120), ('10:00', 60, 120), ('14:00', 60, 120), ('18:00', 60, 120)],  # EWR->BWI (1h)
+    'KA140': [('07:30', 180, 180), ('12:00', 180, 180), ('17:00', 180, 180)],  # EWR->MIA (3h)
+    'KA200': [('20:00', 1140, 250)],  # EWR->DPS Bali (19h) - overnight long-haul
+    'KA210': [('19:30', 660, 250)],   # EWR->CAI Cairo (11h) - overnight
+    'KA220': [('18:00', 450, 220), ('21:30', 450, 220)],  # EWR->CDG Paris (7.5h)
+    'KA230': [('19:00', 420, 220), ('22:00', 420, 220)],  # EWR->LHR London (7h)
+    'KA240': [('08:00', 370, 180), ('14:00', 370, 180), ('20:00', 370, 180)],  # EWR->SFO (6h 10m)
+    'KA250': [('09:00', 180, 150), ('15:00', 180, 150)],  # EWR->OMA Omaha (3h)
+
+    # Inbound to EWR
+    'KA101': [('08:00', 120, 150), ('14:00', 120, 150), ('20:00', 120, 150)],  # DTW->EWR (2h)
+    'KA111': [('06:00', 150, 180), ('11:30', 150, 180), ('17:00', 150, 180)],  # ORD->EWR (2.5h)
+    'KA121': [('07:00', 180, 150), ('13:00', 180, 150), ('19:00', 180, 150)],  # PBI->EWR (3h)
+    'KA131': [('07:00', 60, 120), ('11:00', 60, 120), ('15:00', 60, 120), ('19:00', 60, 120)],  # BWI->EWR (1h)
+    'KA141': [('06:30', 180, 180), ('11:00', 180, 180), ('16:00', 180, 180)],  # MIA->EWR (3h)
+    'KA201': [('22:00', 1080, 250)],  # DPS->EWR (18h) - overnight long-haul
+    'KA211': [('23:00', 660, 250)],   # CAI->EWR (11h) - overnight
+    'KA221': [('10:00', 480, 220), ('13:30', 480, 220)],  # CDG->EWR (8h) - westbound adds time
+    'KA231': [('09:00', 450, 220), ('12:00', 450, 220)],  # LHR->EWR (7.5h) - westbound
+    'KA241': [('07:00', 340, 180), ('13:00', 340, 180), ('19:00', 340, 180)],  # SFO->EWR (5h 40m) - tailwind
+    'KA251': [('08:00', 180, 150), ('14:00', 180, 150)],  # OMA->EWR (3h)
+}
+
+# Rows per executemany() call
+INSERT_BATCH_SIZE = 10000
+
+
+def calculate_arrival_time(departure, duration_minutes):
+    """Calculate arrival time given departure and duration"""
+    dep_hour, dep_min = map(int, departure.split(':'))
+    total_minutes = dep_hour * 60 + dep_min + duration_minutes
+
+    # Handle next-day arrivals
+    arr_hour = (total_minutes // 60) % 24
+    arr_min = total_minutes % 60
+
+    return f"{arr_hour:02d}:{arr_min:02d}"
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def expand_schedule(conn, start, end, templates=None, skip_existing=True):
+    """
+    Insert flights for every day from start to end (inclusive, dates or 'YYYY-MM-DD')
+    following the schedule templates (default SCHEDULE_TEMPLATES). Templates for flight
+    numbers without a route are ignored. With skip_existing, flights already scheduled
+    for the same route, date and departure aren't inserted again.
+    Joins a transaction already open on conn (the caller commits it); otherwise commits.
+    Returns the number of flights inserted.
+    """
+    if templates is None:
+        templates = SCHEDULE_TEMPLATES
+    start, end = _as_date(start), _as_date(end)
+    if end < start:
+        return 0
+
+    route_ids = dict(conn.execute("SELECT flight_number, id FROM routes").fetchall())
+
+    # Arrival times don't depend on the date: work them out once per template slot
+    slots = [
+        (route_ids[flight_number], departure, calculate_arrival_time(departure, duration), capacity)
+        for flight_number, schedule in templates.items() if flight_number in route_ids
+        for departure, duration, capacity in schedule
+    ]
+    dates = [(start + timedelta(days=n)).isoformat() for n in range((end - start).days + 1)]
+
+    existing = set()
+    if skip_existing:
+        existing = set(conn.execute(
+            "SELECT route_id, flight_date, departure_time FROM flights WHERE flight_date BETWEEN ? AND ?",
+            (dates[0], dates[-1])
+        ).fetchall())
+
+    rows = (
+        (route_id, departure, arrival, flight_date, capacity)
+        for flight_date in dates
+        for route_id, departure, arrival, capacity in slots
+        if (route_id, flight_date, departure) not in existing
+    )
+
+    inserted = 0
+    query = "INSERT INTO flights (route_id, departure_time, arrival_time, flight_date, capacity) VALUES (?, ?, ?, ?, ?)"
+    owns_transaction = not conn.in_transaction
+    try:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == INSERT_BATCH_SIZE:
+                conn.executemany(query, batch)
+                inserted += len(batch)
+                batch = []
+        if batch:
+            conn.executemany(query, batch)
+            inserted += len(batch)
+    except BaseException:
+        if owns_transaction:
+            conn.rollback()
+        raise
+    if owns_transaction:
+        conn.commit()
+    return inserted
+
+
+if __name__ == '__main__':
+    import sqlite3
+    import sys
+    import os
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from src.database.db_init import get_db_path
+
+    if len(sys.argv) != 3:
+        print("usage: schedule.py START_DATE END_DATE   (YYYY-MM-DD, inclusive)")
+        sys.exit(1)
+
+    conn = sqlite3.connect(get_db_path())
+    conn.execute("PRAGMA foreign_keys = ON")
+    count = expand_schedule(conn, sys.argv[1], sys.argv[2])
+    conn.close()
+    print(f"Scheduled {count} flight(s) from {sys.argv[1]} to {sys.argv[2]}")
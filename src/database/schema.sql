@@ -25,7 +25,7 @@ CREATE TABLE IF NOT EXISTS flights (
     arrival_time TEXT NOT NULL,
     flight_date TEXT NOT NULL,
     capacity INTEGER DEFAULT 100,
-    FOREIGN KEY (route_id) REFERENCES routes(id)
+    FOREIGN KEY (route_id) REFERENCES routes(id) ON DELETE CASCADE
 );
 
 CREATE TABLE IF NOT EXISTS passengers (
@@ -50,8 +50,8 @@ CREATE TABLE IF NOT EXISTS reservation_flights (
     reservation_id INTEGER NOT NULL,
     flight_id INTEGER NOT NULL,
     seat_number TEXT,
-    FOREIGN KEY (reservation_id) REFERENCES reservations(id),
-    FOREIGN KEY (flight_id) REFERENCES flights(id),
+    FOREIGN KEY (reservation_id) REFERENCES reservations(id) ON DELETE CASCADE,
+    FOREIGN KEY (flight_id) REFERENCES flights(id) ON DELETE CASCADE,
     UNIQUE(flight_id, seat_number)
 );
 
@@ -60,3 +60,93 @@ CREATE INDEX IF NOT EXISTS idx_flights_date ON flights(flight_date);
 CREATE INDEX IF NOT EXISTS idx_reservations_passenger ON reservations(passenger_id);
 CREATE INDEX IF NOT EXISTS idx_reservation_flights_reservation ON reservation_flights(reservation_id);
 CREATE INDEX IF NOT EXISTS idx_reservation_flights_flight ON reservation_flights(flight_id);
+CREATE INDEX IF NOT EXISTS idx_flights_schedule ON flights(flight_date, departure_time);
+CREATE INDEX IF NOT EXISTS idx_passengers_name ON passengers(last_name, first_name);
+-- Cascading a route delete to its flights looks them up by route_id
+CREATE INDEX IF NOT EXISTS idx_flights_route ON flights(route_id);
+-- Reservation.get_all lists newest first
+CREATE INDEX IF NOT EXISTS idx_reservations_created ON reservations(created_at);
+
+-- Materialized seat inventory: booked seats per flight, kept current by the
+-- triggers below. Legs on CANCELLED reservations don't hold a seat.
+CREATE TABLE IF NOT EXISTS flight_inventory (
+    flight_id INTEGER PRIMARY KEY,
+    booked_seats INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (flight_id) REFERENCES flights(id) ON DELETE CASCADE
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_flights_inventory_insert
+AFTER INSERT ON flights
+BEGIN
+    INSERT OR IGNORE INTO flight_inventory (flight_id, booked_seats) VALUES (NEW.id, 0);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_flights_inventory_delete
+AFTER DELETE ON flights
+BEGIN
+    DELETE FROM flight_inventory WHERE flight_id = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_reservation_flights_inventory_insert
+AFTER INSERT ON reservation_flights
+WHEN EXISTS (SELECT 1 FROM reservations
+             WHERE id = NEW.reservation_id AND status IS NOT 'CANCELLED')
+BEGIN
+    UPDATE flight_inventory SET booked_seats = booked_seats + 1
+    WHERE flight_id = NEW.flight_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_reservation_flights_inventory_delete
+AFTER DELETE ON reservation_flights
+WHEN EXISTS (SELECT 1 FROM reservations
+             WHERE id = OLD.reservation_id AND status IS NOT 'CANCELLED')
+BEGIN
+    UPDATE flight_inventory SET booked_seats = booked_seats - 1
+    WHERE flight_id = OLD.flight_id;
+END;
+
+-- Deleting a reservation cascades to its reservation_flights after the
+-- reservation row is gone, so release its seats beforehand
+CREATE TRIGGER IF NOT EXISTS trg_reservations_inventory_delete
+BEFORE DELETE ON reservations
+WHEN OLD.status IS NOT 'CANCELLED'
+BEGIN
+    UPDATE flight_inventory
+    SET booked_seats = booked_seats - (SELECT COUNT(*) FROM reservation_flights rf
+                                       WHERE rf.reservation_id = OLD.id
+                                         AND rf.flight_id = flight_inventory.flight_id)
+    WHERE flight_id IN (SELECT flight_id FROM reservation_flights WHERE reservation_id = OLD.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_reservations_inventory_cancel
+AFTER UPDATE OF status ON reservations
+WHEN OLD.status IS NOT 'CANCELLED' AND NEW.status IS 'CANCELLED'
+BEGIN
+    UPDATE flight_inventory
+    SET booked_seats = booked_seats - (SELECT COUNT(*) FROM reservation_flights rf
+                                       WHERE rf.reservation_id = NEW.id
+                                         AND rf.flight_id = flight_inventory.flight_id)
+    WHERE flight_id IN (SELECT flight_id FROM reservation_flights WHERE reservation_id = NEW.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_reservations_inventory_reactivate
+AFTER UPDATE OF status ON reservations
+WHEN OLD.status IS 'CANCELLED' AND NEW.status IS NOT 'CANCELLED'
+BEGIN
+    UPDATE flight_inventory
+    SET booked_seats = booked_seats + (SELECT COUNT(*) FROM reservation_flights rf
+                                       WHERE rf.reservation_id = NEW.id
+                                         AND rf.flight_id = flight_inventory.flight_id)
+    WHERE flight_id IN (SELECT flight_id FROM reservation_flights WHERE reservation_id = NEW.id);
+END;
+
+-- Confirmation number sequence. Processes reserve blocks of sequence values and
+-- encode them with a fixed permutation, so numbers never collide. Upgraded
+-- databases start it at 0 too, next to their old random codes; the allocator
+-- skips any encoded value that is already taken (see free_codes()).
+CREATE TABLE IF NOT EXISTS confirmation_sequence (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    next_value INTEGER NOT NULL
+);
+
+INSERT OR IGNORE INTO confirmation_sequence (id, next_value) VALUES (1, 0);
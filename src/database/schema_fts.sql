@@ -0,0 +1,33 @@
+-- KidAirlines full-text search (applied only when SQLite has FTS5)
+
+-- Passenger name index; external content, so names aren't stored twice
+CREATE VIRTUAL TABLE IF NOT EXISTS passengers_fts USING fts5(
+    first_name,
+    last_name,
+    content='passengers',
+    content_rowid='id',
+    prefix='1 2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_passengers_fts_insert
+AFTER INSERT ON passengers
+BEGIN
+    INSERT INTO passengers_fts (rowid, first_name, last_name)
+    VALUES (NEW.id, NEW.first_name, NEW.last_name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_passengers_fts_delete
+AFTER DELETE ON passengers
+BEGIN
+    INSERT INTO passengers_fts (passengers_fts, rowid, first_name, last_name)
+    VALUES ('delete', OLD.id, OLD.first_name, OLD.last_name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_passengers_fts_update
+AFTER UPDATE OF first_name, last_name ON passengers
+BEGIN
+    INSERT INTO passengers_fts (passengers_fts, rowid, first_name, last_name)
+    VALUES ('delete', OLD.id, OLD.first_name, OLD.last_name);
+    INSERT INTO passengers_fts (rowid, first_name, last_name)
+    VALUES (NEW.id, NEW.first_name, NEW.last_name);
+END;
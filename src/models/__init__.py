@@ -3,5 +3,7 @@ from .route import Route
 from .flight import Flight
 from .passenger import Passenger
 from .reservation import Reservation
+from .seat_map import SeatMap
+from .itinerary import Itinerary, ConnectionIndex
 
-__all__ = ['Airport', 'Route', 'Flight', 'Passenger', 'Reservation']
+__all__ = ['Airport', 'Route', 'Flight', 'Passenger', 'Reservation', 'SeatMap', 'Itinerary', 'ConnectionIndex']
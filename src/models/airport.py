@@ -1,7 +1,10 @@
-from .database import execute_query, execute_update
+from .database import execute_update
+from .reference_cache import reference_cache
 
 
 class Airport:
+    __slots__ = ('id', 'code', 'name', 'city', 'active')
+
     def __init__(self, id, code, name, city, active):
         self.id = id
         self.code = code
@@ -12,37 +15,27 @@ class Airport:
     @staticmethod
     def get_all(active_only=True):
         """Get all airports"""
-        query = "SELECT * FROM airports"
+        airports = reference_cache.ensure_loaded().airports
         if active_only:
-            query += " WHERE active = 1"
-        query += " ORDER BY code"
-
-        rows = execute_query(query)
-        return [Airport(**dict(row)) for row in rows]
+            return [a for a in airports if a.active == 1]
+        return list(airports)
 
     @staticmethod
     def get_by_id(airport_id):
         """Get airport by ID"""
-        query = "SELECT * FROM airports WHERE id = ?"
-        rows = execute_query(query, (airport_id,))
-        if rows:
-            return Airport(**dict(rows[0]))
-        return None
+        return reference_cache.ensure_loaded().airports_by_id.get(airport_id)
 
     @staticmethod
     def get_by_code(code):
         """Get airport by code"""
-        query = "SELECT * FROM airports WHERE code = ?"
-        rows = execute_query(query, (code,))
-        if rows:
-            return Airport(**dict(rows[0]))
-        return None
+        return reference_cache.ensure_loaded().airports_by_code.get(code)
 
     @staticmethod
     def create(code, name, city):
         """Create a new airport"""
         query = "INSERT INTO airports (code, name, city, active) VALUES (?, ?, ?, 1)"
         airport_id = execute_update(query, (code, name, city))
+        reference_cache.invalidate()
         return airport_id
 
     @staticmethod
@@ -50,6 +43,7 @@ class Airport:
         """Update airport active status"""
         query = "UPDATE airports SET active = ? WHERE id = ?"
         execute_update(query, (active, airport_id))
+        reference_cache.invalidate()
 
     def __str__(self):
         return f"{self.code} - {self.name} ({self.city})"
@@ -0,0 +1,52 @@
+import os
+import threading
+from src.database import get_db_path
+from src.database.confirmation_codes import allocate_block, free_codes
+from .database import HookedConnection, unit_of_work, in_unit_of_work, on_rollback, IN_CHUNK_SIZE
+
+
+class ConfirmationAllocator:
+    """
+    Hands out unique confirmation numbers from blocks of the shared sequence.
+    Each process reserves `block_size` values per database round-trip, so
+    concurrent processes only touch confirmation_sequence once per block.
+    """
+
+    def __init__(self, block_size=1000):
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._block = iter(())
+        self._owner = None
+
+    def discard_block(self):
+        """Forget the current block (its unused numbers are simply skipped)"""
+        self._block = iter(())
+
+    def _next_block(self):
+        nested = in_unit_of_work()
+        with unit_of_work():
+            conn = HookedConnection()
+            block = allocate_block(conn, self.block_size)
+            codes = free_codes(conn, block, IN_CHUNK_SIZE)
+        if nested:
+            # The reservation of this block is only durable if the outer transaction commits
+            on_rollback(self.discard_block)
+        return iter(codes)
+
+    def next_number(self):
+        """Get the next confirmation number"""
+        with self._lock:
+            # A forked child or a different database must not reuse our block
+            owner = (os.getpid(), get_db_path())
+            if owner != self._owner:
+                self.discard_block()
+                self._owner = owner
+
+            number = next(self._block, None)
+            while number is None:  # a block can be used up entirely by legacy codes
+                self._block = self._next_block()
+                number = next(self._block, None)
+        return number
+
+
+confirmation_allocator = ConfirmationAllocator()
@@ -1,23 +1,228 @@
+import atexit
+import os
 import sqlite3
+import sys
+import threading
+import time
 from contextlib import contextmanager
 from src.database import get_db_path
 
 
+# Storage profile applied once to every new connection.
+# Keys are SQLite pragma names; see configure_storage() to override them.
+STORAGE_PROFILE = {
+    'journal_mode': 'WAL',        # readers don't block the writer
+    'synchronous': 'NORMAL',      # safe with WAL, one fsync per checkpoint
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -16000,         # negative = KiB, so ~16MB page cache
+    'busy_timeout': 5000,         # ms to wait on a locked database
+    'foreign_keys': 'ON',         # enforce references and ON DELETE CASCADE
+}
+
+# Prepared statements kept per connection (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 512
+
+# Max ids bound into one IN (...) list; older SQLite builds allow 999 parameters
+IN_CHUNK_SIZE = 500
+
+_local = threading.local()
+
+# (db_path, table name) -> bool, see has_table()
+_table_cache = {}
+
+# Callables run after every statement, see add_query_hook()
+_query_hooks = []
+
+
+def configure_storage(**settings):
+    """Override storage profile settings; applies to connections opened afterwards"""
+    STORAGE_PROFILE.update(settings)
+    close_connection()
+
+
+def open_connection(db_path=None):
+    """Open a new connection with the storage profile applied"""
+    conn = sqlite3.connect(
+        db_path or get_db_path(),
+        cached_statements=STATEMENT_CACHE_SIZE,
+        check_same_thread=False,
+    )
+    conn.row_factory = sqlite3.Row
+    for pragma, value in STORAGE_PROFILE.items():
+        if value is not None:
+            conn.execute(f"PRAGMA {pragma} = {value}")
+    return conn
+
+
+def get_connection():
+    """Get the long-lived connection for the current thread, opening it if needed"""
+    db_path = get_db_path()
+    conn = getattr(_local, 'conn', None)
+    # Reopen if the database moved or we are in a forked child process
+    if conn is None or _local.db_path != db_path or _local.pid != os.getpid():
+        # A forked child must leave its parent's connection alone; close_connection() checks
+        close_connection()
+        conn = open_connection(db_path)
+        _local.conn = conn
+        _local.db_path = db_path
+        _local.pid = os.getpid()
+    return conn
+
+
+def close_connection():
+    """Close the current thread's connection, if any"""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None and _local.pid == os.getpid():
+        conn.close()
+    _local.conn = None
+
+
+atexit.register(close_connection)
+
+
 @contextmanager
 def get_db_connection():
     """Context manager for database connections"""
-    conn = sqlite3.connect(get_db_path())
-    conn.row_factory = sqlite3.Row
+    yield get_connection()
+
+
+class Rollback(Exception):
+    """Raise inside unit_of_work() to roll the transaction back without an error"""
+
+
+def on_rollback(callback):
+    """Call `callback` if the current unit of work is rolled back (no-op outside one)"""
+    if in_unit_of_work():
+        _local.rollback_callbacks.append(callback)
+
+
+def in_unit_of_work():
+    """True if the current thread has an open unit of work"""
+    return getattr(_local, 'tx_depth', 0) > 0
+
+
+@contextmanager
+def unit_of_work():
+    """
+    Group model calls into one BEGIN IMMEDIATE ... COMMIT transaction.
+    execute_update() joins the open transaction instead of committing, and nested
+    unit_of_work() blocks join the outermost one. Any exception rolls everything back.
+    """
+    conn = get_connection()
+    if in_unit_of_work():
+        _local.tx_depth += 1
+        try:
+            yield conn
+        finally:
+            _local.tx_depth -= 1
+        return
+
+    conn.execute("BEGIN IMMEDIATE")
+    _local.tx_depth = 1
+    _local.rollback_callbacks = []
     try:
         yield conn
+    except Rollback:
+        _rollback(conn)
+    except BaseException:
+        _rollback(conn)
+        raise
+    else:
+        conn.commit()
     finally:
-        conn.close()
+        _local.tx_depth = 0
+        _local.rollback_callbacks = []
+
+
+def _rollback(conn):
+    conn.rollback()
+    for callback in _local.rollback_callbacks:
+        callback()
+
+
+def has_table(name):
+    """Check whether the current database has a table (cached per database file)"""
+    key = (get_db_path(), name)
+    if key not in _table_cache:
+        rows = execute_query("SELECT 1 FROM sqlite_master WHERE name = ?", (name,))
+        _table_cache[key] = bool(rows)
+    return _table_cache[key]
+
 
+def record_factory(model):
+    """
+    Build a cursor row_factory that creates `model` instances straight from row tuples.
+    The model must declare __slots__ covering every selected column; slots the
+    query doesn't select are set to None.
+    """
+    setters = None
+    missing = None
 
-def execute_query(query, params=None):
-    """Execute a query and return all results"""
+    def factory(cursor, row):
+        nonlocal setters, missing
+        if setters is None:
+            columns = [column[0] for column in cursor.description]
+            setters = [getattr(model, name).__set__ for name in columns]
+            missing = [getattr(model, name).__set__ for name in model.__slots__ if name not in columns]
+        record = object.__new__(model)
+        for setter, value in zip(setters, row):
+            setter(record, value)
+        for setter in missing:
+            setter(record, None)
+        return record
+
+    return factory
+
+
+def add_query_hook(hook):
+    """
+    Call hook(kind, query, params, elapsed, rows, caller) after every statement run through
+    execute_query/execute_update/execute_statement/iter_query. kind is 'query', 'update'
+    or 'iter', elapsed
+    is in seconds and caller names the function that issued the statement (e.g.
+    'Flight.get_all'). With no hooks registered the helpers skip timing entirely.
+    """
+    _query_hooks.append(hook)
+
+
+def remove_query_hook(hook):
+    """Unregister a hook added with add_query_hook()"""
+    if hook in _query_hooks:
+        _query_hooks.remove(hook)
+
+
+def _caller():
+    """Qualified name of the first function outside this module on the call stack"""
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_globals.get('__name__') == __name__:
+        frame = frame.f_back
+    if frame is None:
+        return '?'
+    code = frame.f_code
+    return getattr(code, 'co_qualname', code.co_name)
+
+
+def _run_hooks(kind, query, params, elapsed, rows):
+    caller = _caller()
+    for hook in list(_query_hooks):
+        hook(kind, query, params, elapsed, rows, caller)
+
+
+def execute_query(query, params=None, model=None):
+    """Execute a query and return all results (as `model` instances if given)"""
+    if _query_hooks:
+        start = time.perf_counter()
+        rows = _execute_query(query, params, model)
+        _run_hooks('query', query, params, time.perf_counter() - start, len(rows))
+        return rows
+    return _execute_query(query, params, model)
+
+
+def _execute_query(query, params, model):
     with get_db_connection() as conn:
         cursor = conn.cursor()
+        if model is not None:
+            cursor.row_factory = record_factory(model)
         if params:
             cursor.execute(query, params)
         else:
@@ -25,13 +230,126 @@ def execute_query(query, params=None):
         return cursor.fetchall()
 
 
-def execute_update(query, params=None):
-    """Execute an update/insert query and return lastrowid"""
-    with get_db_connection() as conn:
+def execute_page(query, key_columns, conditions=(), params=(), after=None, before=None,
+                 limit=50, model=None, last=False):
+    """
+    Fetch one keyset-paginated page of a SELECT that has no WHERE/ORDER BY yet.
+    Rows are ordered by key_columns; `after`/`before` are key tuples taken from the
+    last/first row of a neighbouring page, and last=True fetches the final page.
+    Pages come back in ascending order either way.
+    """
+    conditions = list(conditions)
+    params = list(params)
+    columns = ", ".join(key_columns)
+    placeholders = ", ".join("?" * len(key_columns))
+    if after is not None:
+        conditions.append(f"({columns}) > ({placeholders})")
+        params.extend(after)
+    if before is not None:
+        conditions.append(f"({columns}) < ({placeholders})")
+        params.extend(before)
+
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    direction = " DESC" if (before is not None or last) and after is None else ""
+    query += " ORDER BY " + ", ".join(column + direction for column in key_columns)
+    query += " LIMIT ?"
+    params.append(limit)
+
+    rows = execute_query(query, params, model=model)
+    if direction:
+        rows.reverse()
+    return rows
+
+
+def iter_query(query, params=None, model=None, batch_size=1000):
+    """
+    Stream query results in fetchmany() batches instead of loading them all.
+    Uses its own connection, held open until the generator is exhausted or closed,
+    so the caller can keep using the pooled connection while iterating.
+    """
+    conn = open_connection()
+    # Only time spent in SQLite counts; the caller's work between batches doesn't
+    timed = bool(_query_hooks)
+    elapsed = 0.0
+    count = 0
+    try:
+        start = time.perf_counter() if timed else 0
         cursor = conn.cursor()
+        if model is not None:
+            cursor.row_factory = record_factory(model)
         if params:
             cursor.execute(query, params)
         else:
             cursor.execute(query)
-        conn.commit()
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if timed:
+                elapsed += time.perf_counter() - start
+                count += len(rows)
+            if not rows:
+                break
+            yield from rows
+            if timed:
+                start = time.perf_counter()
+    finally:
+        conn.close()
+        if timed:
+            _run_hooks('iter', query, params, elapsed, count)
+
+
+def execute_update(query, params=None):
+    """Execute an update/insert query and return lastrowid"""
+    if _query_hooks:
+        start = time.perf_counter()
+        cursor = _execute_update(query, params)
+        _run_hooks('update', query, params, time.perf_counter() - start, cursor.rowcount)
         return cursor.lastrowid
+    return _execute_update(query, params).lastrowid
+
+
+def execute_statement(query, params=None):
+    """
+    Execute a statement like execute_update(), but return the cursor: for callers that
+    need its rowcount or rows, e.g. a guarded write or a read inside a unit of work.
+    """
+    if _query_hooks:
+        start = time.perf_counter()
+        cursor = _execute_update(query, params)
+        kind = 'update' if cursor.description is None else 'query'
+        _run_hooks(kind, query, params, time.perf_counter() - start, cursor.rowcount)
+        return cursor
+    return _execute_update(query, params)
+
+
+class HookedConnection:
+    """
+    Stands in for the pooled connection when calling src.database helpers that take
+    one, so their statements run through execute_statement() and the query hooks.
+    """
+    __slots__ = ()
+
+    def execute(self, query, params=None):
+        return execute_statement(query, params)
+
+
+def _execute_update(query, params):
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        if in_unit_of_work():
+            # The enclosing unit of work commits or rolls back
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            return cursor
+        try:
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return cursor
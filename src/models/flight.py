@@ -1,10 +1,16 @@
-from .database import execute_query, execute_update
+from .database import execute_query, execute_update, execute_page, get_db_connection, iter_query, IN_CHUNK_SIZE
+from .reference_cache import reference_cache
+from src.database.inventory import find_inventory_drift, rebuild_inventory
 
 
 class Flight:
+    __slots__ = ('id', 'route_id', 'departure_time', 'arrival_time', 'flight_date', 'capacity',
+                 'flight_number', 'origin_code', 'dest_code', 'origin_city', 'dest_city',
+                 'booked_seats', 'available_seats')
+
     def __init__(self, id, route_id, departure_time, arrival_time, flight_date, capacity,
                  flight_number=None, origin_code=None, dest_code=None,
-                 origin_city=None, dest_city=None):
+                 origin_city=None, dest_city=None, booked_seats=None, available_seats=None):
         self.id = id
         self.route_id = route_id
         self.departure_time = departure_time
@@ -16,62 +22,181 @@ class Flight:
         self.dest_code = dest_code
         self.origin_city = origin_city
         self.dest_city = dest_city
+        self.booked_seats = booked_seats
+        self.available_seats = available_seats
 
     @staticmethod
-    def get_all(date_filter=None):
-        """Get all flights with route and airport details"""
-        query = """
-            SELECT f.*, r.flight_number,
-                   o.code as origin_code, o.city as origin_city,
-                   d.code as dest_code, d.city as dest_city
-            FROM flights f
-            JOIN routes r ON f.route_id = r.id
-            JOIN airports o ON r.origin_airport_id = o.id
-            JOIN airports d ON r.destination_airport_id = d.id
+    def _add_route_details(flights):
+        """
+        Fill in flight number and airport details from the reference cache.
+        Flights whose route no longer exists are dropped, as the old joins did.
         """
+        cache = reference_cache.ensure_loaded()
+        for flight in flights:
+            route = cache.route(flight.route_id)
+            if route is None:
+                continue
+            flight.flight_number = route.flight_number
+            flight.origin_code = route.origin_code
+            flight.origin_city = route.origin_city
+            flight.dest_code = route.dest_code
+            flight.dest_city = route.dest_city
+            yield flight
+
+    @staticmethod
+    def _all_query(date_filter=None):
+        """Build the get_all/iter_all query and its parameters"""
+        query = "SELECT f.* FROM flights f"
         params = None
         if date_filter:
             query += " WHERE f.flight_date = ?"
             params = (date_filter,)
 
         query += " ORDER BY f.flight_date, f.departure_time"
+        return query, params
+
+    @staticmethod
+    def get_all(date_filter=None):
+        """Get all flights with route and airport details"""
+        query, params = Flight._all_query(date_filter)
+        return list(Flight._add_route_details(execute_query(query, params, model=Flight)))
 
-        rows = execute_query(query, params)
-        return [Flight(**dict(row)) for row in rows]
+    @staticmethod
+    def iter_all(date_filter=None, batch_size=1000):
+        """Stream all flights with route and airport details in constant memory"""
+        query, params = Flight._all_query(date_filter)
+        return Flight._add_route_details(iter_query(query, params, model=Flight, batch_size=batch_size))
 
     @staticmethod
-    def get_by_id(flight_id):
-        """Get flight by ID"""
+    def _availability_query(date_filter=None, min_seats=None):
+        """Build the flights-with-seat-inventory query, its conditions and parameters"""
         query = """
-            SELECT f.*, r.flight_number,
-                   o.code as origin_code, o.city as origin_city,
-                   d.code as dest_code, d.city as dest_city
+            SELECT f.*,
+                   COALESCE(i.booked_seats, 0) as booked_seats,
+                   f.capacity - COALESCE(i.booked_seats, 0) as available_seats
             FROM flights f
-            JOIN routes r ON f.route_id = r.id
-            JOIN airports o ON r.origin_airport_id = o.id
-            JOIN airports d ON r.destination_airport_id = d.id
-            WHERE f.id = ?
+            LEFT JOIN flight_inventory i ON i.flight_id = f.id
         """
-        rows = execute_query(query, (flight_id,))
+        conditions = []
+        params = []
+        if date_filter:
+            conditions.append("f.flight_date = ?")
+            params.append(date_filter)
+        if min_seats is not None:
+            conditions.append("f.capacity - COALESCE(i.booked_seats, 0) >= ?")
+            params.append(min_seats)
+        return query, conditions, params
+
+    @staticmethod
+    def get_all_with_availability(date_filter=None, min_seats=None):
+        """Get flights with booked and available seat counts from the seat inventory"""
+        query, conditions, params = Flight._availability_query(date_filter, min_seats)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+        query += " ORDER BY f.flight_date, f.departure_time"
+
+        return list(Flight._add_route_details(execute_query(query, params, model=Flight)))
+
+    @staticmethod
+    def get_page(date_filter=None, min_seats=None, after=None, before=None, limit=50, last=False):
+        """Get one page of flights with seat availability, keyset-paginated on page_key()"""
+        query, conditions, params = Flight._availability_query(date_filter, min_seats)
+        backward = (before is not None or last) and after is None
+        flights = []
+        while True:
+            rows = execute_page(query, ("f.flight_date", "f.departure_time", "f.id"), conditions, params,
+                                after=after, before=before, limit=limit, model=Flight, last=last)
+            kept = list(Flight._add_route_details(rows))
+            flights = kept + flights if backward else flights + kept
+            # Callers take a short page to mean the end of the list, so a page that lost
+            # flights without a route reads on from the last raw row until it is full
+            if len(rows) < limit or len(flights) >= limit:
+                break
+            if backward:
+                before = Flight.page_key(rows[0])
+            else:
+                after = Flight.page_key(rows[-1])
+        return flights[-limit:] if backward else flights[:limit]
+
+    @staticmethod
+    def get_by_id(flight_id):
+        """Get flight by ID"""
+        query = "SELECT * FROM flights WHERE id = ?"
+        rows = list(Flight._add_route_details(execute_query(query, (flight_id,), model=Flight)))
         if rows:
-            return Flight(**dict(rows[0]))
+            return rows[0]
         return None
 
     @staticmethod
     def get_available_seats(flight_id):
         """Get number of available seats on a flight"""
         query = """
-            SELECT f.capacity - COUNT(rf.id) as available
+            SELECT f.capacity - COALESCE(i.booked_seats, 0) as available
             FROM flights f
-            LEFT JOIN reservation_flights rf ON f.id = rf.flight_id
+            LEFT JOIN flight_inventory i ON i.flight_id = f.id
             WHERE f.id = ?
-            GROUP BY f.id, f.capacity
         """
         rows = execute_query(query, (flight_id,))
         if rows:
             return rows[0]['available']
         return 0
 
+    @staticmethod
+    def refresh_availability(flights):
+        """Reload booked_seats/available_seats of the given flights in place"""
+        flights = list(flights)
+        return Flight.apply_availability(flights, Flight.fetch_availability(flights))
+
+    @staticmethod
+    def fetch_availability(flights):
+        """Current booked seats of the given flights as {flight_id: booked_seats}; the flights aren't changed"""
+        flight_ids = [flight.id for flight in flights]
+        booked = {}
+        for start in range(0, len(flight_ids), IN_CHUNK_SIZE):
+            chunk = flight_ids[start:start + IN_CHUNK_SIZE]
+            query = f"""
+                SELECT f.id, COALESCE(i.booked_seats, 0) as booked_seats
+                FROM flights f
+                LEFT JOIN flight_inventory i ON i.flight_id = f.id
+                WHERE f.id IN ({", ".join("?" * len(chunk))})
+            """
+            booked.update(execute_query(query, chunk))
+        return booked
+
+    @staticmethod
+    def apply_availability(flights, booked):
+        """Set booked_seats/available_seats of the given flights from fetch_availability()"""
+        for flight in flights:
+            if flight.id in booked:
+                flight.booked_seats = booked[flight.id]
+                flight.available_seats = flight.capacity - flight.booked_seats
+        return flights
+
+    @staticmethod
+    def get_manifest(flight_id):
+        """Get the passengers booked on a flight with their seats, in seat order"""
+        query = """
+            SELECT p.first_name, p.last_name, rf.seat_number, r.confirmation_number
+            FROM reservation_flights rf
+            JOIN reservations r ON rf.reservation_id = r.id
+            JOIN passengers p ON r.passenger_id = p.id
+            WHERE rf.flight_id = ?
+            ORDER BY rf.seat_number
+        """
+        return execute_query(query, (flight_id,))
+
+    @staticmethod
+    def check_inventory(repair=False):
+        """
+        Recount booked seats from reservations and report drift in flight_inventory.
+        Returns a list of (flight_id, stored_booked, actual_booked); repair=True rebuilds the table.
+        """
+        with get_db_connection() as conn:
+            if repair:
+                return rebuild_inventory(conn)
+            return find_inventory_drift(conn)
+
     @staticmethod
     def create(route_id, departure_time, arrival_time, flight_date, capacity=150):
         """Create a new flight"""
@@ -79,5 +204,9 @@ class Flight:
         flight_id = execute_update(query, (route_id, departure_time, arrival_time, flight_date, capacity))
         return flight_id
 
+    def page_key(self):
+        """Sort key used for keyset pagination"""
+        return (self.flight_date, self.departure_time, self.id)
+
     def __str__(self):
         return f"{self.flight_number} on {self.flight_date} {self.departure_time}: {self.origin_code} -> {self.dest_code}"
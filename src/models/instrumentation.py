@@ -0,0 +1,136 @@
+"""
+Query instrumentation: per-statement counters, a slow-query log and an exit summary.
+
+Off by default. Turn it on for a run with
+
+    KIDAIRLINES_PROFILE=1 [KIDAIRLINES_SLOW_MS=50] [KIDAIRLINES_SLOW_LOG=slow.log] python3 main.py
+
+or from code with enable_instrumentation(). Slow statements go to kidairlines-slow.log
+by default (stderr would garble the curses screen). The summary table is printed to
+stderr when the process exits, after curses has restored the terminal.
+"""
+import atexit
+import os
+import sys
+import threading
+from datetime import datetime
+from .database import add_query_hook, remove_query_hook
+
+
+DEFAULT_SLOW_MS = 100
+DEFAULT_SLOW_LOG = 'kidairlines-slow.log'
+SUMMARY_ROWS = 25
+
+
+def _one_line(query):
+    return " ".join(query.split())
+
+
+class StatementStats:
+    """Counters for one (caller, statement) pair"""
+    __slots__ = ('caller', 'query', 'calls', 'total', 'max', 'rows')
+
+    def __init__(self, caller, query):
+        self.caller = caller
+        self.query = query
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+
+
+class QueryStats:
+    """
+    Query hook that aggregates statements by calling method and SQL text, and writes
+    statements slower than slow_ms to slow_log (a path or a file object) if given.
+    """
+
+    def __init__(self, slow_ms=DEFAULT_SLOW_MS, slow_log=None):
+        self.slow_ms = slow_ms
+        self.slow_log = slow_log
+        self.statements = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, kind, query, params, elapsed, rows, caller):
+        key = (caller, query)
+        with self._lock:
+            stats = self.statements.get(key)
+            if stats is None:
+                stats = self.statements[key] = StatementStats(caller, _one_line(query))
+            stats.calls += 1
+            stats.total += elapsed
+            stats.rows += max(rows, 0)
+            if elapsed > stats.max:
+                stats.max = elapsed
+        if self.slow_log is not None and elapsed * 1000 >= self.slow_ms:
+            self._log_slow(kind, query, params, elapsed, rows, caller)
+
+    def _log_slow(self, kind, query, params, elapsed, rows, caller):
+        line = (f"{datetime.now().isoformat(timespec='milliseconds')} {elapsed * 1000:.1f}ms "
+                f"{caller} {kind} rows={rows} | {_one_line(query)}")
+        if params:
+            line += f" | params={str(tuple(params))[:200]}"
+        if isinstance(self.slow_log, str):
+            with open(self.slow_log, 'a') as f:
+                f.write(line + "\n")
+        else:
+            self.slow_log.write(line + "\n")
+            self.slow_log.flush()
+
+    def reset(self):
+        with self._lock:
+            self.statements = {}
+
+    def summary(self, limit=SUMMARY_ROWS):
+        """Table of the statements that took the most total time"""
+        with self._lock:
+            stats = sorted(self.statements.values(), key=lambda s: s.total, reverse=True)
+        calls = sum(s.calls for s in stats)
+        total = sum(s.total for s in stats)
+        lines = [f"{calls:,} statement(s), {total * 1000:,.1f}ms in SQLite, {len(stats)} distinct",
+                 f"{'calls':>7} {'total ms':>10} {'avg ms':>8} {'max ms':>8} {'rows':>9}  caller / statement"]
+        for s in stats[:limit]:
+            lines.append(f"{s.calls:>7,} {s.total * 1000:>10,.1f} {s.total * 1000 / s.calls:>8.3f} "
+                         f"{s.max * 1000:>8.3f} {s.rows:>9,}  {s.caller}: {s.query[:70]}")
+        if len(stats) > limit:
+            lines.append(f"... {len(stats) - limit} more")
+        return "\n".join(lines)
+
+
+_active = None
+
+
+def enable_instrumentation(slow_ms=DEFAULT_SLOW_MS, slow_log=None, summary_on_exit=True):
+    """Start recording statements; returns the QueryStats collecting them"""
+    global _active
+    disable_instrumentation()
+    _active = QueryStats(slow_ms, slow_log)
+    add_query_hook(_active)
+    if summary_on_exit:
+        atexit.register(_print_summary, _active)
+    return _active
+
+
+def disable_instrumentation():
+    """Stop recording; the exit summary of the previous run is dropped too"""
+    global _active
+    if _active is not None:
+        remove_query_hook(_active)
+        atexit.unregister(_print_summary)
+        _active = None
+
+
+def enable_from_environment():
+    """enable_instrumentation() if KIDAIRLINES_PROFILE is set to something other than 0"""
+    if os.environ.get('KIDAIRLINES_PROFILE', '0') in ('', '0'):
+        return None
+    return enable_instrumentation(
+        slow_ms=float(os.environ.get('KIDAIRLINES_SLOW_MS', DEFAULT_SLOW_MS)),
+        slow_log=os.environ.get('KIDAIRLINES_SLOW_LOG') or DEFAULT_SLOW_LOG,
+    )
+
+
+def _print_summary(stats):
+    if stats.statements:
+        print("\nKidAirlines query profile", file=sys.stderr)
+        print(stats.summary(), file=sys.stderr)
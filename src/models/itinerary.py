@@ -0,0 +1,175 @@
+import heapq
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from .database import execute_query
+from .flight import Flight
+
+
+# Connection window at the transfer airport, in minutes
+MIN_CONNECTION_MINUTES = 45
+MAX_CONNECTION_MINUTES = 12 * 60
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def _minutes(hhmm):
+    hours, minutes = hhmm.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+class Itinerary:
+    """One or more flights that connect, with times in minutes from the search window start"""
+    __slots__ = ('legs', 'departure', 'arrival')
+
+    def __init__(self, legs, departure, arrival):
+        self.legs = legs
+        self.departure = departure
+        self.arrival = arrival
+
+    @property
+    def stops(self):
+        return len(self.legs) - 1
+
+    def duration(self):
+        """Total travel time in minutes, connections included"""
+        return self.arrival - self.departure
+
+    def flight_ids(self):
+        return [leg.id for leg in self.legs]
+
+    def airports(self):
+        """Airport codes along the way, e.g. 'DTW-EWR-CDG'"""
+        return "-".join([self.legs[0].origin_code] + [leg.dest_code for leg in self.legs])
+
+    def __str__(self):
+        hours, minutes = divmod(self.duration(), 60)
+        days_later = self.arrival // MINUTES_PER_DAY - self.departure // MINUTES_PER_DAY
+        arrival = self.legs[-1].arrival_time + (f" +{days_later}" if days_later else "")
+        stops = f"{self.stops} stop{'s' if self.stops > 1 else ''}" if self.stops else "nonstop"
+        return f"{self.airports()} {self.legs[0].departure_time}->{arrival} ({hours}h{minutes:02d}, {stops})"
+
+
+class ConnectionIndex:
+    """
+    In-memory adjacency index over the flights of a date window.
+    Flights are grouped by (origin, destination) and sorted by departure, so finding
+    the onward flights at a transfer airport is a binary search instead of a query.
+    Build one per date window and reuse it for many searches.
+    """
+
+    def __init__(self, start_date, days=3, min_seats=1):
+        self.start_date = start_date
+        self.days = days
+        self.min_seats = min_seats
+        self.departures = {}   # (origin, destination) -> [departure minutes], sorted
+        self.flights = {}      # (origin, destination) -> [(departure, arrival, flight)], same order
+        self.served = {}       # origin code -> destination codes flown to in the window
+        self._load()
+
+    def _load(self):
+        start = datetime.strptime(self.start_date, '%Y-%m-%d')
+        end_date = (start + timedelta(days=self.days - 1)).strftime('%Y-%m-%d')
+
+        query, conditions, params = Flight._availability_query(min_seats=self.min_seats)
+        conditions.append("f.flight_date BETWEEN ? AND ?")
+        params.extend([self.start_date, end_date])
+        query += " WHERE " + " AND ".join(conditions)
+        rows = execute_query(query, params, model=Flight)
+
+        day_offsets = {}
+        by_leg = {}
+        for flight in Flight._add_route_details(rows):
+            offset = day_offsets.get(flight.flight_date)
+            if offset is None:
+                days = (datetime.strptime(flight.flight_date, '%Y-%m-%d') - start).days
+                offset = day_offsets[flight.flight_date] = days * MINUTES_PER_DAY
+            departure = offset + _minutes(flight.departure_time)
+            arrival = offset + _minutes(flight.arrival_time)
+            if arrival <= departure:
+                arrival += MINUTES_PER_DAY  # lands the next day
+            by_leg.setdefault((flight.origin_code, flight.dest_code), []).append((departure, arrival, flight))
+
+        for (origin, destination), flights in by_leg.items():
+            flights.sort(key=lambda entry: entry[0])
+            self.flights[origin, destination] = flights
+            self.departures[origin, destination] = [entry[0] for entry in flights]
+            self.served.setdefault(origin, set()).add(destination)
+
+    def _reachable(self, destination, max_legs):
+        """
+        reach[n] = airports that can get to destination in at most n flights, so the
+        search never follows a branch (e.g. out to another spoke) that can't arrive.
+        """
+        reach = [{destination}]
+        for _ in range(max_legs):
+            previous = reach[-1]
+            reach.append(previous | {airport for airport, dests in self.served.items() if dests & previous})
+        return reach
+
+    def _onward(self, airport, destination, earliest, latest):
+        """Flights from `airport` to `destination` leaving between two times (inclusive)"""
+        departures = self.departures[airport, destination]
+        flights = self.flights[airport, destination]
+        for i in range(bisect_left(departures, earliest), len(departures)):
+            if departures[i] > latest:
+                break
+            yield flights[i]
+
+    def search(self, origin, destination, travel_date=None, max_stops=2,
+               min_connection=MIN_CONNECTION_MINUTES, max_connection=MAX_CONNECTION_MINUTES,
+               limit=20):
+        """
+        Itineraries from origin to destination departing on travel_date (default: the
+        first day of the window), fastest first, then fewest stops, then earliest departure.
+        """
+        day = 0
+        if travel_date:
+            day = (datetime.strptime(travel_date, '%Y-%m-%d')
+                   - datetime.strptime(self.start_date, '%Y-%m-%d')).days
+        day_start = day * MINUTES_PER_DAY
+
+        max_legs = max_stops + 1
+        reach = self._reachable(destination, max_legs)
+
+        # Best `limit` trips so far as a heap with the worst on top, keyed like the final sort
+        best = []
+        found = 0
+        # Depth-first over (legs so far, airports visited); trips never revisit an airport
+        stack = [([entry], {origin, stop})
+                 for stop in self.served.get(origin, set()) & reach[max_legs - 1]
+                 for entry in self._onward(origin, stop, day_start, day_start + MINUTES_PER_DAY - 1)]
+        # Earliest departures are popped first
+        stack.sort(key=lambda path: -path[0][0][0])
+        while stack:
+            legs, visited = stack.pop()
+            departure = legs[0][0]
+            _, arrival, flight = legs[-1]
+            # Once `limit` trips are known, anything already slower than the worst can't rank
+            cutoff = -best[0][0] if len(best) == limit else None
+            if cutoff is not None and arrival - departure > cutoff:
+                continue
+            if flight.dest_code == destination:
+                found += 1
+                trip = Itinerary([leg[2] for leg in legs], departure, arrival)
+                key = (-trip.duration(), -trip.stops, -departure, -found, trip)
+                if len(best) < limit:
+                    heapq.heappush(best, key)
+                else:
+                    heapq.heappushpop(best, key)
+                continue
+            if len(legs) == max_legs:
+                continue
+            onward = []
+            for stop in (self.served.get(flight.dest_code, set()) & reach[max_legs - len(legs) - 1]) - visited:
+                for entry in self._onward(flight.dest_code, stop, arrival + min_connection,
+                                          arrival + max_connection):
+                    if cutoff is not None and entry[0] - departure > cutoff:
+                        break  # later departures only get slower
+                    onward.append((legs + [entry], visited | {stop}))
+            # Shortest connections are popped first, which tightens the cutoff early
+            onward.sort(key=lambda path: -path[0][-1][0])
+            stack.extend(onward)
+
+        trips = [key[-1] for key in best]
+        trips.sort(key=lambda trip: (trip.duration(), trip.stops, trip.departure))
+        return trips
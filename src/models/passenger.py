@@ -1,7 +1,9 @@
-from .database import execute_query, execute_update
+from .database import execute_query, execute_update, execute_page, has_table, iter_query
 
 
 class Passenger:
+    __slots__ = ('id', 'first_name', 'last_name', 'date_of_birth', 'created_at')
+
     def __init__(self, id, first_name, last_name, date_of_birth=None, created_at=None):
         self.id = id
         self.first_name = first_name
@@ -9,33 +11,76 @@ class Passenger:
         self.date_of_birth = date_of_birth
         self.created_at = created_at
 
+    @staticmethod
+    def _all_query():
+        """Build the get_all/iter_all query"""
+        return "SELECT * FROM passengers ORDER BY last_name, first_name"
+
     @staticmethod
     def get_all():
         """Get all passengers"""
-        query = "SELECT * FROM passengers ORDER BY last_name, first_name"
-        rows = execute_query(query)
-        return [Passenger(**dict(row)) for row in rows]
+        return execute_query(Passenger._all_query(), model=Passenger)
+
+    @staticmethod
+    def iter_all(batch_size=1000):
+        """Stream all passengers in constant memory"""
+        return iter_query(Passenger._all_query(), model=Passenger, batch_size=batch_size)
+
+    @staticmethod
+    def get_page(after=None, before=None, limit=50, last=False):
+        """Get one page of passengers by name, keyset-paginated on page_key()"""
+        return execute_page("SELECT * FROM passengers", ("last_name", "first_name", "id"),
+                            after=after, before=before, limit=limit, model=Passenger, last=last)
 
     @staticmethod
     def get_by_id(passenger_id):
         """Get passenger by ID"""
         query = "SELECT * FROM passengers WHERE id = ?"
-        rows = execute_query(query, (passenger_id,))
+        rows = execute_query(query, (passenger_id,), model=Passenger)
         if rows:
-            return Passenger(**dict(rows[0]))
+            return rows[0]
         return None
 
     @staticmethod
-    def search(search_term):
-        """Search passengers by name"""
+    def search(search_term, limit=None):
+        """
+        Search passengers by name (full-text prefix search when FTS5 is available).
+        With a limit, the first that many matches in name order come back unranked,
+        which is cheaper than ranking every passenger a short prefix matches.
+        """
+        words = search_term.split()
+        if words and has_table('passengers_fts'):
+            return Passenger._search_fts(words, limit)
+
         query = """
             SELECT * FROM passengers
             WHERE first_name LIKE ? OR last_name LIKE ?
             ORDER BY last_name, first_name
         """
         search_pattern = f"%{search_term}%"
-        rows = execute_query(query, (search_pattern, search_pattern))
-        return [Passenger(**dict(row)) for row in rows]
+        params = [search_pattern, search_pattern]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return execute_query(query, params, model=Passenger)
+
+    @staticmethod
+    def _search_fts(words, limit=None):
+        """
+        Every word must prefix-match a first or last name; best matches first, or
+        with a limit the first matches in list order
+        """
+        match = " ".join('"' + word.replace('"', '""') + '"*' for word in words)
+        query = """
+            SELECT p.* FROM passengers_fts
+            JOIN passengers p ON p.id = passengers_fts.rowid
+            WHERE passengers_fts MATCH ?
+        """
+        if limit is not None:
+            query += " ORDER BY p.last_name, p.first_name, p.id LIMIT ?"
+            return execute_query(query, (match, limit), model=Passenger)
+        query += " ORDER BY passengers_fts.rank, p.last_name, p.first_name"
+        return execute_query(query, (match,), model=Passenger)
 
     @staticmethod
     def create(first_name, last_name, date_of_birth=None):
@@ -50,6 +95,10 @@ class Passenger:
         query = "UPDATE passengers SET first_name = ?, last_name = ?, date_of_birth = ? WHERE id = ?"
         execute_update(query, (first_name, last_name, date_of_birth, passenger_id))
 
+    def page_key(self):
+        """Sort key used for keyset pagination"""
+        return (self.last_name, self.first_name, self.id)
+
     def full_name(self):
         return f"{self.first_name} {self.last_name}"
 
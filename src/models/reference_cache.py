@@ -0,0 +1,89 @@
+from src.database import get_db_path
+from .database import execute_query
+
+
+class ReferenceCache:
+    """
+    In-process cache of airports and routes, keyed by id and by code/flight number.
+    Reference data almost never changes, so it is loaded once and kept until a
+    model method that writes airports or routes calls invalidate(). Commits from
+    other connections (other processes, usually) change PRAGMA data_version, which
+    ensure_loaded() checks before serving cached data; route() also reloads when
+    it meets a route id it hasn't seen.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.invalidate()
+
+    def invalidate(self):
+        """Drop cached data; the next lookup reloads it"""
+        self._db_path = None
+        self._data_version = None
+        self.airports = []            # sorted by code
+        self.airports_by_id = {}
+        self.airports_by_code = {}
+        self.routes = []              # sorted by flight number, with airport details
+        self.routes_by_id = {}
+        self.routes_by_flight_number = {}
+        self._unknown_route_ids = set()   # still missing after a reload; see route()
+
+    def _load(self):
+        from .airport import Airport
+        from .route import Route
+
+        self.airports = execute_query("SELECT * FROM airports ORDER BY code", model=Airport)
+        self.airports_by_id = {a.id: a for a in self.airports}
+        self.airports_by_code = {a.code: a for a in self.airports}
+
+        # Same rows as the routes/airports join: skip routes whose airports are gone
+        self.routes = []
+        for route in execute_query("SELECT * FROM routes ORDER BY flight_number", model=Route):
+            origin = self.airports_by_id.get(route.origin_airport_id)
+            dest = self.airports_by_id.get(route.destination_airport_id)
+            if origin is None or dest is None:
+                continue
+            route.origin_code, route.origin_name, route.origin_city = origin.code, origin.name, origin.city
+            route.dest_code, route.dest_name, route.dest_city = dest.code, dest.name, dest.city
+            self.routes.append(route)
+        self.routes_by_id = {r.id: r for r in self.routes}
+        self.routes_by_flight_number = {r.flight_number: r for r in self.routes}
+
+    def ensure_loaded(self):
+        """
+        Load the cache if it is empty, belongs to another database or another connection
+        has committed since it was loaded; returns self
+        """
+        db_path = get_db_path()
+        # Only changes when another connection commits: this one's writes invalidate()
+        data_version = execute_query("PRAGMA data_version")[0][0]
+        if self._db_path == db_path and self._data_version == data_version:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self._load()
+            self._db_path = db_path
+            self._data_version = data_version
+        return self
+
+    def route(self, route_id):
+        """
+        Route by id from a loaded cache, or None. An unknown id may be a route another
+        process created after the cache was loaded, so it reloads once before giving up.
+        """
+        route = self.routes_by_id.get(route_id)
+        if route is None and route_id not in self._unknown_route_ids:
+            self.misses += 1
+            self._load()
+            route = self.routes_by_id.get(route_id)
+            if route is None:
+                self._unknown_route_ids.add(route_id)
+        return route
+
+    def stats(self):
+        """Hit and miss counters"""
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+reference_cache = ReferenceCache()
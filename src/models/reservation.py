@@ -1,9 +1,19 @@
-from .database import execute_query, execute_update
-import random
-import string
+from .database import execute_query, execute_update, execute_statement, iter_query, unit_of_work, Rollback, IN_CHUNK_SIZE
+from .confirmation import confirmation_allocator
+from .reference_cache import reference_cache
+from .seat_map import SeatMap
+import sqlite3
 
 
 class Reservation:
+    __slots__ = ('id', 'passenger_id', 'confirmation_number', 'created_at', 'status',
+                 'passenger_first_name', 'passenger_last_name')
+
+    # Outcomes of claiming a seat on a flight
+    BOOKED = 'BOOKED'
+    SOLD_OUT = 'SOLD_OUT'
+    SEAT_TAKEN = 'SEAT_TAKEN'
+
     def __init__(self, id, passenger_id, confirmation_number, created_at=None, status='CONFIRMED',
                  passenger_first_name=None, passenger_last_name=None):
         self.id = id
@@ -16,20 +26,28 @@ class Reservation:
 
     @staticmethod
     def generate_confirmation_number():
-        """Generate a random 6-character confirmation number"""
-        return ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
+        """Allocate a unique 6-character confirmation number"""
+        return confirmation_allocator.next_number()
 
     @staticmethod
-    def get_all():
-        """Get all reservations with passenger details"""
-        query = """
+    def _all_query():
+        """Build the get_all/iter_all query"""
+        return """
             SELECT r.*, p.first_name as passenger_first_name, p.last_name as passenger_last_name
             FROM reservations r
             JOIN passengers p ON r.passenger_id = p.id
             ORDER BY r.created_at DESC
         """
-        rows = execute_query(query)
-        return [Reservation(**dict(row)) for row in rows]
+
+    @staticmethod
+    def get_all():
+        """Get all reservations with passenger details"""
+        return execute_query(Reservation._all_query(), model=Reservation)
+
+    @staticmethod
+    def iter_all(batch_size=1000):
+        """Stream all reservations with passenger details in constant memory"""
+        return iter_query(Reservation._all_query(), model=Reservation, batch_size=batch_size)
 
     @staticmethod
     def get_by_id(reservation_id):
@@ -40,9 +58,9 @@ class Reservation:
             JOIN passengers p ON r.passenger_id = p.id
             WHERE r.id = ?
         """
-        rows = execute_query(query, (reservation_id,))
+        rows = execute_query(query, (reservation_id,), model=Reservation)
         if rows:
-            return Reservation(**dict(rows[0]))
+            return rows[0]
         return None
 
     @staticmethod
@@ -54,9 +72,9 @@ class Reservation:
             JOIN passengers p ON r.passenger_id = p.id
             WHERE r.confirmation_number = ?
         """
-        rows = execute_query(query, (confirmation_number,))
+        rows = execute_query(query, (confirmation_number,), model=Reservation)
         if rows:
-            return Reservation(**dict(rows[0]))
+            return rows[0]
         return None
 
     @staticmethod
@@ -69,8 +87,7 @@ class Reservation:
             WHERE r.passenger_id = ?
             ORDER BY r.created_at DESC
         """
-        rows = execute_query(query, (passenger_id,))
-        return [Reservation(**dict(row)) for row in rows]
+        return execute_query(query, (passenger_id,), model=Reservation)
 
     @staticmethod
     def create(passenger_id, confirmation_number=None):
@@ -82,46 +99,181 @@ class Reservation:
         reservation_id = execute_update(query, (passenger_id, confirmation_number))
         return reservation_id, confirmation_number
 
+    @staticmethod
+    def book(passenger_id, flight_id, seat_number=None):
+        """
+        Create a reservation with one flight in a single transaction.
+        Returns (result, reservation_id, confirmation_number) where result is BOOKED,
+        SOLD_OUT or SEAT_TAKEN; the ids are None unless the booking went through.
+        """
+        # Allocate outside the transaction so a new number block commits independently
+        confirmation_number = Reservation.generate_confirmation_number()
+        with unit_of_work():
+            reservation_id, confirmation_number = Reservation.create(passenger_id, confirmation_number)
+            result = Reservation.claim_seat(reservation_id, flight_id, seat_number)
+            if result != Reservation.BOOKED:
+                booking = (result, None, None)
+                raise Rollback()
+            booking = (result, reservation_id, confirmation_number)
+        return booking
+
+    @staticmethod
+    def book_auto_seat(passenger_id, flight_id):
+        """
+        Book a flight in the front-most free seat.
+        Returns (result, reservation_id, confirmation_number, seat_number); the seat map
+        is read inside the booking transaction, so the chosen seat can't be taken meanwhile.
+        """
+        return Reservation.book_group([passenger_id], flight_id)[0]
+
+    @staticmethod
+    def book_group(passenger_ids, flight_id):
+        """
+        Book one reservation per passenger on a flight, seated together when possible.
+        All or nothing: returns [(result, reservation_id, confirmation_number, seat_number)]
+        per passenger, with every entry (SOLD_OUT, None, None, None) if they can't all be seated.
+        """
+        passenger_ids = list(passenger_ids)
+        failed = [(Reservation.SOLD_OUT, None, None, None)] * len(passenger_ids)
+        confirmation_numbers = [Reservation.generate_confirmation_number() for _ in passenger_ids]
+        with unit_of_work():
+            seat_map = SeatMap.load(flight_id)
+            seats = seat_map.assign_group(len(passenger_ids)) if seat_map else None
+            if not seats:
+                bookings = failed
+                raise Rollback()
+
+            bookings = []
+            for passenger_id, number, seat in zip(passenger_ids, confirmation_numbers, seats):
+                reservation_id, number = Reservation.create(passenger_id, number)
+                result = Reservation.claim_seat(reservation_id, flight_id, seat)
+                if result != Reservation.BOOKED:
+                    bookings = failed
+                    raise Rollback()
+                bookings.append((result, reservation_id, number, seat))
+        return bookings
+
+    @staticmethod
+    def book_itinerary(passenger_id, flight_ids):
+        """
+        Book a trip with connections as one reservation, auto-assigning a seat on each leg.
+        All legs or none: returns (result, reservation_id, confirmation_number, seat_numbers).
+        """
+        confirmation_number = Reservation.generate_confirmation_number()
+        with unit_of_work():
+            reservation_id, confirmation_number = Reservation.create(passenger_id, confirmation_number)
+            seats = []
+            for flight_id in flight_ids:
+                seat_map = SeatMap.load(flight_id)
+                seat = seat_map.next_free() if seat_map else None
+                result = Reservation.claim_seat(reservation_id, flight_id, seat) if seat else Reservation.SOLD_OUT
+                if result != Reservation.BOOKED:
+                    booking = (result, None, None, None)
+                    raise Rollback()
+                seats.append(seat)
+            booking = (Reservation.BOOKED, reservation_id, confirmation_number, seats)
+        return booking
+
     @staticmethod
     def update_status(reservation_id, status):
-        """Update reservation status"""
-        query = "UPDATE reservations SET status = ? WHERE id = ?"
-        execute_update(query, (status, reservation_id))
+        """
+        Update reservation status. Cancelling frees the seats, so reactivating takes
+        them back and only goes through while every leg has room; the check and the
+        update are one guarded statement inside BEGIN IMMEDIATE, like claim_seat.
+        Returns False if the reservation was left cancelled because a leg is full.
+        """
+        query = """
+            UPDATE reservations SET status = ?
+            WHERE id = ?
+              AND (? = 'CANCELLED' OR status IS NOT 'CANCELLED' OR NOT EXISTS (
+                  SELECT 1 FROM reservation_flights rf
+                  JOIN flights f ON f.id = rf.flight_id
+                  LEFT JOIN flight_inventory i ON i.flight_id = rf.flight_id
+                  WHERE rf.reservation_id = ?
+                  GROUP BY rf.flight_id
+                  HAVING COALESCE(MAX(i.booked_seats), 0) + COUNT(*) > MAX(f.capacity)))
+        """
+        with unit_of_work():
+            return execute_statement(query, (status, reservation_id, status, reservation_id)).rowcount > 0
 
     @staticmethod
     def delete(reservation_id):
         """Delete a reservation and its flights"""
-        # Delete reservation flights first
-        execute_update("DELETE FROM reservation_flights WHERE reservation_id = ?", (reservation_id,))
-        # Delete reservation
+        # reservation_flights rows go with it via ON DELETE CASCADE
         execute_update("DELETE FROM reservations WHERE id = ?", (reservation_id,))
 
+    @staticmethod
+    def delete_many(reservation_ids):
+        """Delete many reservations and their flights in one transaction"""
+        reservation_ids = list(reservation_ids)
+        with unit_of_work():
+            for start in range(0, len(reservation_ids), IN_CHUNK_SIZE):
+                chunk = reservation_ids[start:start + IN_CHUNK_SIZE]
+                execute_update(f"DELETE FROM reservations WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+
     def get_flights(self):
         """Get all flights for this reservation"""
+        return Reservation.get_flights_for_many([self.id]).get(self.id, [])
+
+    @staticmethod
+    def get_flights_for_many(reservation_ids):
+        """
+        Get the flights for many reservations at once.
+        Returns {reservation_id: [flight dicts ordered by departure]}; reservations
+        without flights are left out.
+        """
+        cache = reference_cache.ensure_loaded()
+        itineraries = {}
+        reservation_ids = list(reservation_ids)
+        for start in range(0, len(reservation_ids), IN_CHUNK_SIZE):
+            chunk = reservation_ids[start:start + IN_CHUNK_SIZE]
+            query = f"""
+                SELECT rf.*, f.route_id, f.flight_date, f.departure_time, f.arrival_time
+                FROM reservation_flights rf
+                JOIN flights f ON rf.flight_id = f.id
+                WHERE rf.reservation_id IN ({", ".join("?" * len(chunk))})
+                ORDER BY f.flight_date, f.departure_time
+            """
+            for row in execute_query(query, chunk):
+                route = cache.route(row['route_id'])
+                if route is None:
+                    continue
+                flight = dict(row)
+                flight['flight_number'] = route.flight_number
+                flight['origin_code'] = route.origin_code
+                flight['dest_code'] = route.dest_code
+                flight['origin_city'] = route.origin_city
+                flight['dest_city'] = route.dest_city
+                itineraries.setdefault(row['reservation_id'], []).append(flight)
+        return itineraries
+
+    @staticmethod
+    def claim_seat(reservation_id, flight_id, seat_number=None):
+        """
+        Add a flight to a reservation only if the flight still has capacity.
+        The capacity check and the insert are one guarded statement inside a
+        BEGIN IMMEDIATE transaction, so concurrent bookings can't overbook.
+        Returns BOOKED, SOLD_OUT or SEAT_TAKEN.
+        """
         query = """
-            SELECT rf.*, f.flight_date, f.departure_time, f.arrival_time,
-                   r.flight_number, o.code as origin_code, d.code as dest_code,
-                   o.city as origin_city, d.city as dest_city
-            FROM reservation_flights rf
-            JOIN flights f ON rf.flight_id = f.id
-            JOIN routes r ON f.route_id = r.id
-            JOIN airports o ON r.origin_airport_id = o.id
-            JOIN airports d ON r.destination_airport_id = d.id
-            WHERE rf.reservation_id = ?
-            ORDER BY f.flight_date, f.departure_time
+            INSERT INTO reservation_flights (reservation_id, flight_id, seat_number)
+            SELECT ?, f.id, ?
+            FROM flights f
+            LEFT JOIN flight_inventory i ON i.flight_id = f.id
+            WHERE f.id = ? AND COALESCE(i.booked_seats, 0) < f.capacity
         """
-        rows = execute_query(query, (self.id,))
-        return [dict(row) for row in rows]
+        try:
+            with unit_of_work():
+                if execute_statement(query, (reservation_id, seat_number, flight_id)).rowcount == 0:
+                    return Reservation.SOLD_OUT
+        except sqlite3.IntegrityError:
+            return Reservation.SEAT_TAKEN
+        return Reservation.BOOKED
 
     @staticmethod
     def add_flight(reservation_id, flight_id, seat_number=None):
         """Add a flight to a reservation"""
-        query = "INSERT INTO reservation_flights (reservation_id, flight_id, seat_number) VALUES (?, ?, ?)"
-        try:
-            execute_update(query, (reservation_id, flight_id, seat_number))
-            return True
-        except Exception as e:
-            return False
+        return Reservation.claim_seat(reservation_id, flight_id, seat_number) == Reservation.BOOKED
 
     @staticmethod
     def remove_flight(reservation_id, flight_id):
@@ -1,7 +1,11 @@
-from .database import execute_query, execute_update
+from .database import execute_update, iter_query, unit_of_work, IN_CHUNK_SIZE
+from .reference_cache import reference_cache
 
 
 class Route:
+    __slots__ = ('id', 'origin_airport_id', 'destination_airport_id', 'flight_number',
+                 'origin_code', 'origin_name', 'origin_city', 'dest_code', 'dest_name', 'dest_city')
+
     def __init__(self, id, origin_airport_id, destination_airport_id, flight_number,
                  origin_code=None, origin_name=None, origin_city=None,
                  dest_code=None, dest_name=None, dest_city=None):
@@ -17,9 +21,9 @@ class Route:
         self.dest_city = dest_city
 
     @staticmethod
-    def get_all():
-        """Get all routes with airport details"""
-        query = """
+    def _all_query():
+        """Build the get_all/iter_all query"""
+        return """
             SELECT r.*,
                    o.code as origin_code, o.name as origin_name, o.city as origin_city,
                    d.code as dest_code, d.name as dest_name, d.city as dest_city
@@ -28,38 +32,51 @@ class Route:
             JOIN airports d ON r.destination_airport_id = d.id
             ORDER BY r.flight_number
         """
-        rows = execute_query(query)
-        return [Route(**dict(row)) for row in rows]
+
+    @staticmethod
+    def get_all():
+        """Get all routes with airport details"""
+        return list(reference_cache.ensure_loaded().routes)
+
+    @staticmethod
+    def iter_all(batch_size=1000):
+        """Stream all routes with airport details in constant memory"""
+        return iter_query(Route._all_query(), model=Route, batch_size=batch_size)
 
     @staticmethod
     def get_by_id(route_id):
         """Get route by ID"""
-        query = """
-            SELECT r.*,
-                   o.code as origin_code, o.name as origin_name, o.city as origin_city,
-                   d.code as dest_code, d.name as dest_name, d.city as dest_city
-            FROM routes r
-            JOIN airports o ON r.origin_airport_id = o.id
-            JOIN airports d ON r.destination_airport_id = d.id
-            WHERE r.id = ?
-        """
-        rows = execute_query(query, (route_id,))
-        if rows:
-            return Route(**dict(rows[0]))
-        return None
+        return reference_cache.ensure_loaded().route(route_id)
+
+    @staticmethod
+    def get_by_flight_number(flight_number):
+        """Get route by flight number"""
+        return reference_cache.ensure_loaded().routes_by_flight_number.get(flight_number)
 
     @staticmethod
     def create(origin_airport_id, destination_airport_id, flight_number):
         """Create a new route"""
         query = "INSERT INTO routes (origin_airport_id, destination_airport_id, flight_number) VALUES (?, ?, ?)"
         route_id = execute_update(query, (origin_airport_id, destination_airport_id, flight_number))
+        reference_cache.invalidate()
         return route_id
 
     @staticmethod
     def delete(route_id):
-        """Delete a route"""
+        """Delete a route with its flights and their bookings"""
         query = "DELETE FROM routes WHERE id = ?"
         execute_update(query, (route_id,))
+        reference_cache.invalidate()
+
+    @staticmethod
+    def delete_many(route_ids):
+        """Delete many routes, their flights and bookings in one transaction"""
+        route_ids = list(route_ids)
+        with unit_of_work():
+            for start in range(0, len(route_ids), IN_CHUNK_SIZE):
+                chunk = route_ids[start:start + IN_CHUNK_SIZE]
+                execute_update(f"DELETE FROM routes WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+        reference_cache.invalidate()
 
     def __str__(self):
         return f"{self.flight_number}: {self.origin_code} -> {self.dest_code}"
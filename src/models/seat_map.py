@@ -0,0 +1,175 @@
+from .database import execute_query
+
+
+class SeatMap:
+    """
+    Cabin layout and seat occupancy for one flight.
+
+    Seats are numbered 0..capacity-1 front to back, left to right, and
+    occupancy is a single int used as a bitset (bit i set = seat i taken),
+    so finding a free seat or a run of adjacent free seats is a handful of
+    bit operations instead of a scan. Capacity is counted separately, as booked
+    seats: bookings without a seat number take up capacity without a seat, and
+    legs of cancelled reservations keep their seat number but not their capacity.
+    """
+
+    # Seat letters by cabin width; each string is a block of seats between aisles
+    LAYOUTS = {
+        4: ('AB', 'CD'),
+        6: ('ABC', 'DEF'),
+        9: ('ABC', 'DEF', 'GHK'),
+    }
+
+    def __init__(self, flight_id, capacity, occupied_labels=(), booked=None):
+        self.flight_id = flight_id
+        self.capacity = capacity
+        self.layout = self.layout_for(capacity)
+        self.letters = ''.join(self.layout)
+        self.seats_per_row = len(self.letters)
+        self.rows = -(-capacity // self.seats_per_row)
+        self.all_seats = (1 << capacity) - 1
+        self.occupied = 0
+        for label in occupied_labels:
+            index = self.index_of(label)
+            if index is not None:
+                self.occupied |= 1 << index
+        self.booked = bin(self.occupied).count('1') if booked is None else booked
+
+        # Block-start masks by block size, see _block_starts()/_aisle_block_starts()
+        self._row_starts = {}
+
+    @staticmethod
+    def layout_for(capacity):
+        """Narrow-body cabins for small flights, wide-body for the long-haul ones"""
+        if capacity <= 100:
+            return SeatMap.LAYOUTS[4]
+        if capacity <= 200:
+            return SeatMap.LAYOUTS[6]
+        return SeatMap.LAYOUTS[9]
+
+    @staticmethod
+    def load(flight_id):
+        """
+        Load a flight's seat map with one query; None if the flight doesn't exist.
+        Booked seats come from flight_inventory, the count claim_seat() checks.
+        """
+        query = """
+            SELECT f.capacity, COALESCE(i.booked_seats, 0) AS booked_seats, rf.seat_number
+            FROM flights f
+            LEFT JOIN flight_inventory i ON i.flight_id = f.id
+            LEFT JOIN reservation_flights rf ON rf.flight_id = f.id
+            WHERE f.id = ?
+        """
+        rows = execute_query(query, (flight_id,))
+        if not rows:
+            return None
+        # Seat numbers stay unique per flight even on cancelled reservations, so all are taken
+        return SeatMap(flight_id, rows[0]['capacity'],
+                       [row['seat_number'] for row in rows if row['seat_number']],
+                       rows[0]['booked_seats'])
+
+    def label(self, index):
+        """Seat label such as '12A' for a seat index"""
+        row, column = divmod(index, self.seats_per_row)
+        return f"{row + 1}{self.letters[column]}"
+
+    def index_of(self, label):
+        """Seat index for a label, or None if the seat isn't on this aircraft"""
+        label = (label or '').strip().upper()
+        row, letter = label[:-1], label[-1:]
+        if not row.isdigit() or not letter or letter not in self.letters:
+            return None
+        index = (int(row) - 1) * self.seats_per_row + self.letters.index(letter)
+        if int(row) < 1 or index >= self.capacity:
+            return None
+        return index
+
+    def is_free(self, label):
+        index = self.index_of(label)
+        return index is not None and not self.occupied >> index & 1 and self.free_count() > 0
+
+    def free_count(self):
+        """Seats that can still be booked: limited by capacity and by untaken seat numbers"""
+        return max(0, min(self.capacity - self.booked, self.capacity - bin(self.occupied).count('1')))
+
+    def occupy(self, label):
+        """Mark a seat as taken"""
+        index = self.index_of(label)
+        if index is not None and not self.occupied >> index & 1:
+            self.occupied |= 1 << index
+            self.booked += 1
+
+    def next_free(self):
+        """Label of the front-most free seat, or None if the flight is full"""
+        free = ~self.occupied & self.all_seats
+        if not free or self.free_count() == 0:
+            return None
+        return self.label((free & -free).bit_length() - 1)
+
+    def _block_starts(self, count):
+        """Bitmask of seat indexes where `count` seats fit before the end of the row"""
+        mask = self._row_starts.get(count)
+        if mask is None:
+            row_mask = (1 << (self.seats_per_row - count + 1)) - 1
+            mask = 0
+            for row in range(self.rows):
+                mask |= row_mask << (row * self.seats_per_row)
+            self._row_starts[count] = mask
+        return mask
+
+    def best_block(self, count):
+        """
+        Labels of the front-most `count` adjacent free seats in one row, or None.
+        Runs that don't cross an aisle are preferred.
+        """
+        if count < 1 or count > self.seats_per_row or count > self.free_count():
+            return None
+        free = ~self.occupied & self.all_seats
+        runs = free
+        for shift in range(1, count):
+            runs &= free >> shift
+        runs &= self._block_starts(count)
+        if not runs:
+            return None
+
+        # Among the candidate starts, take the first one that stays within an aisle block
+        same_block = runs & self._aisle_block_starts(count)
+        candidates = same_block or runs
+        start = (candidates & -candidates).bit_length() - 1
+        return [self.label(start + offset) for offset in range(count)]
+
+    def _aisle_block_starts(self, count):
+        """Bitmask of seat indexes where `count` seats fit without crossing an aisle"""
+        key = ('aisle', count)
+        mask = self._row_starts.get(key)
+        if mask is None:
+            row_mask = 0
+            column = 0
+            for group in self.layout:
+                for offset in range(len(group) - count + 1):
+                    row_mask |= 1 << (column + offset)
+                column += len(group)
+            mask = 0
+            for row in range(self.rows):
+                mask |= row_mask << (row * self.seats_per_row)
+            self._row_starts[key] = mask
+        return mask
+
+    def assign_group(self, count):
+        """
+        Seats for a group: adjacent seats in one row when possible, otherwise the
+        front-most free seats. None if fewer than `count` seats are free.
+        """
+        if count > self.free_count():
+            return None
+        block = self.best_block(count)
+        if block:
+            return block
+
+        seats = []
+        free = ~self.occupied & self.all_seats
+        while free and len(seats) < count:
+            lowest = free & -free
+            seats.append(self.label(lowest.bit_length() - 1))
+            free ^= lowest
+        return seats if len(seats) == count else None
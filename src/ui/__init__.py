@@ -1,4 +1,4 @@
 from .screen_base import ScreenBase
-from .menu import Menu, ListSelector
+from .menu import Menu, ListSelector, PagedSource
 
-__all__ = ['ScreenBase', 'Menu', 'ListSelector']
+__all__ = ['ScreenBase', 'Menu', 'ListSelector', 'PagedSource']
@@ -1,13 +1,17 @@
 import curses
 from .screen_base import ScreenBase
-from .menu import ListSelector
-from src.models import Passenger, Flight, Reservation
+from .menu import ListSelector, PagedSource
+from .seat_map_screen import SeatMapScreen
+from src.models import Passenger, Flight, Reservation, SeatMap, Airport, ConnectionIndex
 from datetime import datetime, timedelta
 
 
 class BookingScreen(ScreenBase):
     """Screen for booking tickets"""
 
+    # get_seat_number() result meaning "pick the best free seat"
+    AUTO_ASSIGN = 'AUTO'
+
     def display(self):
         """Display booking screen"""
         self.clear()
@@ -20,25 +24,36 @@ class BookingScreen(ScreenBase):
         if not passenger:
             return
 
-        # Step 2: Select flight
+        # Step 2: Direct flight, or search for a trip with connections
+        trip_type = self.select_trip_type()
+        if trip_type == '2':
+            self.book_connection(passenger)
+            return
+        if trip_type != '1':
+            return
+
         flight = self.select_flight()
         if not flight:
             return
 
         # Step 3: Get seat number
-        seat = self.get_seat_number()
+        seat = self.get_seat_number(flight)
         if not seat:
             return
 
         # Step 4: Create reservation
         try:
-            reservation_id, conf_number = Reservation.create(passenger.id)
-            success = Reservation.add_flight(reservation_id, flight.id, seat)
+            if seat == self.AUTO_ASSIGN:
+                result, _, conf_number, seat = Reservation.book_auto_seat(passenger.id, flight.id)
+            else:
+                result, _, conf_number = Reservation.book(passenger.id, flight.id, seat)
 
-            if success:
-                self.show_message(f"Booking confirmed! Confirmation: {conf_number}")
+            if result == Reservation.BOOKED:
+                self.show_message(f"Booking confirmed! Seat {seat}, confirmation: {conf_number}")
+            elif result == Reservation.SOLD_OUT:
+                self.show_message("Booking failed - flight is sold out", error=True)
             else:
-                self.show_message("Booking failed - seat may be taken", error=True)
+                self.show_message(f"Booking failed - seat {seat} is taken", error=True)
         except Exception as e:
             self.show_message(f"Booking failed: {str(e)}", error=True)
 
@@ -59,15 +74,14 @@ class BookingScreen(ScreenBase):
         key = self.stdscr.getch()
 
         if key == ord('1'):
-            passengers = Passenger.get_all()
-            if not passengers:
+            if not Passenger.get_page(limit=1):
                 self.show_message("No passengers found. Please create one.")
                 return self.create_passenger()
 
             selector = ListSelector(
                 self.stdscr,
                 "SELECT PASSENGER",
-                passengers,
+                PagedSource(Passenger.get_page, Passenger.page_key, search=Passenger.search),
                 lambda p: f"{p.full_name()} (ID: {p.id})"
             )
             return selector.display()
@@ -96,9 +110,27 @@ class BookingScreen(ScreenBase):
         passenger_id = Passenger.create(first_name, last_name, dob if dob else None)
         return Passenger.get_by_id(passenger_id)
 
-    def select_flight(self):
-        """Select a flight"""
-        # Show next 7 days
+    def select_trip_type(self):
+        """Choose between a direct flight and a connection search; returns '1', '2' or None"""
+        self.clear()
+        self.draw_header("TRIP TYPE")
+
+        self.stdscr.attron(curses.color_pair(1))
+        self.stdscr.addstr(5, 5, "1. Direct flight")
+        self.stdscr.addstr(6, 5, "2. Search trips with connections")
+        self.stdscr.addstr(7, 5, "3. Cancel")
+        self.stdscr.attroff(curses.color_pair(1))
+
+        self.draw_footer("1-3: Select option")
+        self.refresh()
+
+        key = self.stdscr.getch()
+        if key in (ord('1'), ord('2')):
+            return chr(key)
+        return None
+
+    def select_date(self):
+        """Pick one of the next 7 days; returns 'YYYY-MM-DD' or None"""
         today = datetime.now()
         dates = [(today + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(7)]
 
@@ -114,35 +146,94 @@ class BookingScreen(ScreenBase):
         self.refresh()
 
         key = self.stdscr.getch()
-        if key == 27:
+        if ord('1') <= key <= ord('7'):
+            return dates[key - ord('1')]
+        return None
+
+    def select_flight(self):
+        """Select a flight"""
+        date_filter = self.select_date()
+        if not date_filter:
             return None
 
-        if ord('1') <= key <= ord('7'):
-            idx = key - ord('1')
-            date_filter = dates[idx]
+        available_flights = PagedSource(
+            lambda **page: Flight.get_page(date_filter, min_seats=1, **page),
+            Flight.page_key,
+            search=lambda text, limit: Flight.get_all_with_availability(date_filter, min_seats=1),
+            search_limit=None  # one day's flights
+        )
+
+        selector = ListSelector(
+            self.stdscr,
+            f"SELECT FLIGHT - {date_filter}",
+            available_flights,
+            lambda f: f"{f.flight_number} {f.departure_time} {f.origin_code}->{f.dest_code} ({f.available_seats} seats)",
+            empty_message="No flights available for this date",
+            refresh=Flight.fetch_availability,
+            apply_refresh=Flight.apply_availability
+        )
+        return selector.display()
+
+    def book_connection(self, passenger):
+        """Search trips with up to two connections and book one, seats auto-assigned"""
+        date_filter = self.select_date()
+        if not date_filter:
+            return
 
-            flights = Flight.get_all(date_filter)
-            available_flights = [f for f in flights if Flight.get_available_seats(f.id) > 0]
+        airports = Airport.get_all()
+        origin = ListSelector(self.stdscr, "FLYING FROM", airports, str).display()
+        if not origin:
+            return
 
-            if not available_flights:
-                self.show_message("No flights available for this date")
-                return None
+        destinations = [a for a in airports if a.id != origin.id]
+        destination = ListSelector(self.stdscr, "FLYING TO", destinations, str).display()
+        if not destination:
+            return
 
-            selector = ListSelector(
-                self.stdscr,
-                f"SELECT FLIGHT - {date_filter}",
-                available_flights,
-                lambda f: f"{f.flight_number} {f.departure_time} {f.origin_code}->{f.dest_code} ({Flight.get_available_seats(f.id)} seats)"
-            )
-            return selector.display()
+        itineraries = ConnectionIndex(date_filter).search(origin.code, destination.code, date_filter)
+        trip = ListSelector(
+            self.stdscr,
+            f"SELECT TRIP - {date_filter}",
+            itineraries,
+            lambda t: f"{str(t)} {' '.join(leg.flight_number for leg in t.legs)}",
+            empty_message="No trips with open seats for this date"
+        ).display()
+        if not trip:
+            return
 
-        return None
+        try:
+            result, _, conf_number, seats = Reservation.book_itinerary(passenger.id, trip.flight_ids())
+            if result == Reservation.BOOKED:
+                self.show_message(f"Booking confirmed! Seats {', '.join(seats)}, confirmation: {conf_number}")
+            else:
+                self.show_message("Booking failed - a flight on this trip is sold out", error=True)
+        except Exception as e:
+            self.show_message(f"Booking failed: {str(e)}", error=True)
 
-    def get_seat_number(self):
-        """Get seat number from user"""
-        self.clear()
-        self.draw_header("ENTER SEAT NUMBER")
-        self.refresh()
+    def get_seat_number(self, flight):
+        """Get seat number from user, or AUTO_ASSIGN if they leave it blank"""
+        seat_map = SeatMap.load(flight.id)
+        if not seat_map:
+            self.show_message("Flight not found", error=True)
+            return None
+
+        while True:
+            self.clear()
+            self.draw_header("ENTER SEAT NUMBER")
+            prompt_y = SeatMapScreen(self.stdscr).draw_seat_map(seat_map, 4) + 1
+            self.draw_footer(". = free  X = taken | Enter: Auto-assign | ESC: Cancel")
+            self.refresh()
 
-        seat = self.get_input("Seat (e.g., 12A):", 5, 5, 5)
-        return seat.upper() if seat else None
+            seat = self.get_input("Seat (e.g., 12A):", prompt_y, 5, 5)
+            if seat is None:
+                return None
+            if not seat:
+                return self.AUTO_ASSIGN
+
+            seat = seat.upper()
+            if seat_map.index_of(seat) is None:
+                self.show_message(f"Seat {seat} is not on this aircraft", error=True)
+            elif not seat_map.is_free(seat):
+                self.show_message(f"Seat {seat} is taken", error=True)
+            else:
+                return seat
@@ -210,7 +210,7 @@ class ConfigScreen(ScreenBase):
             self.draw_header("CONFIRM DELETION")
             self.stdscr.attron(curses.color_pair(5))
             self.stdscr.addstr(5, 5, f"Delete route {route.flight_number}?")
-            self.stdscr.addstr(7, 5, "WARNING: This will affect all flights on this route!")
+            self.stdscr.addstr(7, 5, "WARNING: This also deletes its flights and their bookings!")
             self.stdscr.attroff(curses.color_pair(5))
             self.stdscr.attron(curses.color_pair(1))
             self.stdscr.addstr(9, 5, "Y: Confirm | N: Cancel")
@@ -45,14 +45,14 @@ class FlightsScreen(ScreenBase):
 
     def show_flights(self, date_filter=None):
         """Show list of flights"""
-        flights = Flight.get_all(date_filter)
+        flights = Flight.get_all_with_availability(date_filter)
 
         if not flights:
             self.show_message("No flights found for this date")
             return
 
         def format_flight(flight):
-            return f"{flight.flight_number} | {flight.flight_date} {flight.departure_time} | {flight.origin_code}->{flight.dest_code} | {Flight.get_available_seats(flight.id)}/{flight.capacity} seats"
+            return f"{flight.flight_number} | {flight.flight_date} {flight.departure_time} | {flight.origin_code}->{flight.dest_code} | {flight.available_seats}/{flight.capacity} seats"
 
         while True:
             self.clear()
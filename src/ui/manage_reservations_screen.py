@@ -118,7 +118,9 @@ class ManageReservationsScreen(ScreenBase):
         confirm = self.stdscr.getch()
         if confirm in [ord('y'), ord('Y')]:
             try:
-                Reservation.update_status(reservation.id, "CONFIRMED")
-                self.show_message("Reservation reactivated successfully")
+                if Reservation.update_status(reservation.id, "CONFIRMED"):
+                    self.show_message("Reservation reactivated successfully")
+                else:
+                    self.show_message("Sorry, a flight on this reservation is now full", error=True)
             except Exception as e:
                 self.show_message(f"Failed to reactivate: {str(e)}", error=True)
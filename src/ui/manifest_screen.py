@@ -1,8 +1,7 @@
 import curses
 from .screen_base import ScreenBase
-from .menu import ListSelector
+from .menu import ListSelector, PagedSource
 from src.models import Flight
-from src.models.database import execute_query
 from datetime import datetime, timedelta
 
 
@@ -34,16 +33,19 @@ class ManifestScreen(ScreenBase):
             idx = key - ord('1')
             date_filter = dates[idx]
 
-            flights = Flight.get_all(date_filter)
-            if not flights:
-                self.show_message("No flights for this date")
-                return
+            flights = PagedSource(
+                lambda **page: Flight.get_page(date_filter, **page),
+                Flight.page_key,
+                search=lambda text, limit: Flight.get_all_with_availability(date_filter),
+                search_limit=None  # one day's flights
+            )
 
             selector = ListSelector(
                 self.stdscr,
                 f"SELECT FLIGHT - {date_filter}",
                 flights,
-                lambda f: f"{f.flight_number} {f.departure_time} {f.origin_code}->{f.dest_code}"
+                lambda f: f"{f.flight_number} {f.departure_time} {f.origin_code}->{f.dest_code}",
+                empty_message="No flights for this date"
             )
             flight = selector.display()
 
@@ -52,16 +54,7 @@ class ManifestScreen(ScreenBase):
 
     def show_manifest(self, flight):
         """Show passenger manifest for a flight"""
-        # Get passengers on this flight
-        query = """
-            SELECT p.first_name, p.last_name, rf.seat_number, r.confirmation_number
-            FROM reservation_flights rf
-            JOIN reservations r ON rf.reservation_id = r.id
-            JOIN passengers p ON r.passenger_id = p.id
-            WHERE rf.flight_id = ?
-            ORDER BY rf.seat_number
-        """
-        passengers = execute_query(query, (flight.id,))
+        passengers = Flight.get_manifest(flight.id)
 
         while True:
             self.clear()
@@ -1,6 +1,16 @@
+import bisect
 import curses
+import re
+import threading
+import time
 from .screen_base import ScreenBase
 
+KEY_CTRL_L = 12
+KEY_ESC = 27
+KEY_BACKSPACES = (curses.KEY_BACKSPACE, 127, 8)
+
+_WORD = re.compile(r'[0-9a-z]+')
+
 
 class Menu(ScreenBase):
     """Generic menu class for navigation"""
@@ -37,6 +47,8 @@ class Menu(ScreenBase):
                     return "EXIT"
             elif key in [ord('q'), ord('Q')]:
                 return "EXIT"
+            elif key == KEY_CTRL_L:
+                self.repaint()
             elif ord('1') <= key <= ord('9'):
                 # Handle number key selection
                 option_index = key - ord('1')  # Convert to 0-based index
@@ -74,65 +86,442 @@ class Menu(ScreenBase):
                 self.stdscr.attroff(curses.color_pair(1))
 
 
+class PrefixIndex:
+    """Sorted word index over list labels for type-ahead filtering"""
+
+    def __init__(self, labels):
+        """labels: display strings; matches() returns positions in this list"""
+        postings = {}
+        self.label_words = []
+        for position, label in enumerate(labels):
+            words = _WORD.findall(label.lower())
+            self.label_words.append(words)
+            for word in words:
+                postings.setdefault(word, []).append(position)
+        self.words = sorted(postings)
+        self.postings = [postings[word] for word in self.words]
+        # counts[i]: postings before words[i], so a prefix range's size is one subtraction
+        self.counts = [0]
+        for positions in self.postings:
+            self.counts.append(self.counts[-1] + len(positions))
+
+    def matches(self, text):
+        """Positions, in list order, of labels where every typed word starts some word"""
+        return self._narrow(None, _WORD.findall(text.lower()))
+
+    def narrow(self, positions, previous, text):
+        """matches(text), given positions = matches(previous) for a previous text that text extends"""
+        old = _WORD.findall(previous.lower())
+        new = _WORD.findall(text.lower())
+        # Words before the last one typed are unchanged, so only the rest can narrow further
+        fresh = new[max(len(old) - 1, 0):]
+        if old and fresh and fresh[0] == old[-1]:
+            fresh = fresh[1:]
+        return self._narrow(positions, fresh)
+
+    def _narrow(self, result, words):
+        ranges = []
+        for word in words:
+            # All index words with this prefix sit together in the sorted list
+            start = bisect.bisect_left(self.words, word)
+            end = bisect.bisect_left(self.words, word + '\uffff', start)
+            ranges.append((self.counts[end] - self.counts[start], start, end, word))
+        # Start from the rarest word; once few labels are left, checking their words is cheaper
+        for size, start, end, word in sorted(ranges):
+            if result is not None and size > len(result):
+                result = [position for position in result
+                          if any(label_word.startswith(word) for label_word in self.label_words[position])]
+                continue
+            found = set()
+            for positions in self.postings[start:end]:
+                found.update(positions)
+            result = sorted(found) if result is None else [position for position in result if position in found]
+        return list(range(len(self.label_words))) if result is None else result
+
+
+class PagedSource:
+    """Data source for a virtual ListSelector that loads pages on demand"""
+
+    def __init__(self, fetch_page, key_func, page_size=50, search=None, search_limit=500):
+        """
+        fetch_page: function(after=None, before=None, limit=N, last=False) returning up to N
+                    items in list order that sort after/before the given key (or the final N)
+        key_func: function to get the pagination key of an item
+        search: optional function(text, limit) returning the first `limit` items, in list order,
+                that could match the typed filter words (a superset is fine); without it
+                filtering covers the loaded window
+        search_limit: most candidates to load per search; while a search comes back full, every
+                      keystroke searches again with the longer text. None searches without a
+                      limit, for sources that are small anyway (one day's flights)
+        """
+        self.fetch_page = fetch_page
+        self.key_func = key_func
+        self.page_size = page_size
+        self.search = search
+        self.search_limit = search_limit
+
+
 class ListSelector(ScreenBase):
     """Generic list selector for choosing from items"""
 
-    def __init__(self, stdscr, title, items, display_func=None):
+    def __init__(self, stdscr, title, items, display_func=None, empty_message="No items available",
+                 refresh=None, apply_refresh=None, refresh_interval=5.0):
         """
         Initialize list selector
-        items: list of items to select from
+        items: list of items to select from, or a PagedSource to load them on demand
         display_func: function to convert item to display string (default: str)
+        refresh: optional function(items) returning fresh values of the items' live fields
+                 without changing them; it runs on a background thread for the visible rows
+                 every refresh_interval seconds
+        apply_refresh: function(items, values) that stores what refresh returned in the items;
+                       called on this thread, which then rebuilds their labels
         """
         super().__init__(stdscr)
         self.title = title
-        self.items = items
         self.display_func = display_func or str
+        self.empty_message = empty_message
         self.current_selection = 0
         self.scroll_offset = 0
 
+        # Formatted labels by label_key(item); see label() and invalidate_labels()
+        self.labels = {}
+        self.refresh_func = refresh
+        self.apply_refresh = apply_refresh
+        self.refresh_interval = refresh_interval
+        self._refresh_thread = None
+        self._refresh_lock = threading.Lock()
+        self._refreshed = None     # (items, values) handed over by the refresh thread
+        self._last_refresh = time.monotonic()
+
+        # In virtual mode self.items is a sliding window over the source
+        if isinstance(items, PagedSource):
+            self.source = items
+            self.items = []
+        else:
+            self.source = None
+            self.items = items
+        self.more_before = False
+        self.more_after = False
+
+        # Type-ahead filter; see set_filter()
+        self.filter_text = ""
+        self.unfiltered = None     # (items, selection, scroll, more_before, more_after)
+        self.candidates = None     # items the prefix index was built over
+        self.index = None
+        self.candidate_keys = None # page keys of searched candidates, for finding the selection
+        self.matched = None        # positions in candidates matching filter_text
+        self.search_text = None    # filter text the candidates were searched with
+        self.search_capped = False # the search hit search_limit, so candidates may be incomplete
+
+    def label_key(self, item):
+        """Cache key for an item's label: its page key in virtual mode, else the object itself"""
+        if self.source:
+            return self.source.key_func(item)
+        return id(item)
+
+    def label(self, item):
+        """Formatted label for an item, computed once and then served from the cache"""
+        key = self.label_key(item)
+        text = self.labels.get(key)
+        if text is None:
+            text = self.labels[key] = self.display_func(item)
+        return text
+
+    def invalidate_labels(self, items=None):
+        """Forget cached labels for the given items (default: all), e.g. after they changed"""
+        if items is None:
+            self.labels.clear()
+            return
+        for item in items:
+            self.labels.pop(self.label_key(item), None)
+
+    def page_size(self, max_visible):
+        """Rows to fetch per page - always at least a screenful"""
+        return max(self.source.page_size, max_visible)
+
+    def load_first_page(self, max_visible):
+        """Load the first page of a virtual list"""
+        limit = self.page_size(max_visible)
+        self.invalidate_labels(self.items)
+        self.items = self.source.fetch_page(limit=limit)
+        self.more_before = False
+        self.more_after = len(self.items) == limit
+
+    def load_last_page(self, max_visible):
+        """Load the last page of a virtual list"""
+        limit = self.page_size(max_visible)
+        self.invalidate_labels(self.items)
+        self.items = self.source.fetch_page(last=True, limit=limit)
+        self.more_before = len(self.items) == limit
+        self.more_after = False
+
+    def load_next_page(self, max_visible):
+        """Append the next page to the window, dropping pages from the front"""
+        limit = self.page_size(max_visible)
+        page = self.source.fetch_page(after=self.source.key_func(self.items[-1]), limit=limit)
+        self.more_after = len(page) == limit
+        self.items.extend(page)
+
+        overflow = len(self.items) - limit * 3
+        if overflow > 0:
+            self.invalidate_labels(self.items[:overflow])
+            del self.items[:overflow]
+            self.current_selection -= overflow
+            self.scroll_offset = max(0, self.scroll_offset - overflow)
+            self.more_before = True
+
+    def load_previous_page(self, max_visible):
+        """Prepend the previous page to the window, dropping pages from the back"""
+        limit = self.page_size(max_visible)
+        page = self.source.fetch_page(before=self.source.key_func(self.items[0]), limit=limit)
+        self.more_before = len(page) == limit
+        self.items[:0] = page
+        self.current_selection += len(page)
+        self.scroll_offset += len(page)
+
+        if len(self.items) > limit * 3:
+            self.invalidate_labels(self.items[limit * 3:])
+            del self.items[limit * 3:]
+            self.more_after = True
+
     def display(self):
         """Display the list and return selected item or None"""
+        max_visible = self.height - 10  # Leave room for header/footer
+
+        if self.source:
+            self.load_first_page(max_visible)
+
         if not self.items:
-            self.show_message("No items available")
+            self.show_message(self.empty_message)
             return None
 
-        max_visible = self.height - 10  # Leave room for header/footer
+        if self.refresh_func:
+            # Wake up regularly to pick up refreshed labels between keypresses
+            self.stdscr.timeout(250)
+        try:
+            return self.select(max_visible)
+        finally:
+            if self.refresh_func:
+                self.stdscr.timeout(-1)
+                if self._refresh_thread:
+                    self._refresh_thread.join()
 
+    def select(self, max_visible):
+        """Key loop of display(); returns the chosen item or None"""
         while True:
             self.clear()
             self.draw_header(self.title)
             self.draw_list_items(max_visible)
-            self.draw_footer("↑/↓: Navigate | ENTER: Select | ESC: Cancel")
+            self.draw_filter()
+            self.draw_footer("↑/↓/PgUp/PgDn/Home/End: Move | Type: Filter | ENTER: Select | "
+                             + ("ESC: Clear filter" if self.filter_text else "ESC: Cancel"))
             self.refresh()
 
             key = self.stdscr.getch()
 
-            if key == curses.KEY_UP:
+            if key == -1:  # timeout: only set with a refresh function
+                self.poll_refresh(max_visible)
+            elif key == curses.KEY_UP:
+                if self.current_selection == 0 and self.more_before:
+                    self.load_previous_page(max_visible)
                 if self.current_selection > 0:
                     self.current_selection -= 1
                     if self.current_selection < self.scroll_offset:
                         self.scroll_offset = self.current_selection
             elif key == curses.KEY_DOWN:
+                if self.current_selection == len(self.items) - 1 and self.more_after:
+                    self.load_next_page(max_visible)
                 if self.current_selection < len(self.items) - 1:
                     self.current_selection += 1
                     if self.current_selection >= self.scroll_offset + max_visible:
                         self.scroll_offset = self.current_selection - max_visible + 1
+            elif key == curses.KEY_NPAGE:
+                self.page_down(max_visible)
+            elif key == curses.KEY_PPAGE:
+                self.page_up(max_visible)
+            elif key == curses.KEY_HOME:
+                if self.more_before:
+                    self.load_first_page(max_visible)
+                self.current_selection = self.scroll_offset = 0
+            elif key == curses.KEY_END:
+                if self.more_after:
+                    self.load_last_page(max_visible)
+                self.current_selection = max(0, len(self.items) - 1)
+                self.scroll_offset = max(0, len(self.items) - max_visible)
             elif key == ord('\n') or key == curses.KEY_ENTER:
-                return self.items[self.current_selection]
-            elif key == 27:  # ESC
+                if self.items:
+                    return self.items[self.current_selection]
+            elif key == KEY_ESC:
+                if not self.filter_text:
+                    return None
+                self.set_filter("", max_visible)
+            elif key in KEY_BACKSPACES:
+                if self.filter_text:
+                    self.set_filter(self.filter_text[:-1], max_visible)
+            elif key == KEY_CTRL_L:
+                self.repaint()
+            elif 32 <= key <= 126:
+                self.set_filter(self.filter_text + chr(key), max_visible)
+
+    def page_down(self, max_visible):
+        """Move the selection and the view down one screenful, loading pages as needed"""
+        target = self.current_selection + max_visible
+        while target >= len(self.items) and self.more_after:
+            before = self.current_selection
+            self.load_next_page(max_visible)
+            target += self.current_selection - before  # pages dropped from the front
+        self.current_selection = max(0, min(target, len(self.items) - 1))
+        self.scroll_offset = max(0, min(self.scroll_offset + max_visible, len(self.items) - max_visible))
+        self.scroll_to_selection(max_visible)
+
+    def page_up(self, max_visible):
+        """Move the selection and the view up one screenful, loading pages as needed"""
+        target = self.current_selection - max_visible
+        while target < 0 and self.more_before:
+            before = self.current_selection
+            self.load_previous_page(max_visible)
+            target += self.current_selection - before  # pages added at the front
+        self.current_selection = max(0, target)
+        self.scroll_offset = max(0, self.scroll_offset - max_visible)
+        self.scroll_to_selection(max_visible)
+
+    def scroll_to_selection(self, max_visible):
+        """Adjust scroll_offset so the selected row is on screen"""
+        if self.current_selection < self.scroll_offset:
+            self.scroll_offset = self.current_selection
+        elif self.current_selection >= self.scroll_offset + max_visible:
+            self.scroll_offset = self.current_selection - max_visible + 1
+
+    def set_filter(self, text, max_visible):
+        """Narrow the list to items whose label matches text; "" restores the full list"""
+        selected = self.items[self.current_selection] if self.items else None
+        previous = self.filter_text
+        if self.unfiltered is None:
+            self.unfiltered = (self.items, self.current_selection, self.scroll_offset,
+                               self.more_before, self.more_after)
+        self.filter_text = text
+
+        if not _WORD.search(text.lower()):
+            # Nothing to match on (empty, or only punctuation so far): every item matches
+            (self.items, self.current_selection, self.scroll_offset,
+             self.more_before, self.more_after) = self.unfiltered
+            self.matched = None
+            if not text:
+                self.unfiltered = None
+            if self.source and not self.source.search:
+                self.index = None  # the window changes as pages load
+            return
+
+        # Typing more can only narrow the matches, so only those need checking
+        if not self.build_index(text) and self.matched is not None and text.startswith(previous):
+            self.matched = self.index.narrow(self.matched, previous, text)
+        else:
+            self.matched = self.index.matches(text)
+        self.items = [self.candidates[position] for position in self.matched]
+        self.more_before = self.more_after = False
+
+        # Stay on the same item while it still matches
+        self.current_selection = self.scroll_offset = 0
+        position = self.candidate_position(selected) if selected is not None else None
+        if position is not None:
+            row = bisect.bisect_left(self.matched, position)
+            if row < len(self.matched) and self.matched[row] == position:
+                self.current_selection = row
+        self.scroll_to_selection(max_visible)
+
+    def candidate_position(self, item):
+        """Position of item in candidates, or None"""
+        if self.candidate_keys is None:
+            try:
+                return self.candidates.index(item)
+            except ValueError:
                 return None
+        # Search results are sorted by page key, and item may be a different object
+        key = self.source.key_func(item)
+        position = bisect.bisect_left(self.candidate_keys, key)
+        if position < len(self.candidate_keys) and self.candidate_keys[position] == key:
+            return position
+        return None
+
+    def build_index(self, text):
+        """Index the items to filter unless the current index covers text; True if rebuilt"""
+        if self.source and self.source.search:
+            # Searching again is only needed when text no longer extends the last search,
+            # or that search was cut off at the limit and the longer text may find others
+            if (self.search_text is not None and text.startswith(self.search_text)
+                    and not self.search_capped):
+                return False
+            limit = self.source.search_limit
+            found = self.source.search(" ".join(_WORD.findall(text.lower())),
+                                       None if limit is None else limit + 1)
+            self.search_capped = limit is not None and len(found) > limit
+            if self.search_capped:
+                del found[limit:]
+            # Show matches in list order, whatever order the search returns them in
+            self.candidates = sorted(found, key=self.source.key_func)
+            self.candidate_keys = [self.source.key_func(item) for item in self.candidates]
+            self.search_text = text
+        elif self.index is not None and self.candidates is self.unfiltered[0]:
+            return False
+        else:
+            self.candidates = self.unfiltered[0]
+        # Straight from display_func: only the rows that get drawn go into the label cache
+        self.index = PrefixIndex([self.display_func(item) for item in self.candidates])
+        return True
+
+    def poll_refresh(self, max_visible):
+        """Apply a finished background refresh, and start the next one when it's due"""
+        with self._refresh_lock:
+            refreshed, self._refreshed = self._refreshed, None
+        if refreshed is not None:
+            items, values = refreshed
+            if values is not None:
+                self.apply_refresh(items, values)
+                self.invalidate_labels(items)
+            self._refresh_thread = None
+            self._last_refresh = time.monotonic()
+        if self._refresh_thread is None and time.monotonic() - self._last_refresh >= self.refresh_interval:
+            visible = self.items[self.scroll_offset:self.scroll_offset + max_visible]
+            self._refresh_thread = threading.Thread(target=self._run_refresh, args=(visible,), daemon=True)
+            self._refresh_thread.start()
+
+    def _run_refresh(self, items):
+        """Background thread: fetch new values and hand them to poll_refresh(), touching nothing else"""
+        values = None
+        try:
+            values = self.refresh_func(items)
+        except Exception:
+            pass  # keep showing the last known values; the next refresh tries again
+        finally:
+            with self._refresh_lock:
+                self._refreshed = (items, values)
+
+    def draw_filter(self):
+        """Show the type-ahead filter text above the footer"""
+        if not self.filter_text:
+            return
+        text = f"Filter: {self.filter_text}_"
+        if self.search_capped and self.matched is not None:
+            text += f"   (first {self.source.search_limit} matches - keep typing to refine)"
+        self.stdscr.attron(curses.color_pair(2))
+        self.stdscr.addstr(self.height - 4, 5, text[:self.width - 10])
+        self.stdscr.attroff(curses.color_pair(2))
 
     def draw_list_items(self, max_visible):
         """Draw list items with scrolling"""
         start_y = 4
 
+        if not self.items:
+            self.stdscr.addstr(start_y, 7, "No matches")
+            return
+
         visible_items = self.items[self.scroll_offset:self.scroll_offset + max_visible]
 
         for idx, item in enumerate(visible_items):
             actual_idx = self.scroll_offset + idx
             y_pos = start_y + idx
 
-            display_text = self.display_func(item)
+            display_text = self.label(item)
             # Truncate if too long
             if len(display_text) > self.width - 10:
                 display_text = display_text[:self.width-13] + "..."
@@ -147,12 +536,12 @@ class ListSelector(ScreenBase):
                 self.stdscr.attroff(curses.color_pair(1))
 
         # Show scroll indicators
-        if self.scroll_offset > 0:
+        if self.scroll_offset > 0 or self.more_before:
             self.stdscr.attron(curses.color_pair(2))
             self.stdscr.addstr(start_y - 1, self.width // 2, "^^^ MORE ^^^")
             self.stdscr.attroff(curses.color_pair(2))
 
-        if self.scroll_offset + max_visible < len(self.items):
+        if self.scroll_offset + max_visible < len(self.items) or self.more_after:
             self.stdscr.attron(curses.color_pair(2))
             self.stdscr.addstr(start_y + max_visible, self.width // 2, "vvv MORE vvv")
             self.stdscr.attroff(curses.color_pair(2))
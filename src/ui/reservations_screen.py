@@ -1,6 +1,6 @@
 import curses
 from .screen_base import ScreenBase
-from .menu import ListSelector
+from .menu import ListSelector, PagedSource
 from src.models import Passenger, Reservation
 
 
@@ -10,16 +10,12 @@ class ReservationsScreen(ScreenBase):
     def display(self):
         """Display reservations screen"""
         # Select passenger
-        passengers = Passenger.get_all()
-        if not passengers:
-            self.show_message("No passengers found")
-            return
-
         selector = ListSelector(
             self.stdscr,
             "SELECT PASSENGER",
-            passengers,
-            lambda p: f"{p.full_name()} (ID: {p.id})"
+            PagedSource(Passenger.get_page, Passenger.page_key, search=Passenger.search),
+            lambda p: f"{p.full_name()} (ID: {p.id})",
+            empty_message="No passengers found"
         )
         passenger = selector.display()
 
@@ -37,20 +33,27 @@ class ReservationsScreen(ScreenBase):
             self.show_message(f"No reservations found for {passenger.full_name()}")
             return
 
+        # Load the itineraries of the listed reservations in one go
+        reservations = reservations[:15]  # Show max 15
+        itineraries = Reservation.get_flights_for_many(res.id for res in reservations)
+
         while True:
             self.clear()
             self.draw_header(f"RESERVATIONS - {passenger.full_name()}")
 
             start_y = 4
             self.stdscr.attron(curses.color_pair(2) | curses.A_BOLD)
-            self.stdscr.addstr(start_y, 5, "CONFIRMATION | STATUS    | CREATED")
-            self.stdscr.addstr(start_y + 1, 5, "-" * 50)
+            self.stdscr.addstr(start_y, 5, "CONFIRMATION | STATUS     | LEGS | FIRST DEPARTURE  | CREATED")
+            self.stdscr.addstr(start_y + 1, 5, "-" * min(80, self.width - 10))
             self.stdscr.attroff(curses.color_pair(2) | curses.A_BOLD)
 
-            for idx, res in enumerate(reservations[:15]):  # Show max 15
+            for idx, res in enumerate(reservations):
                 y_pos = start_y + 2 + idx
+                legs = itineraries.get(res.id, [])
+                first_departure = f"{legs[0]['flight_date']} {legs[0]['departure_time']}" if legs else "N/A"
                 self.stdscr.attron(curses.color_pair(1))
-                display = f"{res.confirmation_number} | {res.status:10} | {res.created_at or 'N/A'}"
+                display = (f"{res.confirmation_number:12} | {res.status:10} | {len(legs):4} | "
+                           f"{first_departure:16} | {res.created_at or 'N/A'}")
                 self.stdscr.addstr(y_pos, 5, display[:self.width-10])
                 self.stdscr.attroff(curses.color_pair(1))
 
@@ -18,12 +18,20 @@ class ScreenBase:
         curses.init_pair(5, curses.COLOR_RED, curses.COLOR_BLACK)     # Error/Warning
 
     def clear(self):
-        """Clear the screen"""
-        self.stdscr.clear()
+        """
+        Start a new frame. erase() only blanks curses' copy of the screen; nothing is
+        sent to the terminal until refresh(), which then writes just the changed cells.
+        """
+        self.stdscr.erase()
 
     def refresh(self):
-        """Refresh the screen"""
-        self.stdscr.refresh()
+        """Send the frame: curses diffs it against what the terminal shows"""
+        self.stdscr.noutrefresh()
+        curses.doupdate()
+
+    def repaint(self):
+        """Repaint the whole terminal on the next refresh (Ctrl-L), e.g. after stray output"""
+        self.stdscr.clearok(True)
 
     def draw_header(self, title):
         """Draw application header"""
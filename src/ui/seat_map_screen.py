@@ -0,0 +1,123 @@
+import curses
+from .screen_base import ScreenBase
+from .menu import ListSelector, PagedSource
+from src.models import Flight, SeatMap
+from datetime import datetime, timedelta
+
+
+class SeatMapScreen(ScreenBase):
+    """Screen for viewing which seats are taken on a flight"""
+
+    def display(self):
+        """Display seat map screen"""
+        # Select date
+        today = datetime.now()
+        dates = [(today + timedelta(days=i)).strftime('%Y-%m-%d') for i in range(7)]
+
+        self.clear()
+        self.draw_header("SELECT FLIGHT DATE")
+
+        for idx, date in enumerate(dates):
+            self.stdscr.attron(curses.color_pair(1))
+            self.stdscr.addstr(5 + idx, 5, f"{idx + 1}. {date}")
+            self.stdscr.attroff(curses.color_pair(1))
+
+        self.draw_footer("1-7: Select date | ESC: Cancel")
+        self.refresh()
+
+        key = self.stdscr.getch()
+        if key == 27:
+            return
+
+        if ord('1') <= key <= ord('7'):
+            idx = key - ord('1')
+            date_filter = dates[idx]
+
+            flights = PagedSource(
+                lambda **page: Flight.get_page(date_filter, **page),
+                Flight.page_key,
+                search=lambda text, limit: Flight.get_all_with_availability(date_filter),
+                search_limit=None  # one day's flights
+            )
+
+            selector = ListSelector(
+                self.stdscr,
+                f"SELECT FLIGHT - {date_filter}",
+                flights,
+                lambda f: f"{f.flight_number} {f.departure_time} {f.origin_code}->{f.dest_code}",
+                empty_message="No flights for this date"
+            )
+            flight = selector.display()
+
+            if flight:
+                self.show_seat_map(flight)
+
+    def show_seat_map(self, flight):
+        """Show the seat map for a flight"""
+        seat_map = SeatMap.load(flight.id)
+        if not seat_map:
+            self.show_message("Flight not found", error=True)
+            return
+
+        while True:
+            self.clear()
+            self.draw_header("SEAT MAP")
+
+            self.stdscr.attron(curses.color_pair(3) | curses.A_BOLD)
+            self.stdscr.addstr(3, 5, f"Flight: {flight.flight_number} {flight.origin_code} -> {flight.dest_code}"
+                                     f" | {flight.flight_date} {flight.departure_time}")
+            self.stdscr.addstr(4, 5, f"Free seats: {seat_map.free_count()} / {seat_map.capacity}")
+            self.stdscr.attroff(curses.color_pair(3) | curses.A_BOLD)
+
+            self.draw_seat_map(seat_map, 6)
+
+            self.draw_footer(". = free  X = taken | ESC: Back")
+            self.refresh()
+
+            key = self.stdscr.getch()
+            if key == 27:  # ESC
+                return
+
+    def draw_seat_map(self, seat_map, start_y, start_x=5):
+        """
+        Draw the cabin sideways: one column per row of seats (front on the left),
+        one line per seat letter, with a blank line for each aisle.
+        Returns the first line below the map.
+        """
+        label_width = 3
+        visible_rows = min(seat_map.rows, (self.width - start_x - label_width - 2) // 2)
+
+        # Row numbers every 5 rows
+        self.stdscr.attron(curses.color_pair(2))
+        for row in range(1, visible_rows + 1):
+            if row == 1 or row % 5 == 0:
+                self.stdscr.addstr(start_y, start_x + label_width + (row - 1) * 2, str(row))
+        self.stdscr.attroff(curses.color_pair(2))
+
+        y = start_y + 1
+        column = 0
+        for group_idx, group in enumerate(seat_map.layout):
+            if group_idx:
+                y += 1  # aisle
+            for letter in group:
+                self.stdscr.attron(curses.color_pair(2))
+                self.stdscr.addstr(y, start_x, letter)
+                self.stdscr.attroff(curses.color_pair(2))
+                for row in range(visible_rows):
+                    index = row * seat_map.seats_per_row + column
+                    if index >= seat_map.capacity:
+                        continue
+                    taken = seat_map.occupied >> index & 1
+                    color = curses.color_pair(5) if taken else curses.color_pair(1)
+                    self.stdscr.attron(color)
+                    self.stdscr.addstr(y, start_x + label_width + row * 2, "X" if taken else ".")
+                    self.stdscr.attroff(color)
+                y += 1
+                column += 1
+
+        if visible_rows < seat_map.rows:
+            self.stdscr.attron(curses.color_pair(5))
+            self.stdscr.addstr(y, start_x, f"Showing rows 1-{visible_rows} of {seat_map.rows}")
+            self.stdscr.attroff(curses.color_pair(5))
+            y += 1
+        return y